@@ -35,6 +35,14 @@ class AgentStepLogAdmin(admin.ModelAdmin):
     ordering = ("started_at",)
 
 
+@admin.register(models.ArchivedAgentRun)
+class ArchivedAgentRunAdmin(admin.ModelAdmin):
+    list_display = ("id", "agent_name", "organization", "evidence", "status", "started_at", "archived_at")
+    list_filter = ("agent_name", "status")
+    search_fields = ("id", "evidence__id", "pipeline_run_id")
+    ordering = ("-archived_at",)
+
+
 @admin.register(models.Event)
 class EventAdmin(admin.ModelAdmin):
     list_display = ("id", "event_type", "organization", "evidence", "created_at")
@@ -63,3 +71,50 @@ class ModelRegistryAdmin(admin.ModelAdmin):
     search_fields = ("name", "provider", "version", "id")
     list_filter = ("provider", "model_type")
     ordering = ("-created_at",)
+
+
+@admin.register(models.RollupWatermark)
+class RollupWatermarkAdmin(admin.ModelAdmin):
+    list_display = ("name", "position", "last_id", "updated_at")
+
+
+@admin.register(models.EvidenceControlMatch)
+class EvidenceControlMatchAdmin(admin.ModelAdmin):
+    list_display = ("id", "evidence", "control_reference", "rank", "confidence", "created_at")
+    search_fields = ("control_reference", "evidence__id")
+    ordering = ("-created_at",)
+
+
+@admin.register(models.EmbeddingBackfillCursor)
+class EmbeddingBackfillCursorAdmin(admin.ModelAdmin):
+    list_display = ("model_name", "status", "processed_count", "embedded_count", "last_evidence_id", "updated_at")
+    list_filter = ("status",)
+
+
+@admin.register(models.LLMValidationCacheEntry)
+class LLMValidationCacheEntryAdmin(admin.ModelAdmin):
+    list_display = ("cache_key", "model", "prompt_template", "provider", "confidence", "hit_count", "expires_at")
+    list_filter = ("provider", "model", "prompt_template")
+    search_fields = ("cache_key", "text_hash")
+    ordering = ("-created_at",)
+
+
+@admin.register(models.ControlCatalogSnapshot)
+class ControlCatalogSnapshotAdmin(admin.ModelAdmin):
+    list_display = ("version", "control_count", "created_at")
+    search_fields = ("version",)
+    ordering = ("-created_at",)
+
+
+@admin.register(models.OrganizationFramework)
+class OrganizationFrameworkAdmin(admin.ModelAdmin):
+    list_display = ("organization", "framework", "is_active", "created_at")
+    list_filter = ("is_active", "framework")
+    search_fields = ("organization__name", "framework__code")
+
+
+@admin.register(models.ControlEmbedding)
+class ControlEmbeddingAdmin(admin.ModelAdmin):
+    list_display = ("control", "model_name", "content_hash", "updated_at")
+    list_filter = ("model_name",)
+    exclude = ("vector",)
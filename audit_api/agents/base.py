@@ -3,6 +3,10 @@
 from dataclasses import dataclass
 from typing import Any, Dict, Optional
 
+from audit_api.models import Evidence
+from audit_api.orchestration.dag import AsyncGraphExecutor, GraphExecutor, WorkflowContext, WorkflowGraph
+from audit_api.services.pipeline_logging_service import PipelineLogger
+
 
 @dataclass
 class AgentContext:
@@ -15,4 +19,73 @@ class BaseAgent:
     version: str = "0.0.1"
 
     def __init__(self, context: Optional[AgentContext] = None) -> None:
-        self.context = context or AgentContext()
\ No newline at end of file
+        self.context = context or AgentContext()
+
+
+class GraphAgent(BaseAgent):
+    """
+    Agent whose pipeline is a declarative WorkflowGraph.
+
+    Subclasses provide `build_graph()` (and optionally `initial_details()`);
+    `run_graph` owns the pipeline/agent run bookkeeping: it starts the
+    PipelineLogger with the graph's logged steps, executes the graph and
+    finishes the run as completed (with `ctx.finish_details`) or failed.
+    Steps put the agent's return value in `ctx.result`. `arun_graph` is the
+    same flow on the running event loop (AsyncGraphExecutor).
+    """
+
+    pipeline_type: str = "generic"
+
+    def build_graph(self) -> WorkflowGraph:
+        raise NotImplementedError
+
+    def initial_details(self, evidence: Optional[Evidence]) -> Dict[str, Any]:
+        return {}
+
+    def run_graph(self, evidence: Optional[Evidence], *, parallel: bool = True) -> WorkflowContext:
+        graph = self.build_graph()
+        logger = PipelineLogger(
+            pipeline_type=self.pipeline_type,
+            agent_name=self.name,
+            agent_version=self.version,
+            evidence=evidence,
+        )
+        pipeline_run = logger.start(
+            step_names=graph.logged_step_names,
+            initial_details=self.initial_details(evidence),
+        )
+        ctx = WorkflowContext(evidence=evidence, logger=logger, pipeline_run=pipeline_run)
+        try:
+            GraphExecutor(parallel=parallel).run(graph, ctx)
+        except Exception as exc:
+            logger.finish_pipeline(status="failed", details={"error": str(exc)})
+            raise
+        logger.finish_pipeline(status="completed", details=ctx.finish_details)
+        return ctx
+
+    def run(self, evidence: Optional[Evidence], **options) -> dict:
+        return self.run_graph(evidence, **options).result or {}
+
+    async def arun_graph(self, evidence: Optional[Evidence]) -> WorkflowContext:
+        graph = self.build_graph()
+        logger = PipelineLogger(
+            pipeline_type=self.pipeline_type,
+            agent_name=self.name,
+            agent_version=self.version,
+            evidence=evidence,
+        )
+        pipeline_run = await logger.astart(
+            step_names=graph.logged_step_names,
+            initial_details=self.initial_details(evidence),
+        )
+        ctx = WorkflowContext(evidence=evidence, logger=logger, pipeline_run=pipeline_run)
+        try:
+            await AsyncGraphExecutor().run(graph, ctx)
+        except Exception as exc:
+            await logger.afinish_pipeline(status="failed", details={"error": str(exc)})
+            raise
+        await logger.afinish_pipeline(status="completed", details=ctx.finish_details)
+        return ctx
+
+    async def arun(self, evidence: Optional[Evidence]) -> dict:
+        return (await self.arun_graph(evidence)).result or {}
@@ -1,320 +1,447 @@
-from audit_api.agents.base import BaseAgent
+from asgiref.sync import sync_to_async
+
+from audit_api.agents.base import GraphAgent
 from audit_api.models import Evidence, ClassifierOutput
 from audit_api.services.control_search_service import ControlSearchService
+from audit_api.services.control_vector_service import ControlVectorService
 from audit_api.services.task_auto_create_service import TaskAutoCreateService
 from audit_api.services.preprocessing_service import EvidencePreprocessingService
 from audit_api.services.embedding_service import EmbeddingService
 from audit_api.services.classification_cache_service import ClassificationCacheService
-from audit_api.services.pipeline_logging_service import PipelineLogger
 from audit_api.services.llm_validation_service import LLMValidationService
+from audit_api.services.profiling_service import ClassificationProfiler
+from audit_api.services.control_match_service import ControlMatchService
+from audit_api.services.control_catalog_service import ControlCatalogService
+from audit_api.orchestration.dag import WorkflowContext, WorkflowGraph, WorkflowStep
+
+
+class EvidenceClassifierAgent(GraphAgent):
+    """
+    Evidence classification as a step graph. FTS retrieval waits for the
+    cache lookup, so a cache hit stops the graph before any retrieval,
+    ranking or validation work is done. On a miss the evidence vector is
+    computed (no database access) alongside FTS retrieval, and the
+    embedding store after persistence only writes it.
 
+    After persistence, task creation, the completion event and the
+    embedding store are independent, but all three write to the database:
+    the sync executor runs them in turn on the calling thread, and on the
+    async path only the completion event (native async) overlaps the other
+    two, which share Django's sync thread.
+    """
 
-class EvidenceClassifierAgent(BaseAgent):
     name = "evidence-classifier"
     version = "0.2.0-fts"
+    pipeline_type = "evidence_classification"
+    prompt_template = {"name": "classifier-default", "version": "1.0"}
+    selection_threshold = 0.01  # minimum FTS score for a candidate control
 
     def __init__(self):
-        self.search = ControlSearchService()
         self.tasks = TaskAutoCreateService()
         self.preprocessing = EvidencePreprocessingService()
         self.embedding = EmbeddingService()
+        self.search = ControlSearchService(ControlVectorService(self.embedding))
         self.cache = ClassificationCacheService(self.embedding)
         self.cache_threshold = 0.30  # L2 distance on normalized vectors
-        self.validator = LLMValidationService()
+        self.validator = LLMValidationService(
+            prompt_template="{name}@{version}".format(**self.prompt_template),
+        )
+        self.profiler = ClassificationProfiler()
+        self.matches = ControlMatchService()
+        self.catalog = ControlCatalogService()
+
+    def classify(self, evidence: Evidence, *, profile: bool = False) -> dict:
+        """Run the pipeline; `profile` forces a cProfile capture (otherwise sampled)."""
+        profiler = self.profiler.start() if self.profiler.should_profile(profile) else None
+        if profiler is None:
+            return self.run(evidence)
+
+        try:
+            # cProfile only sees the calling thread, so profiled runs are sequential.
+            result = self.run(evidence, parallel=False)
+        finally:
+            profiler.disable()
+        result["profile"] = self.profiler.attach(profiler, pipeline_run_id=result["pipeline_run_id"])
+        return result
+
+    async def aclassify(self, evidence: Evidence) -> dict:
+        """
+        Async form of classify for ASGI views. Cache lookup, FTS retrieval,
+        LLM validation and the completion event are awaited natively, steps
+        without database access run in worker threads, and the rest run in
+        Django's sync thread. Profiling is not supported here.
+        """
+        return await self.arun(evidence)
+
+    def initial_details(self, evidence: Evidence) -> dict:
+        return {
+            "cache_hit": False,
+            "model": self.embedding.backend.describe(),
+            "prompt_template": self.prompt_template,
+        }
+
+    def build_graph(self) -> WorkflowGraph:
+        return WorkflowGraph(
+            [
+                WorkflowStep(
+                    "preprocessing",
+                    self._preprocess,
+                    input_snapshot=lambda ctx: {"evidence_id": str(ctx.evidence.id)},
+                ),
+                WorkflowStep(
+                    "cache_lookup",
+                    self._cache_lookup,
+                    arun=self._acache_lookup,
+                    depends_on=("preprocessing",),
+                    input_snapshot=lambda ctx: {"content_hash": ctx["content_hash"]},
+                ),
+                WorkflowStep(
+                    "candidate_retrieval_fts",
+                    self._retrieve_candidates,
+                    arun=self._aretrieve_candidates,
+                    depends_on=("cache_lookup",),
+                    input_snapshot=lambda ctx: {"text_chars": len(ctx["text"]), "limit": 5},
+                ),
+                WorkflowStep(
+                    "embedding_compute",
+                    self._compute_embedding,
+                    depends_on=("cache_lookup",),
+                    input_snapshot=lambda ctx: {"text_chars": len(ctx["text"])},
+                    uses_db=False,
+                ),
+                WorkflowStep(
+                    "control_ranking",
+                    self._rank_controls,
+                    depends_on=("candidate_retrieval_fts",),
+                    input_snapshot=lambda ctx: {"threshold": self.selection_threshold},
+                    uses_db=False,
+                ),
+                WorkflowStep(
+                    "thresholding",
+                    self._threshold,
+                    depends_on=("control_ranking",),
+                    input_snapshot=lambda ctx: {"threshold": self.selection_threshold},
+                    uses_db=False,
+                ),
+                WorkflowStep(
+                    "llm_validation",
+                    self._validate,
+                    arun=self._avalidate,
+                    depends_on=("thresholding",),
+                    input_snapshot=lambda ctx: {
+                        "primary_controls": ctx["primary_controls"],
+                        "initial_confidence": float(ctx["confidence"]),
+                    },
+                ),
+                WorkflowStep(
+                    "persistence",
+                    self._persist,
+                    depends_on=("llm_validation",),
+                    input_snapshot=lambda ctx: {
+                        "primary_controls": ctx["primary_controls"],
+                        "confidence": float(ctx["confidence"]),
+                    },
+                ),
+                WorkflowStep(
+                    "classification_event",
+                    self._emit_completed,
+                    arun=self._aemit_completed,
+                    depends_on=("persistence",),
+                    logged=False,
+                ),
+                WorkflowStep(
+                    "auto_task_creation",
+                    self._create_tasks,
+                    depends_on=("persistence",),
+                    input_snapshot=lambda ctx: {"control_count": len(ctx["matched_controls"])},
+                ),
+                WorkflowStep(
+                    "embedding_store",
+                    self._store_embedding,
+                    depends_on=("persistence", "embedding_compute"),
+                    input_snapshot=lambda ctx: {"content_hash": ctx["content_hash"]},
+                ),
+                WorkflowStep(
+                    "evidence_update",
+                    self._update_evidence,
+                    depends_on=("auto_task_creation", "embedding_store", "classification_event"),
+                    logged=False,
+                ),
+            ]
+        )
 
-    def classify(self, evidence: Evidence) -> dict:
-        step_names = [
-            "preprocessing",
-            "cache_lookup",
-            "candidate_retrieval_fts",
-            "control_ranking",
-            "thresholding",
-            "llm_validation",
-            "persistence",
-            "auto_task_creation",
-            "embedding_store",
-        ]
+    # --- steps -----------------------------------------------------------
+
+    def _preprocess(self, ctx: WorkflowContext) -> dict:
+        # Preprocessing must exist
+        text, hints = self.preprocessing.build_classification_text(ctx.evidence)
+        content_hash = self.preprocessing.content_hash(text)
+        ctx["text"] = text
+        ctx["content_hash"] = content_hash
+        ctx["catalog_version"] = self.catalog.current_version()
+        ctx.logger.emit_event(
+            "EvidencePreprocessed",
+            payload={
+                "evidence_id": str(ctx.evidence.id),
+                "pipeline_run_id": str(ctx.pipeline_run.id),
+                "content_hash": content_hash,
+                "text_chars": len(text),
+            },
+        )
+        return {
+            "content_hash": content_hash,
+            "text_chars": len(text),
+            "has_text": bool(text),
+            "hint_count": len(hints),
+            "catalog_version": ctx["catalog_version"],
+        }
+
+    def _cache_lookup(self, ctx: WorkflowContext) -> dict:
+        # Exact hash or vector similarity
+        cached = self.cache.find_cached(
+            text=ctx["text"],
+            content_hash=ctx["content_hash"],
+            catalog_version=ctx["catalog_version"],
+        )
+        if not cached:
+            return {"cache_hit": False}
+        return self._apply_cache_hit(ctx, cached)
+
+    async def _acache_lookup(self, ctx: WorkflowContext) -> dict:
+        cached = await self.cache.afind_cached(
+            text=ctx["text"],
+            content_hash=ctx["content_hash"],
+            catalog_version=ctx["catalog_version"],
+        )
+        if not cached:
+            return {"cache_hit": False}
+        return await sync_to_async(self._apply_cache_hit)(ctx, cached)
 
-        logger = PipelineLogger(
-            pipeline_type="evidence_classification",
-            agent_name=self.name,
-            agent_version=self.version,
+    def _apply_cache_hit(self, ctx: WorkflowContext, cached: dict) -> dict:
+        evidence = ctx.evidence
+        primary_controls = cached.get("primary_controls", [])
+        confidence = float(cached.get("confidence", 0.0))
+        self.matches.replace_matches(
             evidence=evidence,
+            primary_controls=primary_controls,
+            confidence=confidence,
+            pipeline_run=ctx.pipeline_run,
         )
-        pipeline_run = logger.start(
-            step_names=step_names,
-            initial_details={
-                "cache_hit": False,
-                "model": {"name": "hash-embed-128", "provider": "local", "version": "1.0"},
-                "prompt_template": {"name": "classifier-default", "version": "1.0"},
+        classification = {
+            "evidence_id": str(evidence.id),
+            "primary_controls": primary_controls,
+            "confidence": confidence,
+            "pipeline_run_id": str(ctx.pipeline_run.id),
+            "agent_run_id": str(ctx.logger.agent_run.id),
+            "stub": False,
+            "cache_hit": True,
+            "similarity": cached.get("similarity"),
+            "source_evidence_id": cached.get("source_evidence_id"),
+            "catalog_version": ctx["catalog_version"],
+        }
+        evidence.ai_classification = classification
+        evidence.save(update_fields=["ai_classification"])
+        ctx.stop(
+            result=classification,
+            details={
+                "cache_hit": True,
+                "similarity": cached.get("similarity"),
+                "source_evidence_id": cached.get("source_evidence_id"),
+                "result": {"primary_controls": primary_controls, "confidence": confidence},
             },
         )
+        return {
+            "cache_hit": True,
+            "similarity": cached.get("similarity"),
+            "source_evidence_id": cached.get("source_evidence_id"),
+        }
 
-        try:
-            # 1) Preprocessing must exist
-            parts = [
-                evidence.title or "",
-                evidence.description or "",
-                evidence.evidence_type_id or "",
-                evidence.source_type_id or "",
-                evidence.extracted_text or "",
-            ]
-            text = "\n".join([p for p in parts if p]).strip()
-            hints = []
-            if (evidence.source_type_id or "").lower() in {"aws_s3", "aws"}:
-                hints.append("iam policy permissions access control authorization")
-            if "s3:" in (evidence.extracted_text or "").lower():
-                hints.append("iam policy s3 access control authorization")
-            text = text + "\n" + " ".join(hints)
+    def _retrieve_candidates(self, ctx: WorkflowContext) -> dict:
+        # SOC2 controls table
+        candidates = self.search.top_candidates(
+            text=ctx["text"], limit=5, organization_id=ctx.evidence.organization_id
+        )
+        return self._candidates_snapshot(ctx, candidates)
 
-            content_hash = self.preprocessing.content_hash(text)
-            preprocess_log = logger.start_step(
-                "preprocessing",
-                input_snapshot={
-                    "evidence_id": str(evidence.id),
-                    "has_text": bool(text),
-                    "hint_count": len(hints),
-                },
-            )
-            logger.complete_step(
-                preprocess_log,
-                output_snapshot={"content_hash": content_hash, "text_chars": len(text)},
-            )
-            logger.emit_event(
-                "EvidencePreprocessed",
-                payload={
-                    "evidence_id": str(evidence.id),
-                    "pipeline_run_id": str(pipeline_run.id),
-                    "content_hash": content_hash,
-                    "text_chars": len(text),
-                },
-            )
+    async def _aretrieve_candidates(self, ctx: WorkflowContext) -> dict:
+        candidates = await self.search.atop_candidates(
+            text=ctx["text"], limit=5, organization_id=ctx.evidence.organization_id
+        )
+        return self._candidates_snapshot(ctx, candidates)
 
-            # Cache lookup (exact hash or vector similarity)
-            cache_log = logger.start_step(
-                "cache_lookup",
-                input_snapshot={"content_hash": content_hash},
-            )
-            cached = self.cache.find_cached(text=text, content_hash=content_hash)
-            if cached:
-                logger.complete_step(
-                    cache_log,
-                    output_snapshot={
-                        "cache_hit": True,
-                        "similarity": cached.get("similarity"),
-                        "source_evidence_id": cached.get("source_evidence_id"),
-                    },
-                )
-                logger.finish_pipeline(
-                    status="completed",
-                    details={
-                        "cache_hit": True,
-                        "similarity": cached.get("similarity"),
-                        "source_evidence_id": cached.get("source_evidence_id"),
-                    },
-                )
-                classification = {
-                    "evidence_id": str(evidence.id),
-                    "primary_controls": cached.get("primary_controls", []),
-                    "confidence": float(cached.get("confidence", 0.0)),
-                    "pipeline_run_id": str(pipeline_run.id),
-                    "agent_run_id": str(logger.agent_run.id),
-                    "stub": False,
-                    "cache_hit": True,
-                    "similarity": cached.get("similarity"),
-                    "source_evidence_id": cached.get("source_evidence_id"),
+    @staticmethod
+    def _candidates_snapshot(ctx: WorkflowContext, candidates) -> dict:
+        ctx["candidates"] = candidates
+        return {
+            "candidate_count": len(candidates),
+            "candidates": [
+                {
+                    "reference": c.control.reference,
+                    "framework_id": str(c.control.framework_id),
+                    "score": c.score,
+                    "similarity": c.similarity,
                 }
-                evidence.ai_classification = classification
-                evidence.save(update_fields=["ai_classification"])
-                return classification
-            logger.complete_step(cache_log, output_snapshot={"cache_hit": False})
+                for c in candidates
+            ],
+        }
 
-            # 2) Candidate retrieval (SOC2 controls table)
-            retrieval_log = logger.start_step(
-                "candidate_retrieval_fts",
-                input_snapshot={"text_chars": len(text), "limit": 5},
-            )
-            candidates = self.search.top_candidates(text=text, limit=5)
-            logger.complete_step(
-                retrieval_log,
-                output_snapshot={
-                    "candidate_count": len(candidates),
-                    "candidates": [
-                        {"reference": c.control.reference, "score": c.score}
-                        for c in candidates
-                    ],
-                },
-            )
+    def _compute_embedding(self, ctx: WorkflowContext) -> dict:
+        # The cache lookup just checked evidence_embeddings for this hash, so skip the durable tier.
+        ctx["vector"] = self.embedding.embed_vector(ctx["text"], durable=False)
+        return {"dims": len(ctx["vector"])}
 
-            # 3) Thresholding (simple + deterministic)
-            # If nothing found, fall back to GENERIC so pipeline still works.
-            threshold = 0.01
-            selected = [c for c in candidates if c.score >= threshold]
-            if not selected:
-                primary_controls = ["control:GENERIC"]
-                confidence = 0.8
-                matched_controls = []
-                raw = {
-                    "reason": "No FTS candidates above threshold; fallback to GENERIC.",
-                    "threshold": threshold,
-                    "candidate_count": len(candidates),
-                }
-            else:
-                # store references as primary controls for now (human-readable)
-                primary_controls = [c.control.reference for c in selected[:3]]
-                confidence = min(0.95, 0.5 + (selected[0].score * 0.5))
-                matched_controls = [c.control for c in selected[:3]]
-                raw = {
-                    "threshold": threshold,
-                    "candidates": [
-                        {"id": str(c.control.id), "reference": c.control.reference, "score": c.score}
-                        for c in candidates
-                    ],
-                }
+    def _rank_controls(self, ctx: WorkflowContext) -> dict:
+        # Simple + deterministic. If nothing found, fall back to GENERIC so pipeline still works.
+        # Per-framework candidates arrive best-of-each-framework first, so the top 3 span frameworks.
+        candidates = ctx["candidates"]
+        threshold = self.selection_threshold
+        # Semantic matches already cleared CONTROL_SEMANTIC_MIN_SIMILARITY.
+        selected = [c for c in candidates if c.score >= threshold or c.similarity is not None]
+        if not selected:
+            primary_controls = ["control:GENERIC"]
+            confidence = 0.8
+            matched_controls = []
+            raw = {
+                "reason": "No FTS candidates above threshold; fallback to GENERIC.",
+                "threshold": threshold,
+                "candidate_count": len(candidates),
+            }
+        else:
+            # store references as primary controls for now (human-readable)
+            primary_controls = [c.control.reference for c in selected[:3]]
+            confidence = min(0.95, 0.5 + (max(c.score for c in selected) * 0.5))
+            matched_controls = [c.control for c in selected[:3]]
+            raw = {
+                "threshold": threshold,
+                "candidates": [
+                    {
+                        "id": str(c.control.id),
+                        "reference": c.control.reference,
+                        "score": c.score,
+                        "similarity": c.similarity,
+                        "fused": c.fused,
+                    }
+                    for c in candidates
+                ],
+            }
+        ctx["selected"] = selected
+        ctx["primary_controls"] = primary_controls
+        ctx["confidence"] = confidence
+        ctx["matched_controls"] = matched_controls
+        ctx["raw"] = raw
+        return {"selected_controls": primary_controls, "matched_count": len(matched_controls)}
 
-            ranking_log = logger.start_step(
-                "control_ranking",
-                input_snapshot={"threshold": threshold},
-            )
-            logger.complete_step(
-                ranking_log,
-                output_snapshot={
-                    "selected_controls": primary_controls,
-                    "matched_count": len(matched_controls),
-                },
-            )
+    def _threshold(self, ctx: WorkflowContext) -> dict:
+        passed = bool(ctx["selected"])
+        return {"passed": passed, "fallback_to_generic": not passed}
 
-            threshold_log = logger.start_step(
-                "thresholding",
-                input_snapshot={"threshold": threshold},
-            )
-            logger.complete_step(
-                threshold_log,
-                output_snapshot={
-                    "passed": bool(selected),
-                    "fallback_to_generic": not bool(selected),
-                },
-            )
+    def _validate(self, ctx: WorkflowContext) -> dict:
+        # Falls back to the unvalidated confidence
+        validation = self.validator.validate_detailed(
+            text=ctx["text"],
+            control_references=ctx["primary_controls"],
+            confidence=float(ctx["confidence"]),
+        )
+        ctx["confidence"] = float(validation.confidence)
+        return validation.as_snapshot()
 
-            # 3b) Optional LLM validation (stub)
-            validation_log = logger.start_step(
-                "llm_validation",
-                input_snapshot={
-                    "primary_controls": primary_controls,
-                    "initial_confidence": float(confidence),
-                },
-            )
-            validated_confidence, validation_justification = self.validator.validate(
-                text=text,
-                control_references=primary_controls,
-                confidence=float(confidence),
-            )
-            logger.complete_step(
-                validation_log,
-                output_snapshot={
-                    "validated_confidence": float(validated_confidence),
-                    "justification": validation_justification,
-                },
-            )
-            confidence = float(validated_confidence)
+    async def _avalidate(self, ctx: WorkflowContext) -> dict:
+        validation = await self.validator.avalidate_detailed(
+            text=ctx["text"],
+            control_references=ctx["primary_controls"],
+            confidence=float(ctx["confidence"]),
+        )
+        ctx["confidence"] = float(validation.confidence)
+        return validation.as_snapshot()
 
-            # 4) Persist classifier output
-            persist_log = logger.start_step(
-                "persistence",
-                input_snapshot={
-                    "primary_controls": primary_controls,
-                    "confidence": float(confidence),
-                },
-            )
-            ClassifierOutput.objects.create(
-                evidence=evidence,
-                pipeline_run=pipeline_run,
-                primary_controls=primary_controls,
-                confidence=float(confidence),
-                raw_output=raw,
-            )
-            logger.complete_step(
-                persist_log,
-                output_snapshot={"primary_controls": primary_controls, "confidence": float(confidence)},
-            )
+    def _persist(self, ctx: WorkflowContext) -> dict:
+        primary_controls = ctx["primary_controls"]
+        confidence = float(ctx["confidence"])
+        ClassifierOutput.objects.create(
+            evidence=ctx.evidence,
+            pipeline_run=ctx.pipeline_run,
+            primary_controls=primary_controls,
+            confidence=confidence,
+            raw_output=ctx["raw"],
+            catalog_version=ctx["catalog_version"],
+        )
+        matches = self.matches.replace_matches(
+            evidence=ctx.evidence,
+            primary_controls=primary_controls,
+            confidence=confidence,
+            pipeline_run=ctx.pipeline_run,
+            controls=ctx["matched_controls"],
+        )
+        return {"primary_controls": primary_controls, "confidence": confidence, "match_count": len(matches)}
 
-            logger.emit_event(
-                "ClassificationCompleted",
-                payload={
-                    "evidence_id": str(evidence.id),
-                    "pipeline_run_id": str(pipeline_run.id),
-                    "primary_controls": primary_controls,
-                    "confidence": float(confidence),
-                },
-            )
+    @staticmethod
+    def _completed_payload(ctx: WorkflowContext) -> dict:
+        return {
+            "evidence_id": str(ctx.evidence.id),
+            "pipeline_run_id": str(ctx.pipeline_run.id),
+            "primary_controls": ctx["primary_controls"],
+            "confidence": float(ctx["confidence"]),
+        }
 
-            # 5) Auto-create tasks (only for real controls)
-            tasks_log = logger.start_step("auto_task_creation", input_snapshot={"control_count": len(matched_controls)})
-            created_tasks = self.tasks.create_tasks_for_controls(
-                evidence=evidence,
-                controls=matched_controls,
-            )
-            logger.complete_step(
-                tasks_log,
-                output_snapshot={"created_task_ids": [str(t.id) for t in created_tasks]},
-            )
+    def _emit_completed(self, ctx: WorkflowContext) -> None:
+        ctx.logger.emit_event("ClassificationCompleted", payload=self._completed_payload(ctx))
 
-            # 6) Evidence ai_classification
-            logger.finish_pipeline(
-                status="completed",
-                details={
-                    "result": {
-                        "primary_controls": primary_controls,
-                        "confidence": float(confidence),
-                        "created_tasks": [str(t.id) for t in created_tasks],
-                    }
-                },
-            )
+    async def _aemit_completed(self, ctx: WorkflowContext) -> None:
+        await ctx.logger.aemit_event("ClassificationCompleted", payload=self._completed_payload(ctx))
 
-            # 6b) Store embedding for future cache hits
-            embed_log = logger.start_step(
-                "embedding_store",
-                input_snapshot={"content_hash": content_hash},
-            )
-            self.cache.store_embedding(
-                evidence=evidence,
-                text=text,
-                content_hash=content_hash,
-            )
-            logger.complete_step(
-                embed_log,
-                output_snapshot={"content_hash": content_hash, "stored": True},
-            )
-            logger.emit_event(
-                "EmbeddingComputed",
-                payload={
-                    "evidence_id": str(evidence.id),
-                    "pipeline_run_id": str(pipeline_run.id),
-                    "content_hash": content_hash,
-                },
-            )
+    def _create_tasks(self, ctx: WorkflowContext) -> dict:
+        # Only for real controls
+        created_tasks = self.tasks.create_tasks_for_controls(
+            evidence=ctx.evidence,
+            controls=ctx["matched_controls"],
+        )
+        ctx["created_task_ids"] = [str(t.id) for t in created_tasks]
+        return {"created_task_ids": ctx["created_task_ids"]}
 
-            evidence.ai_classification = {
-                "primary_controls": primary_controls,
-                "confidence": float(confidence),
-                "pipeline_run_id": str(pipeline_run.id),
-                "agent_run_id": str(logger.agent_run.id),
-                "created_tasks": [str(t.id) for t in created_tasks],
-                "stub": False,
-                "cache_hit": False,
+    def _store_embedding(self, ctx: WorkflowContext) -> dict:
+        # For future cache hits; the vector comes from embedding_compute
+        content_hash = ctx["content_hash"]
+        self.cache.store_embedding(
+            evidence=ctx.evidence, text=ctx["text"], content_hash=content_hash, vector=ctx["vector"]
+        )
+        chunk_stats = self.cache.store_chunk_embeddings(evidence=ctx.evidence, text=ctx["text"])
+        ctx.logger.emit_event(
+            "EmbeddingComputed",
+            payload={
+                "evidence_id": str(ctx.evidence.id),
+                "pipeline_run_id": str(ctx.pipeline_run.id),
                 "content_hash": content_hash,
-            }
-            evidence.save(update_fields=["ai_classification"])
+            },
+        )
+        return {"content_hash": content_hash, "stored": True, "chunks": chunk_stats}
 
-            return {
-                "evidence_id": str(evidence.id),
-                "primary_controls": primary_controls,
-                "confidence": float(confidence),
-                "pipeline_run_id": str(pipeline_run.id),
-                "agent_run_id": str(logger.agent_run.id),
-                "stub": False,
-                "cache_hit": False,
-            }
-        except Exception as exc:
-            logger.finish_pipeline(status="failed", details={"error": str(exc)})
-            raise
+    def _update_evidence(self, ctx: WorkflowContext) -> None:
+        evidence = ctx.evidence
+        primary_controls = ctx["primary_controls"]
+        confidence = float(ctx["confidence"])
+        evidence.ai_classification = {
+            "primary_controls": primary_controls,
+            "confidence": confidence,
+            "pipeline_run_id": str(ctx.pipeline_run.id),
+            "agent_run_id": str(ctx.logger.agent_run.id),
+            "created_tasks": ctx["created_task_ids"],
+            "stub": False,
+            "cache_hit": False,
+            "content_hash": ctx["content_hash"],
+            "catalog_version": ctx["catalog_version"],
+        }
+        evidence.save(update_fields=["ai_classification"])
+        ctx.finish_details["result"] = {
+            "primary_controls": primary_controls,
+            "confidence": confidence,
+            "created_tasks": ctx["created_task_ids"],
+        }
+        ctx.result = {
+            "evidence_id": str(evidence.id),
+            "primary_controls": primary_controls,
+            "confidence": confidence,
+            "pipeline_run_id": str(ctx.pipeline_run.id),
+            "agent_run_id": str(ctx.logger.agent_run.id),
+            "stub": False,
+            "cache_hit": False,
+        }
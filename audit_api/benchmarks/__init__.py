@@ -0,0 +1,2 @@
+# audit_api/benchmarks/__init__.py
+"""Helpers shared by the benchmark and load-test management commands."""
@@ -0,0 +1,122 @@
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+# Sentence pools loosely aligned with the seeded SOC 2 controls so FTS finds real candidates.
+TOPIC_SENTENCES = {
+    "access": [
+        "IAM policy grants s3:GetObject and s3:PutObject to the deploy role.",
+        "Quarterly access reviews remove stale permissions for terminated users.",
+        "MFA is enforced for all console logins and privileged roles.",
+        "Resource authorization rules restrict bucket access to the VPC endpoint.",
+    ],
+    "change": [
+        "Production changes require an approved pull request and passing CI.",
+        "Change tickets document testing, rollback plans and approver sign-off.",
+        "Emergency changes are reviewed by the change advisory board within 48 hours.",
+    ],
+    "operations": [
+        "SIEM alerts page the on-call engineer for anomalous API activity.",
+        "Incident response runbooks are exercised twice a year.",
+        "System operations dashboards track error budgets and detection latency.",
+    ],
+    "risk": [
+        "Quarterly risk assessments are performed with owner signoff.",
+        "Vendor risk is tracked in the risk register with mitigation owners.",
+        "Risk mitigation activities are prioritised by likelihood and impact.",
+    ],
+    "governance": [
+        "The code of conduct is acknowledged by all employees annually.",
+        "Board oversight of internal control is documented in meeting minutes.",
+        "Policies are communicated through the internal wiki and onboarding.",
+    ],
+}
+
+SOURCE_TYPES = ["aws_s3", "github", "jira", "okta", "manual"]
+
+
+@dataclass
+class CorpusItem:
+    kind: str  # cold | duplicate | near_duplicate
+    payload: Dict[str, Any]
+    source_index: Optional[int] = None  # index of the item this one copies
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+
+class SyntheticEvidenceCorpus:
+    """
+    Deterministic evidence generator for benchmarks and load tests.
+
+    `duplicate_ratio` of the items are exact copies of an earlier item (exact
+    content-hash cache path) and `near_duplicate_ratio` are lightly edited copies
+    (vector-similarity path); the rest are unique ("cold").
+    """
+
+    def __init__(
+        self,
+        *,
+        size: int,
+        duplicate_ratio: float = 0.0,
+        near_duplicate_ratio: float = 0.0,
+        seed: int = 42,
+        sentences_per_item: int = 6,
+        json_ratio: float = 0.5,
+    ) -> None:
+        if duplicate_ratio + near_duplicate_ratio > 1.0:
+            raise ValueError("duplicate_ratio + near_duplicate_ratio must be <= 1.0")
+        self.size = size
+        self.duplicate_ratio = duplicate_ratio
+        self.near_duplicate_ratio = near_duplicate_ratio
+        self.sentences_per_item = sentences_per_item
+        self.json_ratio = json_ratio
+        self.rng = random.Random(seed)
+
+    def generate(self) -> List[CorpusItem]:
+        items: List[CorpusItem] = []
+        for i in range(self.size):
+            roll = self.rng.random()
+            if items and roll < self.duplicate_ratio:
+                src = self.rng.randrange(len(items))
+                items.append(CorpusItem("duplicate", dict(items[src].payload), source_index=src))
+            elif items and roll < self.duplicate_ratio + self.near_duplicate_ratio:
+                src = self.rng.randrange(len(items))
+                items.append(
+                    CorpusItem("near_duplicate", self._perturb(items[src].payload), source_index=src)
+                )
+            else:
+                items.append(CorpusItem("cold", self._fresh(i)))
+        return items
+
+    def _fresh(self, index: int) -> Dict[str, Any]:
+        topic = self.rng.choice(sorted(TOPIC_SENTENCES))
+        pool = TOPIC_SENTENCES[topic] + [s for t in TOPIC_SENTENCES.values() for s in t]
+        sentences = [self.rng.choice(pool) for _ in range(self.sentences_per_item)]
+        sentences.append(f"Evidence reference BM-{index:06d}-{self.rng.getrandbits(32):08x}.")
+        source = self.rng.choice(SOURCE_TYPES)
+        payload: Dict[str, Any] = {
+            "title": f"Benchmark {topic} evidence {index}",
+            "description": f"Synthetic {topic} evidence",
+            "source_type_id": source,
+            "evidence_type_id": topic,
+        }
+        if self.rng.random() < self.json_ratio:
+            payload["raw_json"] = {
+                "source": source,
+                "topic": topic,
+                "findings": sentences,
+                "resource": f"arn:aws:s3:::bench-{index}",
+            }
+        else:
+            payload["raw_text"] = "\n".join(sentences)
+        return payload
+
+    def _perturb(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        edited = dict(payload)
+        suffix = f"Reviewed on day {self.rng.randint(1, 365)}."
+        if "raw_json" in edited:
+            doc = dict(edited["raw_json"])
+            doc["findings"] = list(doc.get("findings", [])) + [suffix]
+            edited["raw_json"] = doc
+        else:
+            edited["raw_text"] = f"{edited.get('raw_text', '')}\n{suffix}"
+        return edited
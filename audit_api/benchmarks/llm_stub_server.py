@@ -0,0 +1,111 @@
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 chars per token), good enough for a stand-in."""
+    return max(1, len(text or "") // 4)
+
+
+def score(text: str, controls: list, confidence: float) -> Tuple[float, str]:
+    """Deterministic adjustment: nudge confidence by how many control keywords appear in the text."""
+    words = set(re.findall(r"[a-z0-9]+", (text or "").lower()))
+    hits = sum(1 for c in controls if set(re.findall(r"[a-z0-9]+", c.lower())) & words)
+    adjusted = min(0.99, max(0.0, confidence + 0.02 * hits - (0.05 if not hits and controls else 0.0)))
+    return round(adjusted, 4), f"stub validator: {hits}/{len(controls)} controls referenced in text"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "AuditMindLLMStub/1.0"
+
+    def log_message(self, format, *args):  # keep test output quiet
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send(400, {"error": "invalid json"})
+            return
+
+        if self.server.latency_ms:
+            jitter = self.server.rng.uniform(0, self.server.jitter_ms) if self.server.jitter_ms else 0
+            time.sleep((self.server.latency_ms + jitter) / 1000)
+        if self.server.failure_rate and self.server.rng.random() < self.server.failure_rate:
+            self._send(503, {"error": "injected failure"})
+            return
+
+        results = []
+        for item in payload.get("requests") or []:
+            confidence, justification = score(
+                item.get("text", ""),
+                item.get("controls") or [],
+                float(item.get("confidence") or 0),
+            )
+            results.append(
+                {
+                    "confidence": confidence,
+                    "justification": justification,
+                    "usage": {
+                        "prompt_tokens": estimate_tokens(item.get("text", "")) + 40,
+                        "completion_tokens": estimate_tokens(justification),
+                    },
+                }
+            )
+        self._send(200, {"model": payload.get("model"), "results": results})
+
+    def _send(self, status: int, body: dict) -> None:
+        data = json.dumps(body).encode("utf-8")
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client gave up (timeout); expected when exercising the breaker
+
+
+class LLMStubServer(ThreadingHTTPServer):
+    """
+    Local stand-in for an LLM validation endpoint (HttpValidationProvider
+    contract), with injectable latency and failures for exercising timeouts
+    and the circuit breaker.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: Optional[int] = None,
+        verbose: bool = False,
+    ) -> None:
+        super().__init__((host, port), _Handler)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self.rng = random.Random(seed)
+        self.verbose = verbose
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/validate"
+
+    def start_in_thread(self) -> threading.Thread:
+        thread = threading.Thread(target=self.serve_forever, name="llm-stub-server", daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,356 @@
+import asyncio
+import json
+import random
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from audit_api.benchmarks.corpus import SyntheticEvidenceCorpus
+from audit_api.benchmarks.stats import summarize_ms
+
+
+@dataclass
+class HttpResult:
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+
+
+class AsyncHttpClient:
+    """
+    Minimal HTTP/1.1 client on asyncio streams (one connection per request).
+
+    Kept dependency-free on purpose so the harness runs anywhere the API does.
+    """
+
+    def __init__(self, base_url: str, *, timeout: float = 30.0) -> None:
+        parts = urlsplit(base_url)
+        if parts.scheme != "http":
+            raise ValueError("Only http:// base URLs are supported.")
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        headers: Optional[Dict[str, str]] = None,
+        body: bytes = b"",
+    ) -> HttpResult:
+        return await asyncio.wait_for(self._request(method, path, headers or {}, body), self.timeout)
+
+    async def _request(self, method: str, path: str, headers: Dict[str, str], body: bytes) -> HttpResult:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            lines = [
+                f"{method} {self.prefix}{path} HTTP/1.1",
+                f"Host: {self.host}:{self.port}",
+                "Connection: close",
+                f"Content-Length: {len(body)}",
+            ]
+            lines += [f"{k}: {v}" for k, v in headers.items()]
+            writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+            await writer.drain()
+            raw = await reader.read()
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+        return self._parse(raw)
+
+    @staticmethod
+    def _parse(raw: bytes) -> HttpResult:
+        head, _, body = raw.partition(b"\r\n\r\n")
+        head_lines = head.decode("latin-1").split("\r\n")
+        status = int(head_lines[0].split(" ", 2)[1])
+        headers = {}
+        for line in head_lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            body = AsyncHttpClient._dechunk(body)
+        return HttpResult(status=status, headers=headers, body=body)
+
+    @staticmethod
+    def _dechunk(body: bytes) -> bytes:
+        out = bytearray()
+        while body:
+            size_line, _, rest = body.partition(b"\r\n")
+            size = int(size_line.split(b";")[0], 16)
+            if size == 0:
+                break
+            out += rest[:size]
+            body = rest[size + 2:]
+        return bytes(out)
+
+
+@dataclass
+class Sample:
+    endpoint: str
+    status: int
+    latency_ms: float
+    query_count: Optional[int]
+    query_ms: Optional[float]
+
+
+@dataclass
+class FixtureOrg:
+    id: str
+    tokens: Dict[str, str]
+    evidence_ids: List[str]
+
+
+@dataclass
+class LoadState:
+    """Shared, mutable pool of ids discovered while the load runs."""
+
+    orgs: List[FixtureOrg]
+    job_ids: List[str] = field(default_factory=list)
+
+
+def multipart_body(fields: Dict[str, str], *, filename: str, content: bytes) -> Tuple[bytes, str]:
+    boundary = f"----auditmind{uuid.uuid4().hex}"
+    parts = []
+    for name, value in fields.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        )
+    parts.append(
+        (
+            f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+            "Content-Type: application/octet-stream\r\n\r\n"
+        ).encode()
+        + content
+        + b"\r\n"
+    )
+    parts.append(f"--{boundary}--\r\n".encode())
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+class LoadGenerator:
+    """
+    Weighted scenario mix against /api/, run by `concurrency` asyncio workers.
+
+    Weights default to the production mix: timeline polling dominates, followed by
+    evidence POST bursts, task listing, job polling and file uploads.
+    """
+
+    DEFAULT_WEIGHTS = {
+        "evidence_bulk_post": 3,
+        "file_upload": 1,
+        "timeline_poll": 4,
+        "task_list": 2,
+        "classify_async": 1,
+        "job_status_poll": 2,
+    }
+
+    def __init__(
+        self,
+        *,
+        client: AsyncHttpClient,
+        state: LoadState,
+        weights: Optional[Dict[str, int]] = None,
+        bulk_size: int = 5,
+        upload_sizes: Optional[List[int]] = None,
+        seed: int = 7,
+    ) -> None:
+        self.client = client
+        self.state = state
+        self.weights = {k: v for k, v in (weights or self.DEFAULT_WEIGHTS).items() if v > 0}
+        self.bulk_size = bulk_size
+        self.upload_sizes = upload_sizes or [1024, 64 * 1024, 1024 * 1024]
+        self.rng = random.Random(seed)
+        self.corpus = SyntheticEvidenceCorpus(size=256, seed=seed).generate()
+        self.samples: List[Sample] = []
+        self.scenarios: Dict[str, Callable] = {
+            "evidence_bulk_post": self.evidence_bulk_post,
+            "file_upload": self.file_upload,
+            "timeline_poll": self.timeline_poll,
+            "task_list": self.task_list,
+            "classify_async": self.classify_async,
+            "job_status_poll": self.job_status_poll,
+        }
+        unknown = set(self.weights) - set(self.scenarios)
+        if unknown:
+            raise ValueError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    async def run(self, *, duration: float, concurrency: int, max_requests: Optional[int] = None) -> Dict[str, Any]:
+        deadline = time.perf_counter() + duration
+        started = time.perf_counter()
+
+        async def worker():
+            names = list(self.weights)
+            weights = [self.weights[n] for n in names]
+            while time.perf_counter() < deadline:
+                if max_requests is not None and len(self.samples) >= max_requests:
+                    return
+                scenario = self.rng.choices(names, weights=weights)[0]
+                await self.scenarios[scenario]()
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return self.report(time.perf_counter() - started)
+
+    # --- scenarios -------------------------------------------------------
+
+    async def evidence_bulk_post(self):
+        org = self._org()
+        for _ in range(self.bulk_size):
+            payload = {"organization_id": org.id, **self.rng.choice(self.corpus).payload}
+            result = await self._call(
+                "POST /api/evidence/",
+                "POST",
+                "/api/evidence/",
+                token=org.tokens["member"],
+                json_body=payload,
+            )
+            if result and result.status == 201:
+                created = json.loads(result.body).get("evidence", {}).get("id")
+                if created:
+                    org.evidence_ids.append(created)
+
+    async def file_upload(self):
+        org = self._org()
+        size = self.rng.choice(self.upload_sizes)
+        line = self.rng.choice(self.corpus).payload.get("raw_text") or "iam policy s3 access review"
+        content = (line.encode() + b"\n") * (size // (len(line) + 1) + 1)
+        body, content_type = multipart_body(
+            {"organization_id": org.id, "title": f"loadtest upload {size}B"},
+            filename="loadtest.log",
+            content=content[:size],
+        )
+        await self._call(
+            f"POST /api/evidence/upload/ [{size}B]",
+            "POST",
+            "/api/evidence/upload/",
+            token=org.tokens["member"],
+            body=body,
+            content_type=content_type,
+        )
+
+    async def timeline_poll(self):
+        org = self._org()
+        if not org.evidence_ids:
+            return await self.task_list()
+        evidence_id = self.rng.choice(org.evidence_ids)
+        await self._call(
+            "GET /api/evidence/<id>/timeline/",
+            "GET",
+            f"/api/evidence/{evidence_id}/timeline/",
+            token=org.tokens["viewer"],
+        )
+
+    async def task_list(self):
+        org = self._org()
+        await self._call(
+            "GET /api/tasks/",
+            "GET",
+            f"/api/tasks/?organization_id={org.id}",
+            token=org.tokens["viewer"],
+        )
+
+    async def classify_async(self):
+        org = self._org()
+        if not org.evidence_ids:
+            return await self.evidence_bulk_post()
+        evidence_id = self.rng.choice(org.evidence_ids)
+        result = await self._call(
+            "POST /api/evidence/<id>/classify/?async=1",
+            "POST",
+            f"/api/evidence/{evidence_id}/classify/?async=1",
+            token=org.tokens["member"],
+        )
+        if result and result.status == 202:
+            self.state.job_ids.append(json.loads(result.body)["job_id"])
+
+    async def job_status_poll(self):
+        if not self.state.job_ids:
+            return await self.classify_async()
+        job_id = self.rng.choice(self.state.job_ids[-200:])
+        await self._call("GET /api/jobs/<id>/", "GET", f"/api/jobs/{job_id}/")
+
+    # --- plumbing --------------------------------------------------------
+
+    def _org(self) -> FixtureOrg:
+        return self.rng.choice(self.state.orgs)
+
+    async def _call(
+        self,
+        endpoint: str,
+        method: str,
+        path: str,
+        *,
+        token: Optional[str] = None,
+        json_body: Any = None,
+        body: bytes = b"",
+        content_type: Optional[str] = None,
+    ) -> Optional[HttpResult]:
+        headers = {"Accept": "application/json"}
+        if token:
+            headers["Authorization"] = f"Token {token}"
+        if json_body is not None:
+            body = json.dumps(json_body).encode("utf-8")
+            content_type = "application/json"
+        if content_type:
+            headers["Content-Type"] = content_type
+
+        started = time.perf_counter()
+        try:
+            result = await self.client.request(method, path, headers=headers, body=body)
+        except (OSError, asyncio.TimeoutError, ValueError):
+            self.samples.append(Sample(endpoint, 0, (time.perf_counter() - started) * 1000, None, None))
+            return None
+        elapsed = (time.perf_counter() - started) * 1000
+
+        query_count = result.headers.get("x-db-query-count")
+        query_ms = result.headers.get("x-db-query-time-ms")
+        self.samples.append(
+            Sample(
+                endpoint=endpoint,
+                status=result.status,
+                latency_ms=elapsed,
+                query_count=int(query_count) if query_count else None,
+                query_ms=float(query_ms) if query_ms else None,
+            )
+        )
+        return result
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        by_endpoint: Dict[str, List[Sample]] = defaultdict(list)
+        for sample in self.samples:
+            by_endpoint[sample.endpoint].append(sample)
+
+        endpoints = {}
+        for endpoint, samples in sorted(by_endpoint.items()):
+            queries = [s.query_count for s in samples if s.query_count is not None]
+            query_ms = [s.query_ms for s in samples if s.query_ms is not None]
+            statuses: Dict[str, int] = defaultdict(int)
+            for s in samples:
+                statuses[str(s.status)] += 1
+            endpoints[endpoint] = {
+                "requests": len(samples),
+                "errors": sum(1 for s in samples if s.status == 0 or s.status >= 500),
+                "throughput_per_sec": round(len(samples) / elapsed, 3) if elapsed else None,
+                "latency": summarize_ms(s.latency_ms for s in samples),
+                "statuses": dict(statuses),
+                "db_queries": {
+                    "mean": round(sum(queries) / len(queries), 2) if queries else None,
+                    "max": max(queries) if queries else None,
+                    "mean_time_ms": round(sum(query_ms) / len(query_ms), 3) if query_ms else None,
+                },
+            }
+
+        return {
+            "elapsed_sec": round(elapsed, 3),
+            "requests": len(self.samples),
+            "throughput_per_sec": round(len(self.samples) / elapsed, 3) if elapsed else None,
+            "latency": summarize_ms(s.latency_ms for s in self.samples),
+            "endpoints": endpoints,
+        }
@@ -0,0 +1,44 @@
+import math
+import subprocess
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile on an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize_ms(values: Iterable[float]) -> Dict[str, float]:
+    """Latency summary (inputs in milliseconds) in the shape used by all benchmark JSON."""
+    ordered = sorted(float(v) for v in values)
+    if not ordered:
+        return {"count": 0}
+    return {
+        "count": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered), 3),
+        "p50_ms": round(percentile(ordered, 50), 3),
+        "p95_ms": round(percentile(ordered, 95), 3),
+        "p99_ms": round(percentile(ordered, 99), 3),
+        "max_ms": round(ordered[-1], 3),
+    }
+
+
+def git_revision() -> Optional[str]:
+    """Commit the numbers belong to, so JSON outputs can be compared across commits."""
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(settings.BASE_DIR),
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from audit_api.models import Organization
+from audit_api.services.pipeline_archive_service import PipelineArchiveService
+
+
+class Command(BaseCommand):
+    help = (
+        "Move agent runs (with step logs, events and classifier outputs) older than N days into "
+        "compressed NDJSON archives under var/archive/pipeline, leaving ArchivedAgentRun summaries."
+    )
+
+    def add_arguments(self, parser):
+        target = parser.add_mutually_exclusive_group(required=True)
+        target.add_argument("--organization", help="Organization UUID to archive.")
+        target.add_argument("--all-organizations", action="store_true")
+        parser.add_argument("--older-than-days", type=int, default=None)
+        parser.add_argument("--batch-size", type=int, default=200)
+        parser.add_argument(
+            "--include-latest",
+            action="store_true",
+            help="Also archive the most recent run of each evidence item.",
+        )
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        days = options["older_than_days"] or settings.PIPELINE_ARCHIVE_AFTER_DAYS
+        if days <= 0:
+            raise CommandError("--older-than-days must be positive")
+
+        if options["all_organizations"]:
+            org_ids = list(Organization.objects.values_list("id", flat=True))
+        else:
+            if not Organization.objects.filter(id=options["organization"]).exists():
+                raise CommandError("Organization not found.")
+            org_ids = [options["organization"]]
+
+        service = PipelineArchiveService()
+        for org_id in org_ids:
+            totals = service.archive_organization(
+                org_id,
+                older_than_days=days,
+                batch_size=options["batch_size"],
+                include_latest=options["include_latest"],
+                dry_run=options["dry_run"],
+            )
+            if totals:
+                summary = ", ".join(f"{k}={v}" for k, v in sorted(totals.items()))
+                prefix = "Would archive" if options["dry_run"] else "Archived"
+                self.stdout.write(f"{org_id}: {prefix} {summary}")
+
+        self.stdout.write(self.style.SUCCESS("Archive complete."))
@@ -0,0 +1,90 @@
+import json
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from audit_api.services.embedding_backfill_service import EmbeddingBackfillService
+from audit_api.tasks import enqueue_embedding_backfill
+
+
+class Command(BaseCommand):
+    help = (
+        "Compute evidence embeddings for a model without re-running classification. Walks Evidence in "
+        "primary-key order with a persistent cursor, so it can be stopped and resumed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", help="ModelRegistry embedding model name; defaults to EMBEDDING_MODEL.")
+        parser.add_argument("--batch-size", type=int, default=200, help="Evidence rows per transaction.")
+        parser.add_argument("--sub-batch-size", type=int, default=32, help="Texts per backend batch call.")
+        parser.add_argument("--workers", type=int, default=4, help="Threads issuing backend calls.")
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=0,
+            help="Worker processes for text, hashing and embedding (local CPU backends; 0 = use threads).",
+        )
+        parser.add_argument("--rate-limit", type=float, default=0.0, help="Max backend calls per second (0 = off).")
+        parser.add_argument("--max-batches", type=int, default=None)
+        parser.add_argument("--only-missing", action="store_true", help="Skip evidence that already has a vector.")
+        parser.add_argument("--chunks", action="store_true", help="Also write chunk embeddings.")
+        parser.add_argument("--reset", action="store_true", help="Start over from the first evidence row.")
+        parser.add_argument("--enqueue", action="store_true", help="Run as self-re-enqueuing RQ jobs.")
+        parser.add_argument("--batches-per-job", type=int, default=10)
+        parser.add_argument("--pause", action="store_true", help="Pause a running backfill and exit.")
+
+    def handle(self, *args, **options):
+        try:
+            service = EmbeddingBackfillService(
+                model_name=options["model"],
+                batch_size=options["batch_size"],
+                sub_batch_size=options["sub_batch_size"],
+                workers=options["workers"],
+                rate_limit=options["rate_limit"],
+                processes=options["processes"],
+            )
+        except ImproperlyConfigured as exc:
+            raise CommandError(str(exc))
+
+        if options["pause"]:
+            paused = service.pause()
+            self.stdout.write(f"{'Paused' if paused else 'No running backfill for'} {service.model_name}")
+            return
+
+        try:
+            cursor = service.get_cursor(
+                reset=options["reset"],
+                only_missing=options["only_missing"],
+                include_chunks=options["chunks"],
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        if cursor.status == "completed":
+            self.stdout.write(f"Backfill for {service.model_name} already completed; pass --reset to run again.")
+            return
+
+        if options["enqueue"]:
+            job = enqueue_embedding_backfill(
+                service.model_name,
+                batch_size=options["batch_size"],
+                sub_batch_size=options["sub_batch_size"],
+                batches_per_job=options["batches_per_job"],
+                workers=options["workers"],
+                rate_limit=options["rate_limit"],
+                processes=options["processes"],
+            )
+            self.stdout.write(self.style.SUCCESS(f"Enqueued backfill job {job.id} for {service.model_name}"))
+            return
+
+        result = service.run(cursor, max_batches=options["max_batches"])
+        cursor.refresh_from_db()
+        result.update(
+            {
+                "model": service.model_name,
+                "status": cursor.status,
+                "processed_total": cursor.processed_count,
+                "embedded_total": cursor.embedded_count,
+                "last_evidence_id": str(cursor.last_evidence_id) if cursor.last_evidence_id else None,
+            }
+        )
+        self.stdout.write(json.dumps(result, indent=2))
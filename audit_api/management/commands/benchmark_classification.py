@@ -0,0 +1,161 @@
+import io
+import json
+import shutil
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from audit_api.agents.evidence_classifier import EvidenceClassifierAgent
+from audit_api.benchmarks.corpus import SyntheticEvidenceCorpus
+from audit_api.benchmarks.stats import git_revision, summarize_ms
+from audit_api.models import AgentRun, AgentStepLog, AiPipelineRun, Event, Organization
+from audit_api.services.evidence_service import EvidenceService
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark EvidenceClassifierAgent on a synthetic corpus (cold, exact-duplicate and "
+        "near-duplicate paths) and print per-stage/end-to-end latency as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size", type=int, default=100, help="Evidence items to classify.")
+        parser.add_argument("--duplicate-ratio", type=float, default=0.2)
+        parser.add_argument("--near-duplicate-ratio", type=float, default=0.1)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--sentences", type=int, default=6, help="Sentences per generated item.")
+        parser.add_argument("--warmup", type=int, default=5, help="Extra items classified first and not measured.")
+        parser.add_argument("--output", help="Write JSON here instead of stdout.")
+        parser.add_argument("--keep", action="store_true", help="Keep the benchmark organization and its rows.")
+
+    def handle(self, *args, **options):
+        if options["size"] <= 0:
+            raise CommandError("--size must be positive")
+
+        call_command("seed_soc2_controls", stdout=io.StringIO())
+
+        corpus = SyntheticEvidenceCorpus(
+            size=options["size"] + options["warmup"],
+            duplicate_ratio=options["duplicate_ratio"],
+            near_duplicate_ratio=options["near_duplicate_ratio"],
+            seed=options["seed"],
+            sentences_per_item=options["sentences"],
+        ).generate()
+
+        org = Organization.objects.create(
+            name=f"benchmark-{timezone.now():%Y%m%d%H%M%S}",
+            plan="benchmark",
+        )
+        evidence_service = EvidenceService()
+        agent = EvidenceClassifierAgent()
+
+        ingest_ms = []
+        e2e_by_path = defaultdict(list)
+        e2e_by_kind = defaultdict(list)
+        run_paths = {}
+        outcomes = defaultdict(lambda: defaultdict(int))
+        pipeline_run_ids = []
+
+        try:
+            measured_started = None
+            for index, item in enumerate(corpus):
+                measured = index >= options["warmup"]
+                if measured and measured_started is None:
+                    measured_started = time.perf_counter()
+
+                started = time.perf_counter()
+                evidence = evidence_service.create_from_payload({"organization_id": org.id, **item.payload})
+                ingested = time.perf_counter()
+                result = agent.classify(evidence)
+                finished = time.perf_counter()
+
+                pipeline_run_ids.append(result["pipeline_run_id"])
+                if not measured:
+                    continue
+
+                path = self._path(result)
+                run_paths[result["pipeline_run_id"]] = path
+                ingest_ms.append((ingested - started) * 1000)
+                e2e_by_path[path].append((finished - ingested) * 1000)
+                e2e_by_kind[item.kind].append((finished - ingested) * 1000)
+                outcomes[item.kind][path] += 1
+
+            elapsed = time.perf_counter() - (measured_started or time.perf_counter())
+            report = {
+                "meta": {
+                    "revision": git_revision(),
+                    "generated_at": timezone.now().isoformat(),
+                    "database": connection.vendor,
+                    "size": options["size"],
+                    "warmup": options["warmup"],
+                    "duplicate_ratio": options["duplicate_ratio"],
+                    "near_duplicate_ratio": options["near_duplicate_ratio"],
+                    "seed": options["seed"],
+                    "agent_version": agent.version,
+                },
+                "throughput_per_sec": round(options["size"] / elapsed, 3) if elapsed else None,
+                "ingest": summarize_ms(ingest_ms),
+                "end_to_end": {path: summarize_ms(v) for path, v in sorted(e2e_by_path.items())},
+                "end_to_end_by_kind": {kind: summarize_ms(v) for kind, v in sorted(e2e_by_kind.items())},
+                "stages": self._stage_stats(run_paths),
+                "outcomes": {kind: dict(paths) for kind, paths in sorted(outcomes.items())},
+            }
+        finally:
+            if not options["keep"]:
+                self._cleanup(org, pipeline_run_ids)
+
+        payload = json.dumps(report, indent=2, sort_keys=True)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as fh:
+                fh.write(payload + "\n")
+            self.stderr.write(self.style.SUCCESS(f"Benchmark written to {options['output']}"))
+        else:
+            self.stdout.write(payload)
+
+    @staticmethod
+    def _path(result: dict) -> str:
+        if not result.get("cache_hit"):
+            return "cold"
+        if float(result.get("similarity") or 0.0) >= 1.0:
+            return "cache_hit_exact"
+        return "cache_hit_similar"
+
+    @staticmethod
+    def _stage_stats(run_paths: dict) -> dict:
+        """Per-path, per-step latency taken from AgentStepLog timestamps (plus SQL counts)."""
+        durations = defaultdict(lambda: defaultdict(list))
+        queries = defaultdict(lambda: defaultdict(list))
+        logs = AgentStepLog.objects.filter(
+            agent_run__pipeline_run_id__in=list(run_paths),
+            finished_at__isnull=False,
+        ).values_list("agent_run__pipeline_run_id", "step_name", "started_at", "finished_at", "metadata")
+        for run_id, step_name, started_at, finished_at, metadata in logs.iterator():
+            path = run_paths[str(run_id)]
+            durations[path][step_name].append((finished_at - started_at).total_seconds() * 1000)
+            sql = (metadata or {}).get("sql") or {}
+            if "query_count" in sql:
+                queries[path][step_name].append(sql["query_count"])
+
+        out = {}
+        for path, steps in sorted(durations.items()):
+            out[path] = {}
+            for step_name, values in sorted(steps.items()):
+                stats = summarize_ms(values)
+                counts = queries[path][step_name]
+                if counts:
+                    stats["mean_queries"] = round(sum(counts) / len(counts), 2)
+                out[path][step_name] = stats
+        return out
+
+    @staticmethod
+    def _cleanup(org: Organization, pipeline_run_ids: list) -> None:
+        Event.objects.filter(organization=org).delete()
+        AgentRun.objects.filter(pipeline_run_id__in=pipeline_run_ids).delete()
+        AiPipelineRun.objects.filter(id__in=pipeline_run_ids).delete()
+        org.delete()
+        shutil.rmtree(settings.EVIDENCE_UPLOAD_DIR / str(org.id), ignore_errors=True)
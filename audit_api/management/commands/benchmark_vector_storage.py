@@ -0,0 +1,171 @@
+import json
+import math
+import random
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from audit_api.benchmarks.stats import git_revision, summarize_ms
+from audit_api.models import Evidence, EvidenceEmbedding, Organization
+from audit_api.services.embedding_backends import resolve_embedding_backend
+from audit_api.services.vector_storage_service import (
+    STORAGE_MODES,
+    VectorStorageService,
+    index_name,
+    quantized_columns,
+)
+
+
+def _unit(values):
+    norm = math.sqrt(sum(x * x for x in values)) or 1.0
+    return [x / norm for x in values]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare full / halfvec / binary ANN storage for evidence_embeddings: HNSW index size, "
+        "recall@1 against an exact full-precision scan at the cache threshold, and lookup latency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", help="Embedding model to benchmark; defaults to EMBEDDING_MODEL.")
+        parser.add_argument("--synthetic", type=int, default=0, help="Insert this many synthetic embeddings first.")
+        parser.add_argument("--queries", type=int, default=200)
+        parser.add_argument("--threshold", type=float, default=0.30)
+        parser.add_argument("--noise", type=float, default=0.12, help="L2 norm of the perturbation applied to queries.")
+        parser.add_argument("--rerank-k", type=int, default=None)
+        parser.add_argument("--modes", default=",".join(STORAGE_MODES))
+        parser.add_argument("--seed", type=int, default=13)
+        parser.add_argument("--output", help="Write JSON here instead of stdout.")
+        parser.add_argument("--keep", action="store_true", help="Keep synthetic rows and all benchmark indexes.")
+
+    def handle(self, *args, **options):
+        modes = [m.strip() for m in options["modes"].split(",") if m.strip()]
+        unknown = set(modes) - set(STORAGE_MODES)
+        if unknown:
+            raise CommandError(f"Unknown modes: {', '.join(sorted(unknown))}")
+
+        backend = resolve_embedding_backend(options["model"])
+        rows = EvidenceEmbedding.objects.filter(model_name=backend.name)
+        rng = random.Random(options["seed"])
+        org = self._seed(options["synthetic"], rng, backend) if options["synthetic"] else None
+        created_indexes = []
+        try:
+            VectorStorageService.backfill_quantized()
+            sample = list(rows.order_by("?").values_list("vector", flat=True)[: options["queries"]])
+            if not sample:
+                raise CommandError("No embeddings to query; pass --synthetic N.")
+            queries = [self._perturb(list(v), options["noise"], rng) for v in sample]
+            exact = VectorStorageService(model_name=backend.name, dims=backend.dims, mode="full")
+            truth = [self._exact(exact, q, options["threshold"]) for q in queries]
+
+            report = {
+                "meta": {
+                    "revision": git_revision(),
+                    "generated_at": timezone.now().isoformat(),
+                    "model": backend.describe(),
+                    "rows": rows.count(),
+                    "queries": len(queries),
+                    "threshold": options["threshold"],
+                    "noise": options["noise"],
+                    "seed": options["seed"],
+                },
+                "modes": {},
+            }
+            for mode in modes:
+                service = VectorStorageService(
+                    model_name=backend.name, dims=backend.dims, mode=mode, rerank_k=options["rerank_k"]
+                )
+                name = index_name("evidence_embeddings", backend.name, mode)
+                existed = service.index_size(name) is not None
+                started = time.perf_counter()
+                service.ensure_index()
+                build_seconds = time.perf_counter() - started
+                if not existed:
+                    created_indexes.append(name)
+
+                latencies, agree = [], 0
+                for query, expected in zip(queries, truth):
+                    started = time.perf_counter()
+                    found = service.nearest(EvidenceEmbedding.objects.all(), query, threshold=options["threshold"])
+                    latencies.append((time.perf_counter() - started) * 1000)
+                    agree += (found.id if found else None) == expected
+
+                report["modes"][mode] = {
+                    "index": name,
+                    "index_bytes": service.index_size(name),
+                    "index_build_seconds": round(build_seconds, 3) if not existed else None,
+                    "rerank_k": service.rerank_k if mode != "full" else None,
+                    "recall_at_1": round(agree / len(queries), 4),
+                    "lookup": summarize_ms(latencies),
+                }
+        finally:
+            if not options["keep"]:
+                configured = index_name("evidence_embeddings", backend.name, settings.EMBEDDING_VECTOR_STORAGE)
+                with connection.cursor() as cursor:
+                    for name in created_indexes:
+                        if name != configured:
+                            cursor.execute(f'DROP INDEX IF EXISTS "{name}"')
+                if org is not None:
+                    org.delete()
+
+        payload = json.dumps(report, indent=2, sort_keys=True)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as fh:
+                fh.write(payload + "\n")
+            self.stderr.write(self.style.SUCCESS(f"Benchmark written to {options['output']}"))
+        else:
+            self.stdout.write(payload)
+
+    @staticmethod
+    def _perturb(vector, noise, rng):
+        delta = _unit([rng.gauss(0, 1) for _ in vector])
+        return _unit([v + d * noise for v, d in zip(vector, delta)])
+
+    @staticmethod
+    def _exact(service, vector, threshold):
+        # Ground truth: sequential scan on full precision, no ANN index.
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_indexscan = off")
+            row = (
+                EvidenceEmbedding.objects.filter(model_name=service.model_name)
+                .annotate(distance=service.distance(vector))
+                .filter(distance__lte=threshold)
+                .order_by("distance")
+                .values_list("id", flat=True)
+                .first()
+            )
+        return row
+
+    @staticmethod
+    def _seed(count, rng, backend):
+        org = Organization.objects.create(name=f"vector-benchmark-{timezone.now():%Y%m%d%H%M%S}", plan="benchmark")
+        dims = backend.dims
+        # Clustered vectors so some queries have near neighbours and some do not.
+        centers = [_unit([rng.gauss(0, 1) for _ in range(dims)]) for _ in range(max(1, count // 20))]
+        for start in range(0, count, 1000):
+            size = min(1000, count - start)
+            evidence = Evidence.objects.bulk_create(
+                [
+                    Evidence(organization=org, title=f"vector benchmark {start + i}", storage_path="")
+                    for i in range(size)
+                ]
+            )
+            rows = []
+            for item in evidence:
+                center = rng.choice(centers)
+                vector = _unit([c + rng.gauss(0, 0.05) for c in center])
+                rows.append(
+                    EvidenceEmbedding(
+                        evidence=item,
+                        model_name=backend.name,
+                        vector=vector,
+                        content_hash=f"{item.id.hex:0<64}",
+                        **quantized_columns(vector),
+                    )
+                )
+            EvidenceEmbedding.objects.bulk_create(rows)
+        return org
@@ -0,0 +1,90 @@
+import asyncio
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from audit_api.benchmarks.loadgen import AsyncHttpClient, FixtureOrg, LoadGenerator, LoadState
+from audit_api.benchmarks.stats import git_revision
+
+
+def _parse_size(value: str) -> int:
+    value = value.strip().lower()
+    units = {"k": 1024, "m": 1024 * 1024}
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive a production-like request mix against a running API and report throughput, "
+        "latency percentiles and DB query counts per endpoint. Run the server with "
+        "QUERY_COUNT_HEADERS=1 to get query counts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fixtures", default="loadtest_fixtures.json", help="Output of seed_loadtest_fixtures.")
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run.")
+        parser.add_argument("--concurrency", type=int, default=10)
+        parser.add_argument("--max-requests", type=int, default=None)
+        parser.add_argument("--bulk-size", type=int, default=5, help="Evidence POSTs per bulk burst.")
+        parser.add_argument("--upload-sizes", default="1k,64k,1m", help="Comma-separated upload sizes.")
+        parser.add_argument(
+            "--weights",
+            default=None,
+            help='Scenario weights as JSON, e.g. \'{"timeline_poll": 5, "file_upload": 0}\'.',
+        )
+        parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds.")
+        parser.add_argument("--seed", type=int, default=7)
+        parser.add_argument("--output", help="Write JSON here instead of stdout.")
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["fixtures"], encoding="utf-8") as fh:
+                fixtures = json.load(fh)
+        except FileNotFoundError:
+            raise CommandError("Fixture file not found; run seed_loadtest_fixtures first.")
+
+        weights = dict(LoadGenerator.DEFAULT_WEIGHTS)
+        if options["weights"]:
+            weights.update(json.loads(options["weights"]))
+
+        state = LoadState(orgs=[FixtureOrg(**org) for org in fixtures["orgs"]])
+        if not state.orgs:
+            raise CommandError("Fixture file contains no organizations.")
+
+        try:
+            generator = LoadGenerator(
+                client=AsyncHttpClient(options["base_url"], timeout=options["timeout"]),
+                state=state,
+                weights=weights,
+                bulk_size=options["bulk_size"],
+                upload_sizes=[_parse_size(s) for s in options["upload_sizes"].split(",") if s.strip()],
+                seed=options["seed"],
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        report = asyncio.run(
+            generator.run(
+                duration=options["duration"],
+                concurrency=options["concurrency"],
+                max_requests=options["max_requests"],
+            )
+        )
+        report["meta"] = {
+            "revision": git_revision(),
+            "base_url": options["base_url"],
+            "concurrency": options["concurrency"],
+            "duration": options["duration"],
+            "weights": weights,
+        }
+
+        payload = json.dumps(report, indent=2, sort_keys=True)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as fh:
+                fh.write(payload + "\n")
+            self.stderr.write(self.style.SUCCESS(f"Load test report written to {options['output']}"))
+        else:
+            self.stdout.write(payload)
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from audit_api.services.partition_service import PartitionService
+
+
+class Command(BaseCommand):
+    help = (
+        "Create upcoming monthly partitions for events/agent_step_logs and, with --apply-retention, "
+        "detach + archive partitions older than PARTITION_RETENTION_MONTHS. Run daily from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--months-ahead", type=int, default=None)
+        parser.add_argument("--apply-retention", action="store_true")
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        service = PartitionService()
+
+        created = service.ensure_future_partitions(
+            months_ahead=options["months_ahead"],
+            dry_run=options["dry_run"],
+        )
+        for name in created:
+            self.stdout.write(f"{'Would create' if options['dry_run'] else 'Created'} partition {name}")
+
+        if options["apply_retention"]:
+            archived = service.apply_retention(dry_run=options["dry_run"])
+            for name in archived:
+                self.stdout.write(f"{'Would archive' if options['dry_run'] else 'Archived and dropped'} {name}")
+
+        for table, count in service.default_row_counts().items():
+            if count:
+                self.stderr.write(
+                    self.style.WARNING(
+                        f"{table}_default holds {count} rows; partitions are not being created far enough ahead."
+                    )
+                )
+
+        self.stdout.write(self.style.SUCCESS("Partition maintenance complete."))
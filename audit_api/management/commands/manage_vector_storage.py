@@ -0,0 +1,37 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from audit_api.services.embedding_backends import resolve_embedding_backend
+from audit_api.services.vector_storage_service import STORAGE_MODES, VectorStorageService
+
+
+class Command(BaseCommand):
+    help = (
+        "Prepare an embedding model's vectors for the configured EMBEDDING_VECTOR_STORAGE mode: backfill "
+        "quantized columns, build the model's partial HNSW index(es) (CONCURRENTLY) and optionally drop "
+        "the other modes' indexes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", help="ModelRegistry embedding model name; defaults to EMBEDDING_MODEL.")
+        parser.add_argument("--mode", choices=STORAGE_MODES, help="Defaults to EMBEDDING_VECTOR_STORAGE.")
+        parser.add_argument("--skip-backfill", action="store_true")
+        parser.add_argument("--drop-unused", action="store_true", help="Drop HNSW indexes of the other modes.")
+
+    def handle(self, *args, **options):
+        try:
+            backend = resolve_embedding_backend(options["model"])
+            service = VectorStorageService(model_name=backend.name, dims=backend.dims, mode=options["mode"])
+        except (ImproperlyConfigured, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        if not options["skip_backfill"]:
+            filled = service.backfill_quantized()
+            self.stdout.write(f"Backfilled quantized columns on {filled} rows")
+
+        for name in service.ensure_index():
+            self.stdout.write(self.style.SUCCESS(f"Index {name} ready ({service.index_size(name)} bytes)"))
+
+        if options["drop_unused"]:
+            for dropped in service.drop_unused_indexes():
+                self.stdout.write(f"Dropped {dropped} (if present)")
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from audit_api.models import LLMValidationCacheEntry
+from audit_api.services.llm_validation_cache_service import get_validation_cache
+
+
+class Command(BaseCommand):
+    help = "Delete expired LLM validation cache entries (or, with filters / --all, invalidate matching entries)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", help="Only entries for this model (name@version).")
+        parser.add_argument("--prompt-template", help="Only entries for this prompt template (name@version).")
+        parser.add_argument("--all", action="store_true", help="Delete every entry, expired or not.")
+
+    def handle(self, *args, **options):
+        cache = get_validation_cache()
+        if not (options["all"] or options["model"] or options["prompt_template"]):
+            deleted = cache.purge_expired()
+            self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired entries"))
+            return
+
+        qs = LLMValidationCacheEntry.objects.all()
+        if options["model"]:
+            qs = qs.filter(model=options["model"])
+        if options["prompt_template"]:
+            qs = qs.filter(prompt_template=options["prompt_template"])
+        deleted, _ = qs.delete()
+        cache.clear()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} entries"))
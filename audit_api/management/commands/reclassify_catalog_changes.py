@@ -0,0 +1,41 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from audit_api.services.catalog_reclassification_service import CatalogReclassificationService
+from audit_api.tasks import enqueue_classification
+
+
+class Command(BaseCommand):
+    help = (
+        "After controls change, re-classify only the evidence whose candidate controls could move and "
+        "stamp the rest with the current control catalog version."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Print the per-version plan and exit.")
+        parser.add_argument("--enqueue", action="store_true", help="Re-classify through RQ instead of inline.")
+        parser.add_argument("--limit", type=int, default=None, help="Max evidence items to re-classify this run.")
+        parser.add_argument("--batch-size", type=int, default=500, help="Evidence rows per re-stamp UPDATE.")
+
+    def handle(self, *args, **options):
+        service = CatalogReclassificationService(batch_size=options["batch_size"])
+
+        if options["dry_run"]:
+            self.stdout.write(json.dumps(service.plan(), indent=2))
+            return
+
+        if options["enqueue"]:
+            def reclassify(evidence_id):
+                enqueue_classification(evidence_id)
+        else:
+            from audit_api.orchestration.coordinator import OrchestrationCoordinator
+
+            coordinator = OrchestrationCoordinator()
+
+            def reclassify(evidence_id):
+                coordinator.classify_evidence(evidence_id=evidence_id)
+
+        result = service.run(reclassify=reclassify, limit=options["limit"])
+        result["catalog_version"] = service.catalog.current_version(fresh=True)
+        self.stdout.write(json.dumps(result, indent=2))
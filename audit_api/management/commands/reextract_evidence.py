@@ -0,0 +1,47 @@
+import json
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from audit_api.services.reextraction_service import EvidenceReextractionService
+from audit_api.tasks import enqueue_classification
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-run text extraction over stored evidence files (local:// storage) in a process pool. "
+        "Files are memory-mapped, not read into memory."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes (1 = inline).")
+        parser.add_argument("--chunk-size", type=int, default=8, help="Files per worker task.")
+        parser.add_argument("--batch-size", type=int, default=200, help="Evidence rows per page and per bulk update.")
+        parser.add_argument("--organization", help="Only this organization's evidence.")
+        parser.add_argument("--limit", type=int, default=None)
+        parser.add_argument("--dry-run", action="store_true", help="Extract and compare, but do not write.")
+        parser.add_argument(
+            "--reclassify", action="store_true", help="Enqueue classification for evidence whose text changed."
+        )
+
+    def handle(self, *args, **options):
+        service = EvidenceReextractionService(
+            workers=options["workers"],
+            chunk_size=options["chunk_size"],
+            batch_size=options["batch_size"],
+        )
+        started = time.perf_counter()
+        result = service.run(
+            organization_id=options["organization"],
+            limit=options["limit"],
+            dry_run=options["dry_run"],
+        )
+        changed_ids = result.pop("text_changed_ids")
+        result["text_changed"] = len(changed_ids)
+        result["seconds"] = round(time.perf_counter() - started, 2)
+        if options["reclassify"] and not options["dry_run"]:
+            for evidence_id in changed_ids:
+                enqueue_classification(evidence_id)
+            result["enqueued"] = len(changed_ids)
+        self.stdout.write(json.dumps(result, indent=2))
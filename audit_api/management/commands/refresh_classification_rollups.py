@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from audit_api.services.rollup_service import RollupService
+from audit_api.tasks import enqueue_rollup_refresh
+
+
+class Command(BaseCommand):
+    help = (
+        "Fold pipeline runs finished since the last watermark into the daily analytics rollups. "
+        "Safe to run repeatedly (cron / RQ scheduler)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lag-seconds", type=int, default=60, help="Skip runs finished this recently.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--max-batches", type=int, default=None)
+        parser.add_argument("--enqueue", action="store_true", help="Run as an RQ job instead of inline.")
+
+    def handle(self, *args, **options):
+        if options["enqueue"]:
+            job = enqueue_rollup_refresh(lag_seconds=options["lag_seconds"])
+            self.stdout.write(self.style.SUCCESS(f"Enqueued rollup refresh job {job.id}"))
+            return
+
+        processed = RollupService().refresh(
+            lag_seconds=options["lag_seconds"],
+            batch_size=options["batch_size"],
+            max_batches=options["max_batches"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Rolled up {processed} pipeline runs"))
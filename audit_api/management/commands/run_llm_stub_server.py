@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from audit_api.benchmarks.llm_stub_server import LLMStubServer
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve a local stand-in LLM validation endpoint for LLM_VALIDATION_PROVIDER=http, with optional "
+        "injected latency and failures."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument("--latency-ms", type=float, default=0.0)
+        parser.add_argument("--jitter-ms", type=float, default=0.0)
+        parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of requests answered with 503.")
+        parser.add_argument("--seed", type=int, default=None)
+        parser.add_argument("--verbose", action="store_true")
+
+    def handle(self, *args, **options):
+        server = LLMStubServer(
+            options["host"],
+            options["port"],
+            latency_ms=options["latency_ms"],
+            jitter_ms=options["jitter_ms"],
+            failure_rate=options["failure_rate"],
+            seed=options["seed"],
+            verbose=options["verbose"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"LLM stub listening on {server.url} (Ctrl+C to stop)"))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,81 @@
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from rest_framework.authtoken.models import Token
+
+from audit_api.benchmarks.corpus import SyntheticEvidenceCorpus
+from audit_api.models import Organization, OrganizationMembership
+from audit_api.orchestration.coordinator import OrchestrationCoordinator
+from audit_api.services.evidence_service import EvidenceService
+
+ROLES = ("admin", "member", "viewer")
+
+
+class Command(BaseCommand):
+    help = "Create orgs, memberships, tokens and classified evidence for loadtest_api; writes a fixture JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--orgs", type=int, default=3)
+        parser.add_argument("--evidence-per-org", type=int, default=20)
+        parser.add_argument("--prefix", default="loadtest", help="Namespace for generated usernames/org names.")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--output", default="loadtest_fixtures.json")
+        parser.add_argument(
+            "--purge",
+            action="store_true",
+            help="Delete orgs/users from a previous run with the same prefix first.",
+        )
+
+    def handle(self, *args, **options):
+        prefix = options["prefix"]
+        UserModel = get_user_model()
+
+        if options["purge"]:
+            Organization.objects.filter(name__startswith=f"{prefix}-org-").delete()
+            UserModel.objects.filter(username__startswith=f"{prefix}-").delete()
+
+        call_command("seed_soc2_controls", stdout=io.StringIO())
+
+        corpus = SyntheticEvidenceCorpus(
+            size=options["orgs"] * options["evidence_per_org"],
+            duplicate_ratio=0.1,
+            seed=options["seed"],
+        ).generate()
+        evidence_service = EvidenceService()
+        coordinator = OrchestrationCoordinator()
+
+        fixtures = {"orgs": []}
+        for org_index in range(options["orgs"]):
+            org = Organization.objects.create(name=f"{prefix}-org-{org_index}", plan="team")
+            tokens = {}
+            for role in ROLES:
+                username = f"{prefix}-{org_index}-{role}@example.test"
+                user, _ = UserModel.objects.get_or_create(username=username, defaults={"email": username})
+                OrganizationMembership.objects.update_or_create(
+                    organization=org,
+                    user=user,
+                    defaults={"role": role, "is_active": True},
+                )
+                tokens[role] = Token.objects.get_or_create(user=user)[0].key
+
+            evidence_ids = []
+            start = org_index * options["evidence_per_org"]
+            for item in corpus[start:start + options["evidence_per_org"]]:
+                evidence = evidence_service.create_from_payload({"organization_id": org.id, **item.payload})
+                coordinator.classify_evidence(evidence_id=str(evidence.id))
+                evidence_ids.append(str(evidence.id))
+
+            fixtures["orgs"].append({"id": str(org.id), "tokens": tokens, "evidence_ids": evidence_ids})
+
+        with open(options["output"], "w", encoding="utf-8") as fh:
+            json.dump(fixtures, fh, indent=2)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {options['orgs']} orgs with {options['evidence_per_org']} evidence each. "
+                f"Fixtures written to {options['output']}."
+            )
+        )
@@ -1,5 +1,7 @@
 from django.core.management.base import BaseCommand
 from audit_api.models import Framework, Control
+from audit_api.services.control_catalog_service import ControlCatalogService
+from audit_api.services.control_vector_service import ControlVectorService
 
 
 SOC2_CONTROLS = [
@@ -89,4 +91,11 @@ class Command(BaseCommand):
             self.style.SUCCESS(
                 f"Seed complete. Created {created} controls. Updated {updated} controls."
             )
-        )
\ No newline at end of file
+        )
+
+        version = ControlCatalogService().current_version(fresh=True)
+        self.stdout.write(f"Control catalog version: {version}")
+        stats = ControlVectorService().sync()
+        self.stdout.write(f"Control embeddings: {stats['embedded']} computed, {stats['removed']} removed.")
+        if created or updated:
+            self.stdout.write("Run `manage.py reclassify_catalog_changes` to update affected classifications.")
\ No newline at end of file
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from audit_api.services.control_vector_service import ControlVectorService
+from audit_api.services.embedding_service import EmbeddingService
+
+
+class Command(BaseCommand):
+    help = "Embed new or changed controls for the serving model (or --model) and drop rows of deleted controls."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", help="ModelRegistry embedding model name; defaults to EMBEDDING_MODEL.")
+
+    def handle(self, *args, **options):
+        stats = ControlVectorService(EmbeddingService(model_name=options["model"])).sync()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Control embeddings: {stats['embedded']} computed, {stats['removed']} removed "
+                f"({stats['controls']} controls)."
+            )
+        )
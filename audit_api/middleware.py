@@ -0,0 +1,64 @@
+# audit_api/middleware.py
+
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connection
+
+from audit_api.services.metrics_service import QueryStats, observe_request
+
+
+class RequestMetricsMiddleware:
+    """
+    Records per-endpoint latency. Requests are labelled by URL route pattern
+    (e.g. api/evidence/<uuid:evidence_id>/timeline/) to keep cardinality bounded.
+
+    With QUERY_COUNT_HEADERS enabled, responses also carry X-DB-Query-Count and
+    X-DB-Query-Time-Ms so load tests can attribute DB work per endpoint.
+
+    Async-capable, so async views under ASGI are not pushed onto a thread.
+    Query-count headers are only added on the sync path: async ORM calls run
+    on another thread's connection.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.query_headers = getattr(settings, "QUERY_COUNT_HEADERS", False)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        if self.query_headers:
+            stats = QueryStats()
+            with connection.execute_wrapper(stats):
+                response = self.get_response(request)
+            response["X-DB-Query-Count"] = str(stats.count)
+            response["X-DB-Query-Time-Ms"] = f"{stats.total_seconds * 1000:.3f}"
+        else:
+            response = self.get_response(request)
+        self._observe(request, response, started)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        self._observe(request, response, started)
+        return response
+
+    @staticmethod
+    def _observe(request, response, started: float) -> None:
+        match = getattr(request, "resolver_match", None)
+        route = (match.route if match else None) or "unmatched"
+        observe_request(
+            method=request.method,
+            route=route,
+            status=response.status_code,
+            seconds=time.perf_counter() - started,
+        )
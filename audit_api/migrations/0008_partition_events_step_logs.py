@@ -0,0 +1,128 @@
+# Converts events / agent_step_logs into monthly RANGE-partitioned tables.
+#
+# Postgres requires the partition key in the primary key, so the DB-level PK
+# becomes (id, <key>). Django keeps treating `id` as the primary key, which is
+# still unique in practice (uuid4). Model state is unchanged.
+import re
+from datetime import date
+
+from django.db import migrations
+
+TABLES = {
+    "events": "created_at",
+    "agent_step_logs": "started_at",
+}
+MONTHS_AHEAD = 3
+
+
+def _add_months(value: date, months: int) -> date:
+    index = value.year * 12 + (value.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _partition(schema_editor, table: str, column: str) -> None:
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE oid = %s::regclass", [table])
+        if cursor.fetchone()[0] == "p":
+            return
+
+        legacy = f"{table}_legacy"
+        cursor.execute(
+            "SELECT indexname, indexdef FROM pg_indexes WHERE tablename = %s AND indexname <> %s",
+            [table, f"{table}_pkey"],
+        )
+        indexes = cursor.fetchall()
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype = 'f'",
+            [table],
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(f'SELECT date_trunc(\'month\', MIN("{column}"))::date FROM "{table}"')
+        first_month = cursor.fetchone()[0]
+
+        cursor.execute(f'ALTER TABLE "{table}" RENAME TO "{legacy}"')
+        cursor.execute(
+            f'CREATE TABLE "{table}" (LIKE "{legacy}" INCLUDING DEFAULTS) PARTITION BY RANGE ("{column}")'
+        )
+
+        this_month = date.today().replace(day=1)
+        month = min(first_month or this_month, this_month)
+        while month <= _add_months(this_month, MONTHS_AHEAD):
+            nxt = _add_months(month, 1)
+            cursor.execute(
+                f'CREATE TABLE "{table}_p{month:%Y_%m}" PARTITION OF "{table}" FOR VALUES FROM (%s) TO (%s)',
+                [month.isoformat(), nxt.isoformat()],
+            )
+            month = nxt
+        cursor.execute(f'CREATE TABLE "{table}_default" PARTITION OF "{table}" DEFAULT')
+
+        cursor.execute(f'INSERT INTO "{table}" SELECT * FROM "{legacy}"')
+        cursor.execute(f'DROP TABLE "{legacy}"')
+
+        # Recreate PK / indexes / FKs under their original names on the parent;
+        # Postgres propagates them to every partition.
+        cursor.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{table}_pkey" PRIMARY KEY ("id", "{column}")')
+        for _name, definition in indexes:
+            definition = re.sub(rf' ON (\S+\.)?"?{table}"? ', f' ON "{table}" ', definition, count=1)
+            cursor.execute(definition)
+        for name, definition in foreign_keys:
+            cursor.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" {definition}')
+
+
+def _unpartition(schema_editor, table: str) -> None:
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE oid = %s::regclass", [table])
+        if cursor.fetchone()[0] != "p":
+            return
+
+        cursor.execute(
+            "SELECT indexname, indexdef FROM pg_indexes WHERE tablename = %s AND indexname <> %s",
+            [table, f"{table}_pkey"],
+        )
+        indexes = cursor.fetchall()
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype = 'f'",
+            [table],
+        )
+        foreign_keys = cursor.fetchall()
+
+        partitioned = f"{table}_partitioned"
+        cursor.execute(f'ALTER TABLE "{table}" RENAME TO "{partitioned}"')
+        cursor.execute(f'CREATE TABLE "{table}" (LIKE "{partitioned}" INCLUDING DEFAULTS)')
+        cursor.execute(f'INSERT INTO "{table}" SELECT * FROM "{partitioned}"')
+        cursor.execute(f'DROP TABLE "{partitioned}" CASCADE')
+
+        cursor.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{table}_pkey" PRIMARY KEY ("id")')
+        for _name, definition in indexes:
+            definition = re.sub(r" ON ONLY ", " ON ", definition, count=1)
+            definition = re.sub(rf' ON (\S+\.)?"?{table}"? ', f' ON "{table}" ', definition, count=1)
+            cursor.execute(definition)
+        for name, definition in foreign_keys:
+            cursor.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" {definition}')
+
+
+def forwards(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table, column in TABLES.items():
+        _partition(schema_editor, table, column)
+
+
+def backwards(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table in TABLES:
+        _unpartition(schema_editor, table)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("audit_api", "0007_task_evidence_fk"),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, reverse_code=backwards),
+    ]
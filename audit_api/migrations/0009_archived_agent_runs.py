@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:40
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit_api', '0008_partition_events_step_logs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedAgentRun',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('pipeline_run_id', models.UUIDField(blank=True, null=True)),
+                ('agent_name', models.CharField(max_length=100)),
+                ('agent_version', models.CharField(blank=True, max_length=50, null=True)),
+                ('status', models.CharField(max_length=50)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('details', models.JSONField(blank=True, null=True)),
+                ('step_count', models.IntegerField(default=0)),
+                ('event_count', models.IntegerField(default=0)),
+                ('output_count', models.IntegerField(default=0)),
+                ('archive_path', models.CharField(max_length=1024)),
+                ('archive_offset', models.BigIntegerField()),
+                ('archive_length', models.BigIntegerField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('evidence', models.ForeignKey(blank=True, db_column='evidence_id', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_agent_runs', to='audit_api.evidence')),
+                ('organization', models.ForeignKey(db_column='organization_id', on_delete=django.db.models.deletion.CASCADE, related_name='archived_agent_runs', to='audit_api.organization')),
+            ],
+            options={
+                'db_table': 'archived_agent_runs',
+                'indexes': [models.Index(fields=['evidence', 'started_at'], name='archived_runs_evidence_idx'), models.Index(fields=['organization', 'started_at'], name='archived_runs_org_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:42
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit_api', '0009_archived_agent_runs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('name', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('position', models.DateTimeField()),
+                ('last_id', models.UUIDField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'rollup_watermarks',
+            },
+        ),
+        migrations.CreateModel(
+            name='ClassificationDailyRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('day', models.DateField()),
+                ('control_reference', models.CharField(max_length=255)),
+                ('confidence_bucket', models.CharField(max_length=20)),
+                ('evidence_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('organization', models.ForeignKey(db_column='organization_id', on_delete=django.db.models.deletion.CASCADE, related_name='classification_rollups', to='audit_api.organization')),
+            ],
+            options={
+                'db_table': 'classification_daily_rollups',
+                'unique_together': {('organization', 'day', 'control_reference', 'confidence_bucket')},
+            },
+        ),
+        migrations.CreateModel(
+            name='PipelineDailyRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('day', models.DateField()),
+                ('run_count', models.IntegerField(default=0)),
+                ('cache_hit_count', models.IntegerField(default=0)),
+                ('failed_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('organization', models.ForeignKey(db_column='organization_id', on_delete=django.db.models.deletion.CASCADE, related_name='pipeline_rollups', to='audit_api.organization')),
+            ],
+            options={
+                'db_table': 'pipeline_daily_rollups',
+                'unique_together': {('organization', 'day')},
+            },
+        ),
+        migrations.CreateModel(
+            name='StepLatencyDailyRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('day', models.DateField()),
+                ('step_name', models.CharField(max_length=100)),
+                ('sample_count', models.IntegerField(default=0)),
+                ('total_ms', models.FloatField(default=0.0)),
+                ('bucket_counts', models.JSONField(default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('organization', models.ForeignKey(db_column='organization_id', on_delete=django.db.models.deletion.CASCADE, related_name='step_latency_rollups', to='audit_api.organization')),
+            ],
+            options={
+                'db_table': 'step_latency_daily_rollups',
+                'unique_together': {('organization', 'day', 'step_name')},
+            },
+        ),
+    ]
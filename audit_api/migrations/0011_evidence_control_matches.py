@@ -0,0 +1,82 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:44
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+def backfill_matches(apps, schema_editor):
+    """Seed matches from each evidence item's current ai_classification."""
+    Evidence = apps.get_model("audit_api", "Evidence")
+    Control = apps.get_model("audit_api", "Control")
+    AiPipelineRun = apps.get_model("audit_api", "AiPipelineRun")
+    EvidenceControlMatch = apps.get_model("audit_api", "EvidenceControlMatch")
+
+    controls = {}
+    for control in Control.objects.order_by("created_at").only("id", "reference"):
+        controls.setdefault(control.reference, control.id)
+    pipeline_ids = set(AiPipelineRun.objects.values_list("id", flat=True).iterator())
+
+    batch = []
+    evidence_qs = Evidence.objects.exclude(ai_classification__isnull=True).only(
+        "id", "organization_id", "ai_classification"
+    )
+    for evidence in evidence_qs.iterator(chunk_size=1000):
+        data = evidence.ai_classification or {}
+        references = data.get("primary_controls") or []
+        if not isinstance(references, list):
+            continue
+        pipeline_run_id = data.get("pipeline_run_id")
+        if pipeline_run_id and uuid.UUID(str(pipeline_run_id)) not in pipeline_ids:
+            pipeline_run_id = None
+        seen = set()
+        for rank, reference in enumerate(references):
+            if reference in seen:
+                continue
+            seen.add(reference)
+            batch.append(
+                EvidenceControlMatch(
+                    organization_id=evidence.organization_id,
+                    evidence_id=evidence.id,
+                    control_id=controls.get(reference),
+                    control_reference=reference,
+                    rank=rank,
+                    confidence=float(data.get("confidence") or 0.0),
+                    pipeline_run_id=pipeline_run_id,
+                )
+            )
+        if len(batch) >= 1000:
+            EvidenceControlMatch.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        EvidenceControlMatch.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit_api', '0010_classification_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EvidenceControlMatch',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('control_reference', models.CharField(max_length=255)),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('confidence', models.FloatField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('control', models.ForeignKey(blank=True, db_column='control_id', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='evidence_matches', to='audit_api.control')),
+                ('evidence', models.ForeignKey(db_column='evidence_id', on_delete=django.db.models.deletion.CASCADE, related_name='control_matches', to='audit_api.evidence')),
+                ('organization', models.ForeignKey(db_column='organization_id', on_delete=django.db.models.deletion.CASCADE, related_name='control_matches', to='audit_api.organization')),
+                ('pipeline_run', models.ForeignKey(blank=True, db_column='pipeline_run_id', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='control_matches', to='audit_api.aipipelinerun')),
+            ],
+            options={
+                'db_table': 'evidence_control_matches',
+                'indexes': [models.Index(fields=['organization', 'control_reference', 'confidence'], name='control_matches_lookup_idx'), models.Index(fields=['control', 'confidence'], name='control_matches_control_idx')],
+                'unique_together': {('evidence', 'control_reference')},
+            },
+        ),
+        migrations.RunPython(backfill_matches, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:45
+
+import django.db.models.deletion
+import pgvector.django.indexes
+import pgvector.django.vector
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit_api', '0011_evidence_control_matches'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EvidenceChunkEmbedding',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('model_name', models.CharField(default='hash-embed-128', max_length=100)),
+                ('chunk_index', models.IntegerField()),
+                ('chunk_hash', models.CharField(max_length=64)),
+                ('char_start', models.IntegerField()),
+                ('char_end', models.IntegerField()),
+                ('vector', pgvector.django.vector.VectorField(dimensions=128)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('evidence', models.ForeignKey(db_column='evidence_id', on_delete=django.db.models.deletion.CASCADE, related_name='chunk_embeddings', to='audit_api.evidence')),
+            ],
+            options={
+                'db_table': 'evidence_chunk_embeddings',
+                'indexes': [models.Index(fields=['model_name', 'chunk_hash'], name='chunk_embeddings_hash_idx'), pgvector.django.indexes.HnswIndex(ef_construction=64, fields=['vector'], m=16, name='chunk_embeddings_vector_idx', opclasses=['vector_l2_ops'])],
+                'unique_together': {('evidence', 'model_name', 'chunk_index')},
+            },
+        ),
+    ]
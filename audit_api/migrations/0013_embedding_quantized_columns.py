@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:48
+
+import pgvector.django.bit
+import pgvector.django.halfvec
+from django.db import migrations
+
+
+def backfill_quantized(apps, schema_editor):
+    # halfvec and binary_quantize need pgvector >= 0.7.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        "UPDATE evidence_embeddings "
+        "SET vector_half = vector::halfvec(128), vector_bits = binary_quantize(vector)::bit(128) "
+        "WHERE vector_half IS NULL OR vector_bits IS NULL"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit_api', '0012_evidence_chunk_embeddings'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evidenceembedding',
+            name='vector_bits',
+            field=pgvector.django.bit.BitField(blank=True, length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name='evidenceembedding',
+            name='vector_half',
+            field=pgvector.django.halfvec.HalfVectorField(blank=True, dimensions=128, null=True),
+        ),
+        migrations.RunPython(backfill_quantized, reverse_code=migrations.RunPython.noop),
+    ]
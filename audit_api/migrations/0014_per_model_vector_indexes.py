@@ -0,0 +1,79 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:51
+
+import hashlib
+
+import pgvector.django.bit
+import pgvector.django.halfvec
+import pgvector.django.vector
+from django.db import migrations
+
+DEFAULT_MODEL = {"name": "hash-embed-128", "provider": "local", "version": "1.0", "dims": 128}
+DEFAULT_MODEL_DIGEST = hashlib.sha1(DEFAULT_MODEL["name"].encode("utf-8")).hexdigest()[:8]
+
+# Single-model HNSW indexes that manage_vector_storage could have built before
+# vector columns became dimensionless; they would block the type change.
+LEGACY_INDEXES = (
+    "evidence_embeddings_vector_hnsw",
+    "evidence_embeddings_half_hnsw",
+    "evidence_embeddings_bits_hnsw",
+)
+
+
+def drop_legacy_indexes(apps, schema_editor):
+    for name in LEGACY_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{name}"')
+
+
+def register_default_model(apps, schema_editor):
+    ModelRegistry = apps.get_model("audit_api", "ModelRegistry")
+    ModelRegistry.objects.get_or_create(
+        name=DEFAULT_MODEL["name"],
+        version=DEFAULT_MODEL["version"],
+        provider=DEFAULT_MODEL["provider"],
+        defaults={"model_type": "embedding", "embedding_dims": DEFAULT_MODEL["dims"]},
+    )
+
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    # Same DDL as VectorStorageService.index_sql(table, "full") for the default model.
+    for table, prefix in (("evidence_embeddings", "emb"), ("evidence_chunk_embeddings", "chunk")):
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS "{prefix}_hash_embed_128_{DEFAULT_MODEL_DIGEST}_full_hnsw" '
+            f'ON "{table}" USING hnsw ((("vector")::vector(128)) vector_l2_ops) '
+            f"WITH (m = 16, ef_construction = 64) WHERE model_name = 'hash-embed-128'"
+        )
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit_api', '0013_embedding_quantized_columns'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_legacy_indexes, reverse_code=migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='evidencechunkembedding',
+            name='chunk_embeddings_vector_idx',
+        ),
+        migrations.AlterField(
+            model_name='evidencechunkembedding',
+            name='vector',
+            field=pgvector.django.vector.VectorField(),
+        ),
+        migrations.AlterField(
+            model_name='evidenceembedding',
+            name='vector',
+            field=pgvector.django.vector.VectorField(),
+        ),
+        migrations.AlterField(
+            model_name='evidenceembedding',
+            name='vector_bits',
+            field=pgvector.django.bit.BitField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='evidenceembedding',
+            name='vector_half',
+            field=pgvector.django.halfvec.HalfVectorField(blank=True, null=True),
+        ),
+        migrations.RunPython(register_default_model, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit_api', '0014_per_model_vector_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmbeddingBackfillCursor',
+            fields=[
+                ('model_name', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('last_evidence_id', models.UUIDField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('running', 'Running'), ('paused', 'Paused'), ('completed', 'Completed'), ('failed', 'Failed')], default='running', max_length=20)),
+                ('only_missing', models.BooleanField(default=False)),
+                ('include_chunks', models.BooleanField(default=False)),
+                ('processed_count', models.BigIntegerField(default=0)),
+                ('embedded_count', models.BigIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True, null=True)),
+                ('job_id', models.CharField(blank=True, max_length=100, null=True)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'embedding_backfill_cursors',
+            },
+        ),
+    ]
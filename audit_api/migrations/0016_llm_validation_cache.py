@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit_api', '0015_embedding_backfill_cursor'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LLMValidationCacheEntry',
+            fields=[
+                ('cache_key', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('provider', models.CharField(max_length=50)),
+                ('model', models.CharField(max_length=160)),
+                ('prompt_template', models.CharField(max_length=160)),
+                ('text_hash', models.CharField(max_length=64)),
+                ('control_references', models.JSONField(default=list)),
+                ('confidence', models.FloatField()),
+                ('justification', models.TextField(blank=True, default='')),
+                ('prompt_tokens', models.IntegerField(default=0)),
+                ('completion_tokens', models.IntegerField(default=0)),
+                ('hit_count', models.BigIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_hit_at', models.DateTimeField(blank=True, null=True)),
+                ('expires_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'llm_validation_cache',
+                'indexes': [models.Index(fields=['model', 'prompt_template'], name='llm_cache_fingerprint_idx'), models.Index(fields=['expires_at'], name='llm_cache_expires_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:05
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit_api', '0016_llm_validation_cache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ControlCatalogSnapshot',
+            fields=[
+                ('version', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('frameworks', models.JSONField(default=dict)),
+                ('controls', models.JSONField(default=dict)),
+                ('control_count', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'control_catalog_snapshots',
+                'ordering': ['created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='classifieroutput',
+            name='catalog_version',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='evidence',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('title', 'description', 'evidence_type_id', 'source_type_id', 'extracted_text', config='english'), name='evidence_search_gin'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:08
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit_api', '0017_control_catalog_versions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrganizationFramework',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'organization_frameworks',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='control',
+            index=models.Index(fields=['framework', 'reference'], name='controls_framework_ref_idx'),
+        ),
+        migrations.AddField(
+            model_name='organizationframework',
+            name='framework',
+            field=models.ForeignKey(db_column='framework_id', on_delete=django.db.models.deletion.CASCADE, related_name='organization_adoptions', to='audit_api.framework'),
+        ),
+        migrations.AddField(
+            model_name='organizationframework',
+            name='organization',
+            field=models.ForeignKey(db_column='organization_id', on_delete=django.db.models.deletion.CASCADE, related_name='framework_adoptions', to='audit_api.organization'),
+        ),
+        migrations.AddIndex(
+            model_name='organizationframework',
+            index=models.Index(fields=['organization', 'is_active'], name='org_frameworks_active_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='organizationframework',
+            unique_together={('organization', 'framework')},
+        ),
+    ]
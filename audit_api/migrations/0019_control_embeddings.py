@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:10
+
+import django.db.models.deletion
+import pgvector.django.vector
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit_api', '0018_organization_frameworks'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ControlEmbedding',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('model_name', models.CharField(max_length=100)),
+                ('content_hash', models.CharField(max_length=64)),
+                ('vector', pgvector.django.vector.VectorField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('control', models.ForeignKey(db_column='control_id', on_delete=django.db.models.deletion.CASCADE, related_name='embeddings', to='audit_api.control')),
+            ],
+            options={
+                'db_table': 'control_embeddings',
+                'unique_together': {('control', 'model_name')},
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit_api', '0019_control_embeddings'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='evidenceembedding',
+            index=models.Index(fields=['model_name', 'content_hash'], name='evidence_emb_model_hash_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 21:10
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit_api', '0020_evidence_embedding_model_hash_index'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='classificationdailyrollup',
+            old_name='evidence_count',
+            new_name='run_count',
+        ),
+    ]
@@ -14,7 +14,19 @@ from .prompt import PromptTemplate
 from .model_registry import ModelRegistry
 from .classifier_output import ClassifierOutput
 from .embedding import EvidenceEmbedding
+from .chunk_embedding import EvidenceChunkEmbedding
+from .embedding_backfill_cursor import EmbeddingBackfillCursor
 from .organization_membership import OrganizationMembership
+from .organization_framework import OrganizationFramework
+from .archived_agent_run import ArchivedAgentRun
+from .classification_rollup import ClassificationDailyRollup
+from .pipeline_rollup import PipelineDailyRollup
+from .step_latency_rollup import StepLatencyDailyRollup
+from .rollup_watermark import RollupWatermark
+from .evidence_control_match import EvidenceControlMatch
+from .llm_validation_cache import LLMValidationCacheEntry
+from .control_catalog_snapshot import ControlCatalogSnapshot
+from .control_embedding import ControlEmbedding
 
 __all__ = [
     "Organization",
@@ -31,5 +43,17 @@ __all__ = [
     "ModelRegistry",
     "ClassifierOutput",
     "EvidenceEmbedding",
+    "EvidenceChunkEmbedding",
+    "EmbeddingBackfillCursor",
     "OrganizationMembership",
+    "OrganizationFramework",
+    "ArchivedAgentRun",
+    "ClassificationDailyRollup",
+    "PipelineDailyRollup",
+    "StepLatencyDailyRollup",
+    "RollupWatermark",
+    "EvidenceControlMatch",
+    "LLMValidationCacheEntry",
+    "ControlCatalogSnapshot",
+    "ControlEmbedding",
 ]
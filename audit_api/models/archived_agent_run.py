@@ -0,0 +1,50 @@
+import uuid
+from django.db import models
+
+
+class ArchivedAgentRun(models.Model):
+    """
+    Summary row left behind when an AgentRun (with its pipeline run, step logs,
+    events and classifier outputs) is moved into a compressed archive file.
+    `archive_offset`/`archive_length` locate the run's gzip member in the file.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)  # original AgentRun id
+    organization = models.ForeignKey(
+        "Organization",
+        on_delete=models.CASCADE,
+        related_name="archived_agent_runs",
+        db_column="organization_id",
+    )
+    evidence = models.ForeignKey(
+        "Evidence",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="archived_agent_runs",
+        db_column="evidence_id",
+    )
+    pipeline_run_id = models.UUIDField(null=True, blank=True)
+    agent_name = models.CharField(max_length=100)
+    agent_version = models.CharField(max_length=50, null=True, blank=True)
+    status = models.CharField(max_length=50)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    details = models.JSONField(null=True, blank=True)
+    step_count = models.IntegerField(default=0)
+    event_count = models.IntegerField(default=0)
+    output_count = models.IntegerField(default=0)
+    archive_path = models.CharField(max_length=1024)  # relative to AUDITMIND_VAR_DIR
+    archive_offset = models.BigIntegerField()
+    archive_length = models.BigIntegerField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "archived_agent_runs"
+        indexes = [
+            models.Index(fields=["evidence", "started_at"], name="archived_runs_evidence_idx"),
+            models.Index(fields=["organization", "started_at"], name="archived_runs_org_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.agent_name} [archived]"
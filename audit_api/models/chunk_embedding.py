@@ -0,0 +1,37 @@
+import uuid
+from django.db import models
+from pgvector.django import VectorField
+
+
+class EvidenceChunkEmbedding(models.Model):
+    """
+    Embedding of one content-defined chunk of an evidence item's text.
+    Rows are replaced whenever the evidence is re-embedded; vectors are reused
+    across evidence items by (model_name, chunk_hash). Per-model HNSW indexes
+    are managed by VectorStorageService.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    evidence = models.ForeignKey(
+        "Evidence",
+        on_delete=models.CASCADE,
+        related_name="chunk_embeddings",
+        db_column="evidence_id",
+    )
+    model_name = models.CharField(max_length=100, default="hash-embed-128")
+    chunk_index = models.IntegerField()
+    chunk_hash = models.CharField(max_length=64)  # sha256 hex of the chunk text
+    char_start = models.IntegerField()
+    char_end = models.IntegerField()
+    vector = VectorField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "evidence_chunk_embeddings"
+        unique_together = ("evidence", "model_name", "chunk_index")
+        indexes = [
+            models.Index(fields=["model_name", "chunk_hash"], name="chunk_embeddings_hash_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"ChunkEmbedding({self.evidence_id}#{self.chunk_index})"
@@ -0,0 +1,26 @@
+import uuid
+from django.db import models
+
+
+class ClassificationDailyRollup(models.Model):
+    """Classification runs per org / day / control / confidence bucket (see RollupService); re-runs count again."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    organization = models.ForeignKey(
+        "Organization",
+        on_delete=models.CASCADE,
+        related_name="classification_rollups",
+        db_column="organization_id",
+    )
+    day = models.DateField()
+    control_reference = models.CharField(max_length=255)
+    confidence_bucket = models.CharField(max_length=20)
+    run_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "classification_daily_rollups"
+        unique_together = ("organization", "day", "control_reference", "confidence_bucket")
+
+    def __str__(self) -> str:
+        return f"{self.day} {self.control_reference} ({self.confidence_bucket}): {self.run_count}"
@@ -23,6 +23,7 @@ class ClassifierOutput(models.Model):
     primary_controls = models.JSONField()          # list[str]
     confidence = models.FloatField()
     raw_output = models.JSONField(null=True, blank=True)
+    catalog_version = models.CharField(max_length=64, null=True, blank=True)  # ControlCatalogSnapshot.version
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -23,6 +23,10 @@ class Control(models.Model):
 
     class Meta:
         db_table = "controls"
+        indexes = [
+            # Per-framework retrieval filters on framework_id and breaks rank ties by reference.
+            models.Index(fields=["framework", "reference"], name="controls_framework_ref_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.reference} - {self.title}"
\ No newline at end of file
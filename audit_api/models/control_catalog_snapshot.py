@@ -0,0 +1,24 @@
+from django.db import models
+
+
+class ControlCatalogSnapshot(models.Model):
+    """
+    One version of the control catalog. `version` is a sha256 over the
+    per-framework hashes in `frameworks` (code -> hash of its controls'
+    reference/title/description). `controls` maps control id -> {reference,
+    framework, hash, terms}, where terms are the control's FTS lexemes; diffing
+    two snapshots gives the controls (and terms) a catalog change touched.
+    """
+
+    version = models.CharField(max_length=64, primary_key=True)
+    frameworks = models.JSONField(default=dict)
+    controls = models.JSONField(default=dict)
+    control_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "control_catalog_snapshots"
+        ordering = ["created_at"]
+
+    def __str__(self) -> str:
+        return f"{self.version[:12]} ({self.control_count} controls)"
@@ -0,0 +1,33 @@
+import uuid
+from django.db import models
+from pgvector.django import VectorField
+
+
+class ControlEmbedding(models.Model):
+    """
+    Embedding of a control's reference, title and description for one model.
+    `content_hash` is the control's catalog hash (see control_catalog_service),
+    so a row is recomputed only when the control text changes. Retrieval reads
+    these rows into an in-memory matrix (ControlVectorService); no ANN index is
+    needed for a catalog this size.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    control = models.ForeignKey(
+        "Control",
+        on_delete=models.CASCADE,
+        related_name="embeddings",
+        db_column="control_id",
+    )
+    model_name = models.CharField(max_length=100)
+    content_hash = models.CharField(max_length=64)  # sha256 hex
+    vector = VectorField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "control_embeddings"
+        unique_together = ("control", "model_name")
+
+    def __str__(self) -> str:
+        return f"ControlEmbedding({self.control_id}, {self.model_name})"
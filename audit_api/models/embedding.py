@@ -1,12 +1,20 @@
 import uuid
 from django.db import models
-from pgvector.django import VectorField
+from pgvector.django import BitField, HalfVectorField, VectorField
 
 
 class EvidenceEmbedding(models.Model):
     """
     Stores embeddings for evidence text to enable cached classification.
     One row per (evidence, model_name, content_hash); updated on re-classify.
+
+    `vector_half` / `vector_bits` are quantized copies used as the ANN search
+    column when EMBEDDING_VECTOR_STORAGE is "halfvec" / "binary"; `vector`
+    stays full precision for re-ranking.
+
+    Vector columns are dimensionless so models of different sizes share the
+    table; each model gets its own partial HNSW index over a cast to its
+    dimension (see VectorStorageService).
     """
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -16,7 +24,9 @@ class EvidenceEmbedding(models.Model):
         related_name="embeddings",
         db_column="evidence_id",
     )
-    vector = VectorField(dimensions=128)  # Adjust dimensions if you swap in a real embedding model
+    vector = VectorField()
+    vector_half = HalfVectorField(null=True, blank=True)
+    vector_bits = BitField(null=True, blank=True)  # sign bit per dimension
     model_name = models.CharField(max_length=100, default="hash-embed-128")
     content_hash = models.CharField(max_length=64)  # sha256 hex
     created_at = models.DateTimeField(auto_now_add=True)
@@ -25,6 +35,10 @@ class EvidenceEmbedding(models.Model):
     class Meta:
         db_table = "evidence_embeddings"
         unique_together = ("evidence", "model_name", "content_hash")
+        indexes = [
+            # Exact-hash cache lookups and the embedding memo's durable tier.
+            models.Index(fields=["model_name", "content_hash"], name="evidence_emb_model_hash_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"Embedding({self.evidence_id}, {self.model_name})"
@@ -0,0 +1,35 @@
+from django.db import models
+
+
+class EmbeddingBackfillCursor(models.Model):
+    """
+    Progress of an embedding backfill for one model: Evidence is walked in
+    primary-key order and `last_evidence_id` is the last id written, so a
+    stopped or failed backfill resumes where it left off.
+    """
+
+    STATUS_CHOICES = [
+        ("running", "Running"),
+        ("paused", "Paused"),
+        ("completed", "Completed"),
+        ("failed", "Failed"),
+    ]
+
+    model_name = models.CharField(max_length=100, primary_key=True)
+    last_evidence_id = models.UUIDField(null=True, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="running")
+    only_missing = models.BooleanField(default=False)
+    include_chunks = models.BooleanField(default=False)
+    processed_count = models.BigIntegerField(default=0)
+    embedded_count = models.BigIntegerField(default=0)
+    last_error = models.TextField(null=True, blank=True)
+    job_id = models.CharField(max_length=100, null=True, blank=True)
+    started_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "embedding_backfill_cursors"
+
+    def __str__(self) -> str:
+        return f"{self.model_name} [{self.status}] after {self.last_evidence_id}"
@@ -1,6 +1,17 @@
 import uuid
 from django.db import models
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+
+# Lexeme index over the classifier's input fields; used to find evidence a
+# control catalog change could affect (see CatalogReclassificationService).
+EVIDENCE_SEARCH_FIELDS = ("title", "description", "evidence_type_id", "source_type_id", "extracted_text")
+EVIDENCE_SEARCH_CONFIG = "english"
+
+
+def evidence_search_vector() -> SearchVector:
+    return SearchVector(*EVIDENCE_SEARCH_FIELDS, config=EVIDENCE_SEARCH_CONFIG)
 
 
 class Evidence(models.Model):
@@ -52,6 +63,7 @@ class Evidence(models.Model):
 
     class Meta:
         db_table = "evidence"
+        indexes = [GinIndex(evidence_search_vector(), name="evidence_search_gin")]
 
     def __str__(self) -> str:
         return self.title
\ No newline at end of file
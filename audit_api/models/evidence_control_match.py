@@ -0,0 +1,59 @@
+import uuid
+from django.db import models
+
+
+class EvidenceControlMatch(models.Model):
+    """
+    One row per (evidence, matched control) from the evidence's latest
+    classification. Typed copy of `Evidence.ai_classification["primary_controls"]`
+    so "evidence for control X above confidence Y" is an index lookup.
+    `control` is null for references without a catalog row (e.g. control:GENERIC).
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    organization = models.ForeignKey(
+        "Organization",
+        on_delete=models.CASCADE,
+        related_name="control_matches",
+        db_column="organization_id",
+    )
+    evidence = models.ForeignKey(
+        "Evidence",
+        on_delete=models.CASCADE,
+        related_name="control_matches",
+        db_column="evidence_id",
+    )
+    control = models.ForeignKey(
+        "Control",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="evidence_matches",
+        db_column="control_id",
+    )
+    control_reference = models.CharField(max_length=255)
+    rank = models.PositiveSmallIntegerField()
+    confidence = models.FloatField()
+    pipeline_run = models.ForeignKey(
+        "AiPipelineRun",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="control_matches",
+        db_column="pipeline_run_id",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "evidence_control_matches"
+        unique_together = ("evidence", "control_reference")
+        indexes = [
+            models.Index(
+                fields=["organization", "control_reference", "confidence"],
+                name="control_matches_lookup_idx",
+            ),
+            models.Index(fields=["control", "confidence"], name="control_matches_control_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.evidence_id} -> {self.control_reference} ({self.confidence:.2f})"
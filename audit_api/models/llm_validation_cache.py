@@ -0,0 +1,35 @@
+from django.db import models
+
+
+class LLMValidationCacheEntry(models.Model):
+    """
+    One cached LLM validation result. `cache_key` is the sha256 of the prompt
+    fingerprint: provider, model (name@version from ModelRegistry), prompt
+    template (name@version), normalized text hash and sorted control
+    references. The parts are kept alongside for inspection and invalidation.
+    """
+
+    cache_key = models.CharField(max_length=64, primary_key=True)
+    provider = models.CharField(max_length=50)
+    model = models.CharField(max_length=160)
+    prompt_template = models.CharField(max_length=160)
+    text_hash = models.CharField(max_length=64)
+    control_references = models.JSONField(default=list)
+    confidence = models.FloatField()
+    justification = models.TextField(blank=True, default="")
+    prompt_tokens = models.IntegerField(default=0)
+    completion_tokens = models.IntegerField(default=0)
+    hit_count = models.BigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_hit_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "llm_validation_cache"
+        indexes = [
+            models.Index(fields=["model", "prompt_template"], name="llm_cache_fingerprint_idx"),
+            models.Index(fields=["expires_at"], name="llm_cache_expires_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.model} / {self.prompt_template} / {self.text_hash[:12]}"
@@ -0,0 +1,33 @@
+import uuid
+from django.db import models
+
+
+class OrganizationFramework(models.Model):
+    """A framework an organization has adopted; active ones scope control retrieval."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    organization = models.ForeignKey(
+        "Organization",
+        on_delete=models.CASCADE,
+        related_name="framework_adoptions",
+        db_column="organization_id",
+    )
+    framework = models.ForeignKey(
+        "Framework",
+        on_delete=models.CASCADE,
+        related_name="organization_adoptions",
+        db_column="framework_id",
+    )
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "organization_frameworks"
+        unique_together = ("organization", "framework")
+        indexes = [
+            models.Index(fields=["organization", "is_active"], name="org_frameworks_active_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.organization} uses {self.framework}"
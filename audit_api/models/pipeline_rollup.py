@@ -0,0 +1,26 @@
+import uuid
+from django.db import models
+
+
+class PipelineDailyRollup(models.Model):
+    """Pipeline run counts per org / day, including cache hits and failures."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    organization = models.ForeignKey(
+        "Organization",
+        on_delete=models.CASCADE,
+        related_name="pipeline_rollups",
+        db_column="organization_id",
+    )
+    day = models.DateField()
+    run_count = models.IntegerField(default=0)
+    cache_hit_count = models.IntegerField(default=0)
+    failed_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "pipeline_daily_rollups"
+        unique_together = ("organization", "day")
+
+    def __str__(self) -> str:
+        return f"{self.day}: {self.run_count} runs"
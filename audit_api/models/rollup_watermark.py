@@ -0,0 +1,16 @@
+from django.db import models
+
+
+class RollupWatermark(models.Model):
+    """Last (finished_at, id) processed by an incremental rollup job."""
+
+    name = models.CharField(max_length=100, primary_key=True)
+    position = models.DateTimeField()
+    last_id = models.UUIDField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "rollup_watermarks"
+
+    def __str__(self) -> str:
+        return f"{self.name} @ {self.position}"
@@ -0,0 +1,31 @@
+import uuid
+from django.db import models
+
+
+class StepLatencyDailyRollup(models.Model):
+    """
+    Step latency histogram per org / day / step. `bucket_counts` follows
+    metrics_service.LATENCY_BUCKETS (+1 overflow bucket) so daily rows can be
+    merged and percentiles estimated at read time.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    organization = models.ForeignKey(
+        "Organization",
+        on_delete=models.CASCADE,
+        related_name="step_latency_rollups",
+        db_column="organization_id",
+    )
+    day = models.DateField()
+    step_name = models.CharField(max_length=100)
+    sample_count = models.IntegerField(default=0)
+    total_ms = models.FloatField(default=0.0)
+    bucket_counts = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "step_latency_daily_rollups"
+        unique_together = ("organization", "day", "step_name")
+
+    def __str__(self) -> str:
+        return f"{self.day} {self.step_name}: {self.sample_count}"
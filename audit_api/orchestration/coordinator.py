@@ -16,5 +16,8 @@ class OrchestrationCoordinator:
     def __init__(self) -> None:
         self.workflow_engine = WorkflowEngine()
 
-    def classify_evidence(self, evidence_id: UUID | str) -> dict:
-        return self.workflow_engine.run_evidence_classification(evidence_id)
\ No newline at end of file
+    def classify_evidence(self, evidence_id: UUID | str, *, profile: bool = False) -> dict:
+        return self.workflow_engine.run_evidence_classification(evidence_id, profile=profile)
+
+    async def aclassify_evidence(self, evidence_id: UUID | str) -> dict:
+        return await self.workflow_engine.arun_evidence_classification(evidence_id)
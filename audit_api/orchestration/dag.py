@@ -0,0 +1,302 @@
+# audit_api/orchestration/dag.py
+
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from audit_api.models import AgentStepLog, AiPipelineRun, Evidence
+from audit_api.services.pipeline_logging_service import PipelineLogger
+
+
+class WorkflowGraphError(ValueError):
+    """Raised for malformed graphs: duplicate steps, unknown dependencies or cycles."""
+
+
+class WorkflowContext:
+    """
+    State shared by the steps of one workflow run.
+
+    Steps exchange values through `ctx[key]`; a step that ends the workflow
+    early (e.g. a cache hit) calls `stop()`, after which no further steps are
+    scheduled. Steps already running are allowed to finish.
+    """
+
+    def __init__(self, *, evidence: Optional[Evidence], logger: PipelineLogger, pipeline_run: AiPipelineRun) -> None:
+        self.evidence = evidence
+        self.logger = logger
+        self.pipeline_run = pipeline_run
+        self.values: Dict[str, Any] = {}
+        self.result: Optional[dict] = None
+        self.finish_details: Dict[str, Any] = {}
+        self._stopped = threading.Event()
+
+    def __getitem__(self, key: str) -> Any:
+        return self.values[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.values[key] = value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.values.get(key, default)
+
+    @property
+    def stopped(self) -> bool:
+        return self._stopped.is_set()
+
+    def stop(self, *, result: Optional[dict] = None, details: Optional[Dict[str, Any]] = None) -> None:
+        if result is not None:
+            self.result = result
+        if details:
+            self.finish_details.update(details)
+        self._stopped.set()
+
+
+StepFn = Callable[[WorkflowContext], Optional[Dict[str, Any]]]
+AsyncStepFn = Callable[[WorkflowContext], Awaitable[Optional[Dict[str, Any]]]]
+
+
+@dataclass(frozen=True)
+class WorkflowStep:
+    """
+    One node of a workflow graph.
+
+    `run` returns the step's output snapshot. Logged steps become an
+    AgentStepLog (with `input_snapshot(ctx)` recorded up front); unlogged ones
+    are bookkeeping nodes such as event emission or the final evidence update.
+    `arun` is an optional native-async form used by AsyncGraphExecutor; steps
+    without one run `run` in a worker thread there. Only steps declared with
+    `uses_db=False` may leave the calling thread in GraphExecutor.
+    """
+
+    name: str
+    run: StepFn
+    depends_on: Tuple[str, ...] = ()
+    input_snapshot: Optional[Callable[[WorkflowContext], Optional[Dict[str, Any]]]] = None
+    logged: bool = True
+    arun: Optional[AsyncStepFn] = None
+    uses_db: bool = True
+
+
+@dataclass
+class WorkflowGraph:
+    steps: List[WorkflowStep]
+    _by_name: Dict[str, WorkflowStep] = field(init=False, repr=False)
+    _order: List[str] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._by_name = {}
+        for step in self.steps:
+            if step.name in self._by_name:
+                raise WorkflowGraphError(f"Duplicate workflow step {step.name!r}")
+            self._by_name[step.name] = step
+        for step in self.steps:
+            unknown = [d for d in step.depends_on if d not in self._by_name]
+            if unknown:
+                raise WorkflowGraphError(f"Step {step.name!r} depends on unknown steps {unknown}")
+        self._order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        remaining = {s.name: set(s.depends_on) for s in self.steps}
+        order: List[str] = []
+        while remaining:
+            ready = [s.name for s in self.steps if s.name in remaining and not remaining[s.name]]
+            if not ready:
+                raise WorkflowGraphError(f"Cycle between workflow steps {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+                order.append(name)
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return order
+
+    def __getitem__(self, name: str) -> WorkflowStep:
+        return self._by_name[name]
+
+    @property
+    def order(self) -> List[str]:
+        return list(self._order)
+
+    @property
+    def logged_step_names(self) -> List[str]:
+        return [name for name in self._order if self._by_name[name].logged]
+
+    def dependents(self) -> Dict[str, List[str]]:
+        out: Dict[str, List[str]] = {s.name: [] for s in self.steps}
+        for step in self.steps:
+            for dep in step.depends_on:
+                out[dep].append(step.name)
+        return out
+
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _shared_pool() -> Optional[ThreadPoolExecutor]:
+    """Process-wide step pool (WORKFLOW_MAX_WORKERS threads); None when parallelism is disabled."""
+    global _pool
+    if settings.WORKFLOW_MAX_WORKERS <= 1:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(
+                    max_workers=settings.WORKFLOW_MAX_WORKERS,
+                    thread_name_prefix="workflow-step",
+                )
+    return _pool
+
+
+class GraphExecutor:
+    """
+    Runs a WorkflowGraph, starting each step as soon as its dependencies
+    have completed.
+
+    Steps that touch the database run on the calling thread, so they share
+    its connection and see rows written earlier in the caller's transaction
+    (e.g. the AgentRun their step logs point at). Only steps declared with
+    `uses_db=False` go to the shared thread pool, and only when another step
+    is ready at the same time; a lone ready step always runs inline, so a
+    linear graph behaves exactly like straight-line code.
+
+    Step logs are written from the calling thread too, with per-step SQL
+    stats for the inline steps. The first failure stops scheduling; running
+    steps are drained, then it is re-raised.
+    """
+
+    def __init__(self, *, parallel: bool = True) -> None:
+        self.pool = _shared_pool() if parallel else None
+
+    @staticmethod
+    def _start_log(step: WorkflowStep, ctx: WorkflowContext) -> Optional[AgentStepLog]:
+        if not step.logged:
+            return None
+        snapshot = step.input_snapshot(ctx) if step.input_snapshot else None
+        return ctx.logger.start_step(step.name, input_snapshot=snapshot)
+
+    def _run_step(self, step: WorkflowStep, ctx: WorkflowContext) -> None:
+        log = self._start_log(step, ctx)
+        if log is None:
+            step.run(ctx)
+            return
+        try:
+            with ctx.logger.measure_queries() as queries:
+                output = step.run(ctx)
+        except Exception as exc:
+            ctx.logger.complete_step(log, status="failed", error=str(exc), queries=queries)
+            raise
+        ctx.logger.complete_step(log, output_snapshot=output, queries=queries)
+
+    def _offload(self, graph: WorkflowGraph, ready: deque) -> List[str]:
+        """Ready steps to hand to the pool, leaving at least one for the calling thread."""
+        if self.pool is None:
+            return []
+        offload = [name for name in ready if not graph[name].uses_db]
+        return offload[:-1] if len(offload) == len(ready) else offload
+
+    def run(self, graph: WorkflowGraph, ctx: WorkflowContext) -> None:
+        waiting = {s.name: set(s.depends_on) for s in graph.steps}
+        dependents = graph.dependents()
+        position = {name: i for i, name in enumerate(graph.order)}
+        ready = deque(name for name in graph.order if not waiting[name])
+        running: Dict[Any, Tuple[str, Optional[AgentStepLog]]] = {}
+        error: Optional[BaseException] = None
+
+        def finished(name: str) -> None:
+            unblocked = []
+            for child in dependents[name]:
+                waiting[child].discard(name)
+                if not waiting[child]:
+                    unblocked.append(child)
+            ready.extend(sorted(unblocked, key=position.__getitem__))
+
+        while running or (ready and error is None and not ctx.stopped):
+            if error is None and not ctx.stopped and ready:
+                for name in self._offload(graph, ready):
+                    ready.remove(name)
+                    log = self._start_log(graph[name], ctx)
+                    running[self.pool.submit(graph[name].run, ctx)] = (name, log)
+                name = ready.popleft()
+                try:
+                    self._run_step(graph[name], ctx)
+                except Exception as exc:
+                    error = exc
+                else:
+                    finished(name)
+                continue
+
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                name, log = running.pop(future)
+                exc = future.exception()
+                if exc is not None:
+                    error = error or exc
+                    if log is not None:
+                        ctx.logger.complete_step(log, status="failed", error=str(exc))
+                    continue
+                if log is not None:
+                    ctx.logger.complete_step(log, output_snapshot=future.result())
+                finished(name)
+
+        if error is not None:
+            raise error
+
+
+class AsyncGraphExecutor:
+    """
+    asyncio counterpart of GraphExecutor for ASGI requests: every ready step
+    becomes a task on the running loop, so steps with a native `arun` (async
+    ORM queries, awaited model calls) overlap without holding a thread.
+    Sync-only steps run through sync_to_async on Django's shared sync thread,
+    which keeps their ORM access safe but serializes them with each other;
+    `uses_db=False` steps run in their own worker thread instead.
+    Step logs are written with PipelineLogger's async methods.
+    """
+
+    async def _run_step(self, step: WorkflowStep, ctx: WorkflowContext) -> None:
+        run = step.arun or sync_to_async(step.run, thread_sensitive=step.uses_db)
+        if not step.logged:
+            await run(ctx)
+            return
+        snapshot = step.input_snapshot(ctx) if step.input_snapshot else None
+        log = await ctx.logger.astart_step(step.name, input_snapshot=snapshot)
+        try:
+            output = await run(ctx)
+        except Exception as exc:
+            await ctx.logger.acomplete_step(log, status="failed", error=str(exc))
+            raise
+        await ctx.logger.acomplete_step(log, output_snapshot=output)
+
+    async def run(self, graph: WorkflowGraph, ctx: WorkflowContext) -> None:
+        waiting = {s.name: set(s.depends_on) for s in graph.steps}
+        dependents = graph.dependents()
+        ready = [name for name in graph.order if not waiting[name]]
+        running: Dict[asyncio.Task, str] = {}
+        error: Optional[BaseException] = None
+
+        while running or (ready and error is None and not ctx.stopped):
+            if error is None and not ctx.stopped:
+                for name in ready:
+                    running[asyncio.ensure_future(self._run_step(graph[name], ctx))] = name
+            ready = []
+
+            done, _ = await asyncio.wait(list(running), return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = running.pop(task)
+                exc = task.exception()
+                if exc is not None:
+                    error = error or exc
+                    continue
+                for child in dependents[name]:
+                    waiting[child].discard(name)
+                    if not waiting[child]:
+                        ready.append(child)
+
+        if error is not None:
+            raise error
@@ -1,10 +1,13 @@
 # audit_api/orchestration/workflow_engine.py
 
+from typing import Dict, Type
 from uuid import UUID
 
-from django.shortcuts import get_object_or_404
+from asgiref.sync import sync_to_async
+from django.shortcuts import aget_object_or_404, get_object_or_404
 
 from audit_api.models import Evidence
+from audit_api.agents.base import GraphAgent
 from audit_api.agents.evidence_classifier import EvidenceClassifierAgent
 
 
@@ -12,11 +15,31 @@ class WorkflowEngine:
     """
     Coordinates end-to-end workflows.
 
-    For now we only have 'evidence_classification', but this can grow to
-    support different pipelines later.
+    Each workflow is a GraphAgent: a declarative step graph whose independent
+    steps run concurrently (see audit_api.orchestration.dag). New pipelines
+    (gap detection, breach analysis, ...) register here and get pipeline/step
+    logging for free.
     """
 
-    def run_evidence_classification(self, evidence_id: UUID | str) -> dict:
+    workflows: Dict[str, Type[GraphAgent]] = {
+        "evidence_classification": EvidenceClassifierAgent,
+    }
+
+    def run_workflow(self, workflow: str, evidence_id: UUID | str, **options) -> dict:
+        try:
+            agent_class = self.workflows[workflow]
+        except KeyError:
+            raise ValueError(f"Unknown workflow {workflow!r}; expected one of {sorted(self.workflows)}")
+        evidence = get_object_or_404(Evidence, pk=evidence_id)
+        return agent_class().run(evidence, **options)
+
+    def run_evidence_classification(self, evidence_id: UUID | str, *, profile: bool = False) -> dict:
         evidence = get_object_or_404(Evidence, pk=evidence_id)
         agent = EvidenceClassifierAgent()
-        return agent.classify(evidence)
\ No newline at end of file
+        return agent.classify(evidence, profile=profile)
+
+    async def arun_evidence_classification(self, evidence_id: UUID | str) -> dict:
+        evidence = await aget_object_or_404(Evidence, pk=evidence_id)
+        # Building the agent resolves models from ModelRegistry (sync ORM).
+        agent = await sync_to_async(EvidenceClassifierAgent)()
+        return await agent.aclassify(evidence)
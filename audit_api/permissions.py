@@ -0,0 +1,29 @@
+import hmac
+import ipaddress
+
+from django.conf import settings
+from rest_framework.permissions import BasePermission
+
+
+class CanScrapeMetrics(BasePermission):
+    """
+    Staff users, requests carrying `Authorization: Bearer <METRICS_TOKEN>`, or
+    clients in METRICS_ALLOWED_NETWORKS. Metrics carry per-organization
+    pipeline counters, so they are never public.
+    """
+
+    def has_permission(self, request, view) -> bool:
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated and user.is_staff:
+            return True
+
+        token = settings.METRICS_TOKEN
+        header = request.META.get("HTTP_AUTHORIZATION", "")
+        if token and hmac.compare_digest(header.encode(), f"Bearer {token}".encode()):
+            return True
+
+        try:
+            addr = ipaddress.ip_address(request.META.get("REMOTE_ADDR", ""))
+        except ValueError:
+            return False
+        return any(addr in ipaddress.ip_network(net, strict=False) for net in settings.METRICS_ALLOWED_NETWORKS)
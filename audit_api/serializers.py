@@ -6,7 +6,7 @@ from django.contrib.auth import get_user_model
 
 from audit_api.models import Evidence, Organization, OrganizationMembership, Task
 from audit_api.models import AgentRun, AgentStepLog, Event, AiPipelineRun
-from audit_api.models import PromptTemplate, ModelRegistry
+from audit_api.models import PromptTemplate, ModelRegistry, ArchivedAgentRun
 
 
 
@@ -186,6 +186,27 @@ class AgentRunDetailSerializer(AgentRunSerializer):
         read_only_fields = fields
 
 
+class ArchivedAgentRunSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ArchivedAgentRun
+        fields = [
+            "id",
+            "agent_name",
+            "agent_version",
+            "status",
+            "started_at",
+            "finished_at",
+            "details",
+            "pipeline_run_id",
+            "evidence_id",
+            "step_count",
+            "event_count",
+            "output_count",
+            "archived_at",
+        ]
+        read_only_fields = fields
+
+
 class EventSerializer(serializers.ModelSerializer):
     class Meta:
         model = Event
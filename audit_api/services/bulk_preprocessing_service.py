@@ -0,0 +1,108 @@
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from audit_api.services.embedding_backends import EmbeddingBackend, backend_from_spec
+from audit_api.services.preprocessing_service import EvidencePreprocessingService
+from audit_api.services.process_pool import WorkerPool
+
+# Evidence columns a worker needs; rows cross the process boundary as plain tuples.
+FIELDS = ("id", "title", "description", "evidence_type_id", "source_type_id", "extracted_text")
+
+Row = Tuple[Any, ...]
+Task = Tuple[Tuple[str, Dict[str, Any]], List[Row], bool]
+
+
+@dataclass(frozen=True)
+class PreprocessedEvidence:
+    """Compact worker result: hash, optional text and a float32 vector as raw bytes."""
+
+    evidence_id: str
+    content_hash: str
+    text: Optional[str]
+    vector: bytes
+
+    def vector_list(self) -> List[float]:
+        return np.frombuffer(self.vector, dtype=np.float32).tolist()
+
+
+def preprocess_rows(task: Task) -> List[PreprocessedEvidence]:
+    """
+    Worker-side: build classification text, hash and embed one sub-batch with
+    a single backend batch call. No database access; the backend comes from
+    its spec and the memo is bypassed (its durable tier queries the DB).
+    """
+    spec, rows, with_text = task
+    backend = backend_from_spec(spec)
+    preprocessing = EvidencePreprocessingService()
+    texts = [preprocessing.build_classification_text(SimpleNamespace(**dict(zip(FIELDS, row))))[0] for row in rows]
+
+    vectors = np.zeros((len(texts), backend.dims), dtype=np.float32)
+    indexes = [i for i, text in enumerate(texts) if text.strip()]
+    if indexes:
+        vectors[indexes] = np.asarray(backend.embed_batch([texts[i] for i in indexes]), dtype=np.float32)
+
+    return [
+        PreprocessedEvidence(
+            evidence_id=str(row[0]),
+            content_hash=preprocessing.content_hash(text),
+            text=text if with_text else None,
+            vector=vectors[i].tobytes(),
+        )
+        for i, (row, text) in enumerate(zip(rows, texts))
+    ]
+
+
+class BulkPreprocessingService:
+    """
+    Fans classification-text building, hashing and embedding for many
+    evidence rows out to a WorkerPool. The parent sends `sub_batch_size` rows
+    per task, keeps at most `max_in_flight` tasks queued, and gets back
+    PreprocessedEvidence; only the parent touches the database.
+
+    Meant for CPU-bound (local) embedding backends. Remote backends are
+    I/O-bound and are better served by threads (see EmbeddingBackfillService).
+    """
+
+    def __init__(
+        self,
+        backend: EmbeddingBackend,
+        pool: WorkerPool,
+        *,
+        sub_batch_size: int = 32,
+        before_task=None,
+    ) -> None:
+        self.spec = backend.spec()
+        self.pool = pool
+        self.sub_batch_size = max(1, sub_batch_size)
+        self.before_task = before_task  # e.g. a rate limiter's wait(), called once per backend call
+
+    @staticmethod
+    def row(evidence) -> Row:
+        return tuple(getattr(evidence, field) for field in FIELDS)
+
+    def _tasks(self, rows: Iterable[Row], with_text: bool) -> Iterator[Task]:
+        batch: List[Row] = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == self.sub_batch_size:
+                if self.before_task:
+                    self.before_task()
+                yield self.spec, batch, with_text
+                batch = []
+        if batch:
+            if self.before_task:
+                self.before_task()
+            yield self.spec, batch, with_text
+
+    def iter_results(self, rows: Iterable[Row], *, with_text: bool = False) -> Iterator[PreprocessedEvidence]:
+        """Results as sub-batches complete (unordered); `rows` is consumed lazily."""
+        for results in self.pool.map(preprocess_rows, self._tasks(rows, with_text)):
+            yield from results
+
+    def preprocess(self, evidence: Sequence, *, with_text: bool = False) -> List[PreprocessedEvidence]:
+        """Results for `evidence`, in input order."""
+        by_id = {r.evidence_id: r for r in self.iter_results((self.row(e) for e in evidence), with_text=with_text)}
+        return [by_id[str(e.id)] for e in evidence]
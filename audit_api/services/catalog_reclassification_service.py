@@ -0,0 +1,195 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery
+from django.db import connection
+from django.db.models import Q, QuerySet
+from django.db.models.fields.json import KT
+from pgvector.django import CosineDistance
+
+from audit_api.models import ControlCatalogSnapshot, ControlEmbedding, Evidence, EvidenceControlMatch, EvidenceEmbedding
+from audit_api.models.evidence import EVIDENCE_SEARCH_CONFIG, evidence_search_vector
+from audit_api.services.control_catalog_service import CatalogDiff, ControlCatalogService
+from audit_api.services.control_vector_service import ControlVectorService
+from audit_api.services.preprocessing_service import EvidencePreprocessingService
+
+
+def _lexemes(text: str) -> Set[str]:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT tsvector_to_array(to_tsvector(%s::regconfig, %s))",
+            [EVIDENCE_SEARCH_CONFIG, text],
+        )
+        row = cursor.fetchone()
+    return set(row[0] or []) if row else set()
+
+
+def _any_term_query(terms: Iterable[str]) -> SearchQuery:
+    quoted = ["'" + term.replace("'", "''") + "'" for term in sorted(terms)]
+    return SearchQuery(" | ".join(quoted), search_type="raw", config=EVIDENCE_SEARCH_CONFIG)
+
+
+class CatalogReclassificationService:
+    """
+    Brings classifications up to date after a control catalog change without
+    reprocessing the whole corpus.
+
+    Classified evidence is grouped by the catalog version it was classified
+    under. For each stale version the catalog diff gives the touched controls;
+    only evidence that could rank differently is re-run:
+
+    - evidence currently matched to a touched control (evidence_control_matches),
+    - evidence whose classifier text shares a lexeme with a touched control's
+      old or new text (the `evidence_search_gin` inverted index),
+    - evidence that gets a preprocessing hint sharing such a lexeme,
+    - with semantic retrieval on, evidence whose embedding is within
+      CONTROL_SEMANTIC_MIN_SIMILARITY of an added or changed control.
+
+    All other evidence of that version is re-stamped with the current version
+    in place, since its FTS candidates cannot have changed.
+    """
+
+    def __init__(self, catalog: Optional[ControlCatalogService] = None, *, batch_size: int = 500) -> None:
+        self.catalog = catalog or ControlCatalogService()
+        self.batch_size = batch_size
+
+    # --- planning --------------------------------------------------------
+
+    @staticmethod
+    def _classified() -> QuerySet:
+        return Evidence.objects.filter(ai_classification__isnull=False).annotate(
+            catalog_version=KT("ai_classification__catalog_version")
+        )
+
+    def stale_versions(self, current: str) -> Dict[Optional[str], int]:
+        rows = (
+            self._classified()
+            .filter(Q(catalog_version__isnull=True) | ~Q(catalog_version=current))
+            .values_list("catalog_version")
+            .order_by()
+        )
+        counts: Dict[Optional[str], int] = {}
+        for (version,) in rows.iterator():
+            counts[version] = counts.get(version, 0) + 1
+        if None in counts and self.catalog.is_current(None, current):
+            del counts[None]
+        return counts
+
+    def _with_version(self, version: Optional[str]) -> QuerySet:
+        qs = self._classified()
+        return qs.filter(catalog_version__isnull=True) if version is None else qs.filter(catalog_version=version)
+
+    def _hint_filter(self, terms: Set[str]) -> Q:
+        pre = EvidencePreprocessingService
+        hint = Q(pk__in=[])
+        if terms & _lexemes(pre.AWS_SOURCE_HINT):
+            for source_type in pre.AWS_SOURCE_TYPES:
+                hint |= Q(source_type_id__iexact=source_type)
+        if terms & _lexemes(pre.S3_POLICY_HINT):
+            hint |= Q(extracted_text__icontains="s3:")
+        return hint
+
+    @staticmethod
+    def _semantic_filter(control_ids: List[str]) -> Q:
+        vectors = ControlVectorService()
+        vectors.sync()
+        model_name = vectors.embedding.model_name
+        max_distance = 1.0 - settings.CONTROL_SEMANTIC_MIN_SIMILARITY
+        near = Q(pk__in=[])
+        for vector in ControlEmbedding.objects.filter(model_name=model_name, control_id__in=control_ids).values_list(
+            "vector", flat=True
+        ):
+            near |= Q(
+                id__in=EvidenceEmbedding.objects.filter(model_name=model_name)
+                .annotate(distance=CosineDistance("vector", vector))
+                .filter(distance__lte=max_distance)
+                .values("evidence_id")
+            )
+        return near
+
+    def affected(self, version: Optional[str], diff: Optional[CatalogDiff]) -> QuerySet:
+        """Evidence of `version` whose top candidates could change (all of it if the old snapshot is unknown)."""
+        qs = self._with_version(version)
+        if diff is None:
+            return qs
+        if diff.empty:
+            return qs.none()
+        condition = Q(
+            id__in=EvidenceControlMatch.objects.filter(control_reference__in=diff.references).values("evidence_id")
+        )
+        if diff.terms:
+            qs = qs.annotate(search=evidence_search_vector())
+            condition |= Q(search=_any_term_query(diff.terms)) | self._hint_filter(diff.terms)
+        if settings.CONTROL_SEMANTIC_RETRIEVAL and (diff.added or diff.changed):
+            condition |= self._semantic_filter(diff.added + diff.changed)
+        return qs.filter(condition)
+
+    def diff_for(self, version: Optional[str], current: ControlCatalogSnapshot) -> Optional[CatalogDiff]:
+        old_version = version or self.catalog.baseline_version()
+        old = ControlCatalogSnapshot.objects.filter(version=old_version).first() if old_version else None
+        return self.catalog.diff(old, current) if old else None
+
+    def plan(self) -> List[Dict[str, Any]]:
+        current = self.catalog.snapshot()
+        self.catalog.current_version(fresh=True)
+        out = []
+        for version, total in self.stale_versions(current.version).items():
+            diff = self.diff_for(version, current)
+            out.append(
+                {
+                    "from_version": version,
+                    "evidence": total,
+                    "affected": self.affected(version, diff).count(),
+                    "diff": diff.as_dict() if diff else None,
+                }
+            )
+        return out
+
+    # --- execution -------------------------------------------------------
+
+    def restamp(self, evidence_ids: List[str], version: str) -> int:
+        if not evidence_ids:
+            return 0
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "UPDATE evidence SET ai_classification = jsonb_set(ai_classification, '{catalog_version}', "
+                "to_jsonb(%s::text)) WHERE id = ANY(%s::uuid[])",
+                [version, evidence_ids],
+            )
+            return cursor.rowcount
+
+    def run(
+        self,
+        *,
+        reclassify: Callable[[str], Any],
+        limit: Optional[int] = None,
+    ) -> Dict[str, int]:
+        """
+        Re-run `reclassify(evidence_id)` for affected evidence (at most `limit`)
+        and re-stamp the rest. Safe to repeat: re-classified evidence carries
+        the current version and drops out of the stale set.
+        """
+        current = self.catalog.snapshot()
+        self.catalog.current_version(fresh=True)
+        totals = {"reclassified": 0, "restamped": 0, "stale_versions": 0}
+        for version in list(self.stale_versions(current.version)):
+            totals["stale_versions"] += 1
+            diff = self.diff_for(version, current)
+            affected = self.affected(version, diff)
+            affected_ids = set()
+            for evidence_id in affected.values_list("id", flat=True).order_by("id").iterator():
+                affected_ids.add(evidence_id)
+                if limit is None or totals["reclassified"] < limit:
+                    reclassify(str(evidence_id))
+                    totals["reclassified"] += 1
+
+            batch: List[str] = []
+            for evidence_id in self._with_version(version).values_list("id", flat=True).iterator():
+                if evidence_id in affected_ids:
+                    continue
+                batch.append(str(evidence_id))
+                if len(batch) >= self.batch_size:
+                    totals["restamped"] += self.restamp(batch, current.version)
+                    batch = []
+            totals["restamped"] += self.restamp(batch, current.version)
+        return totals
@@ -0,0 +1,104 @@
+import hashlib
+from dataclasses import dataclass
+from typing import List, Optional
+
+from django.conf import settings
+
+
+@dataclass(frozen=True)
+class TextChunk:
+    index: int
+    start: int  # char offsets into the source text
+    end: int
+    text: str
+
+    @property
+    def chunk_hash(self) -> str:
+        return hashlib.sha256(self.text.encode("utf-8")).hexdigest()
+
+
+class TextChunkingService:
+    """
+    Content-defined, line-based chunking for embeddings.
+
+    A chunk ends at a line whose hash hits the boundary mask once the chunk is
+    at least `target_chars` long (or unconditionally at `max_chars`). Because
+    boundaries depend on line content rather than absolute offsets, an edit
+    only changes the chunk(s) around it; every other chunk keeps its hash and
+    its stored embedding can be reused. Each chunk is prefixed with up to
+    `overlap_chars` of trailing lines from the previous chunk.
+    """
+
+    BOUNDARY_MASK = 0x7  # ~1 in 8 lines is a candidate boundary
+
+    def __init__(
+        self,
+        *,
+        target_chars: Optional[int] = None,
+        max_chars: Optional[int] = None,
+        overlap_chars: Optional[int] = None,
+    ) -> None:
+        self.target_chars = target_chars or settings.EMBEDDING_CHUNK_TARGET_CHARS
+        self.max_chars = max(max_chars or settings.EMBEDDING_CHUNK_MAX_CHARS, self.target_chars)
+        self.overlap_chars = settings.EMBEDDING_CHUNK_OVERLAP_CHARS if overlap_chars is None else overlap_chars
+
+    def _is_boundary(self, line: str) -> bool:
+        digest = hashlib.blake2b(line.strip().encode("utf-8"), digest_size=4).digest()
+        return (int.from_bytes(digest, "big") & self.BOUNDARY_MASK) == 0
+
+    def _split_long_line(self, line: str, offset: int) -> List[tuple]:
+        return [
+            (offset + i, line[i : i + self.max_chars])
+            for i in range(0, len(line), self.max_chars)
+        ]
+
+    def chunk(self, text: str) -> List[TextChunk]:
+        text = text or ""
+        if not text.strip():
+            return []
+
+        lines: List[tuple] = []  # (offset, line incl. newline)
+        offset = 0
+        for line in text.splitlines(keepends=True):
+            if len(line) > self.max_chars:
+                lines.extend(self._split_long_line(line, offset))
+            else:
+                lines.append((offset, line))
+            offset += len(line)
+
+        chunks: List[TextChunk] = []
+        current: List[tuple] = []
+        size = 0
+        previous: List[tuple] = []
+
+        def flush() -> None:
+            nonlocal current, size, previous
+            if not current:
+                return
+            overlap: List[tuple] = []
+            carried = 0
+            for item in reversed(previous):
+                if carried + len(item[1]) > self.overlap_chars:
+                    break
+                overlap.insert(0, item)
+                carried += len(item[1])
+            body = overlap + current
+            chunks.append(
+                TextChunk(
+                    index=len(chunks),
+                    start=body[0][0],
+                    end=current[-1][0] + len(current[-1][1]),
+                    text="".join(part for _, part in body),
+                )
+            )
+            previous, current, size = current, [], 0
+
+        for item in lines:
+            if current and size + len(item[1]) > self.max_chars:
+                flush()
+            current.append(item)
+            size += len(item[1])
+            if size >= self.target_chars and self._is_boundary(item[1]):
+                flush()
+        flush()
+        return chunks
@@ -1,24 +1,74 @@
-from typing import Optional, Dict, Any
+from collections import defaultdict
+from typing import Optional, Dict, Any, List, Tuple, FrozenSet
 from uuid import UUID
 
-from pgvector.django import L2Distance
-from audit_api.models import EvidenceEmbedding, Evidence, ClassifierOutput
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Count
+from audit_api.models import EvidenceChunkEmbedding, EvidenceEmbedding, Evidence, ClassifierOutput
+from audit_api.services.chunking_service import TextChunk
+from audit_api.services.control_catalog_service import ControlCatalogService
 from audit_api.services.embedding_service import EmbeddingService
+from audit_api.services.metrics_service import record_cache_lookup
+from audit_api.services.vector_storage_service import VectorStorageService
 
 
 class ClassificationCacheService:
     """
     Caches classifier results by embedding similarity and content hash.
+    Every lookup is scoped to the embedding service's model, so rows from a
+    model being backfilled never answer for the serving model.
+
+    Multi-chunk documents are matched chunk by chunk: a stored evidence item is
+    a hit when enough of both documents' chunks have a neighbour in the other
+    (see `_find_by_chunks`), so small edits to a long document still reuse its
+    classification. When no stored item is covered well enough, the
+    whole-document vector search still runs.
+
+    When the caller passes the current control catalog version, only results
+    classified under that version are reused; anything older is a miss, since
+    the candidate controls it was ranked against may have changed.
     """
 
-    def __init__(self, embedding_service: EmbeddingService | None = None, *, threshold: float = 0.30):
+    MAX_CHUNK_PROBES = 16  # chunks without an exact hash match probed per lookup (one batched query)
+    CHUNK_NEIGHBOURS = 5
+
+    def __init__(
+        self,
+        embedding_service: EmbeddingService | None = None,
+        *,
+        threshold: float = 0.30,
+        min_chunk_coverage: float | None = None,
+    ):
         self.embedding_service = embedding_service or EmbeddingService()
         self.threshold = threshold  # L2 distance threshold on normalized vectors
+        self.vectors = VectorStorageService(
+            model_name=self.embedding_service.model_name,
+            dims=self.embedding_service.model_dim,
+        )
+        self.min_chunk_coverage = (
+            settings.CLASSIFICATION_CACHE_MIN_CHUNK_COVERAGE if min_chunk_coverage is None else min_chunk_coverage
+        )
+        self.catalog = ControlCatalogService()
 
-    def _build_response(self, evidence: Evidence, *, similarity: float, source: Evidence) -> Optional[Dict[str, Any]]:
-        classification = evidence.ai_classification
+    def _accepted_versions(self, catalog_version: Optional[str]) -> Optional[FrozenSet[Optional[str]]]:
+        """Catalog versions a reusable result may carry; None disables the check."""
+        if catalog_version is None:
+            return None
+        if self.catalog.is_current(None, catalog_version):
+            return frozenset({catalog_version, None})
+        return frozenset({catalog_version})
+
+    @staticmethod
+    def _compose(
+        classification: Optional[Dict[str, Any]],
+        latest: Optional[ClassifierOutput],
+        *,
+        similarity: float,
+        source: Evidence,
+        accepted: Optional[FrozenSet[Optional[str]]] = None,
+    ) -> Optional[Dict[str, Any]]:
         if not classification:
-            latest = evidence.classifier_outputs.order_by("-created_at").first()
             if not latest:
                 return None
             classification = {
@@ -26,7 +76,10 @@ class ClassificationCacheService:
                 "confidence": float(latest.confidence),
                 "pipeline_run_id": str(latest.pipeline_run_id),
                 "stub": False,
+                "catalog_version": latest.catalog_version,
             }
+        if accepted is not None and classification.get("catalog_version") not in accepted:
+            return None
 
         return {
             **classification,
@@ -35,48 +88,183 @@ class ClassificationCacheService:
             "source_evidence_id": str(source.id),
         }
 
-    def find_cached(self, *, text: str, content_hash: str) -> Optional[Dict[str, Any]]:
-        # 1) Exact hash match (deterministic reuse)
-        emb = (
+    def _build_response(
+        self, evidence: Evidence, *, similarity: float, source: Evidence, accepted=None
+    ) -> Optional[Dict[str, Any]]:
+        classification = evidence.ai_classification
+        latest = None if classification else evidence.classifier_outputs.order_by("-created_at").first()
+        return self._compose(classification, latest, similarity=similarity, source=source, accepted=accepted)
+
+    async def _abuild_response(
+        self, evidence: Evidence, *, similarity: float, source: Evidence, accepted=None
+    ) -> Optional[Dict[str, Any]]:
+        classification = evidence.ai_classification
+        latest = None if classification else await evidence.classifier_outputs.order_by("-created_at").afirst()
+        return self._compose(classification, latest, similarity=similarity, source=source, accepted=accepted)
+
+    def _exact_match(self, content_hash: str):
+        return (
             EvidenceEmbedding.objects.select_related("evidence")
-            .filter(content_hash=content_hash)
+            .filter(model_name=self.embedding_service.model_name, content_hash=content_hash)
             .order_by("-created_at")
-            .first()
         )
+
+    def find_cached(
+        self, *, text: str, content_hash: str, catalog_version: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        accepted = self._accepted_versions(catalog_version)
+        # 1) Exact hash match (deterministic reuse)
+        emb = self._exact_match(content_hash).first()
         if emb:
-            resp = self._build_response(emb.evidence, similarity=1.0, source=emb.evidence)
+            resp = self._build_response(emb.evidence, similarity=1.0, source=emb.evidence, accepted=accepted)
             if resp:
+                record_cache_lookup(hit=True, match="exact")
                 return resp
+        return self._find_similar(text, accepted, exact=emb)
 
-        # 2) Vector similarity search
-        vector = self.embedding_service.embed_vector(text)
-        candidate = (
-            EvidenceEmbedding.objects.select_related("evidence")
-            .annotate(distance=L2Distance("vector", vector))
-            .filter(distance__lte=self.threshold)
-            .order_by("distance")
-            .first()
+    async def afind_cached(
+        self, *, text: str, content_hash: str, catalog_version: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Async form of find_cached. The exact-hash path uses the async ORM; the
+        similarity paths embed text (CPU) and run pgvector queries, so they run
+        in a worker thread.
+        """
+        accepted = await sync_to_async(self._accepted_versions)(catalog_version)
+        emb = await self._exact_match(content_hash).afirst()
+        if emb:
+            resp = await self._abuild_response(emb.evidence, similarity=1.0, source=emb.evidence, accepted=accepted)
+            if resp:
+                record_cache_lookup(hit=True, match="exact")
+                return resp
+        return await sync_to_async(self._find_similar)(text, accepted, exact=emb)
+
+    def _find_similar(
+        self, text: str, accepted=None, *, exact: Optional[EvidenceEmbedding] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        `exact` is the result of the exact-hash lookup the caller just ran: its
+        vector is this text's vector, and when it is None the memo's durable
+        tier (the same query) would miss, so it is skipped.
+        """
+        # 2) Chunk-level similarity for long documents
+        pairs, _embedded = self.embedding_service.chunk_vectors(text)
+        if len(pairs) > 1:
+            resp = self._find_by_chunks(pairs, accepted)
+            if resp:
+                record_cache_lookup(hit=True, match="chunks")
+                return resp
+
+        # 3) Whole-document vector similarity search
+        if exact is not None:
+            vector = list(exact.vector)
+        else:
+            vector = self.embedding_service.embed_vector(text, durable=False)
+        candidate = self.vectors.nearest(
+            EvidenceEmbedding.objects.select_related("evidence"),
+            vector,
+            threshold=self.threshold,
         )
         if candidate:
             resp = self._build_response(
                 candidate.evidence,
                 similarity=max(0.0, 1.0 - float(candidate.distance)),
                 source=candidate.evidence,
+                accepted=accepted,
             )
             if resp:
+                record_cache_lookup(hit=True, match="vector")
                 return resp
 
+        record_cache_lookup(hit=False, match="none")
         return None
 
+    def _find_by_chunks(self, pairs: List[Tuple[TextChunk, List[float]]], accepted=None) -> Optional[Dict[str, Any]]:
+        model_name = self.embedding_service.model_name
+        total = len(pairs)
+        # evidence_id -> {query chunk index: best similarity}
+        covered: Dict[UUID, Dict[int, float]] = defaultdict(dict)
+        matched_chunks: Dict[UUID, set] = defaultdict(set)  # candidate chunks matched by hash
+
+        by_hash: Dict[str, List[int]] = defaultdict(list)
+        for chunk, _vector in pairs:
+            by_hash[chunk.chunk_hash].append(chunk.index)
+        exact = list(
+            EvidenceChunkEmbedding.objects.filter(
+                model_name=model_name, chunk_hash__in=list(by_hash)
+            ).values_list("evidence_id", "chunk_index", "chunk_hash")
+        )
+        for evidence_id, chunk_index, chunk_hash in exact:
+            matched_chunks[evidence_id].add(chunk_index)
+            for index in by_hash[chunk_hash]:
+                covered[evidence_id][index] = 1.0
+
+        exact_hashes = {h for _e, _i, h in exact}
+        unmatched = [(c, v) for c, v in pairs if c.chunk_hash not in exact_hashes]
+        unmatched_total = len(unmatched)
+        if len(unmatched) > self.MAX_CHUNK_PROBES:
+            step = len(unmatched) / self.MAX_CHUNK_PROBES
+            unmatched = [unmatched[int(i * step)] for i in range(self.MAX_CHUNK_PROBES)]
+        neighbours = self.vectors.chunk_neighbours(
+            [(chunk.index, vector) for chunk, vector in unmatched],
+            k=self.CHUNK_NEIGHBOURS,
+            threshold=self.threshold,
+        )
+        near_chunks: Dict[UUID, set] = defaultdict(set)
+        for query_index, evidence_id, chunk_index, distance in neighbours:
+            near_chunks[evidence_id].add(chunk_index)
+            similarity = max(0.0, 1.0 - distance)
+            if similarity > covered[evidence_id].get(query_index, 0.0):
+                covered[evidence_id][query_index] = similarity
+
+        if not covered:
+            return None
+
+        # Probed chunks stand in for the ones skipped by MAX_CHUNK_PROBES.
+        probe_scale = unmatched_total / len(unmatched) if unmatched else 1.0
+        candidate_sizes = dict(
+            EvidenceChunkEmbedding.objects.filter(model_name=model_name, evidence_id__in=list(covered))
+            .values_list("evidence_id")
+            .annotate(n=Count("id"))
+            .values_list("evidence_id", "n")
+        )
+
+        best = None
+        for evidence_id, hits in covered.items():
+            exact_hits = sum(1 for v in hits.values() if v == 1.0)
+            query_coverage = min(1.0, (exact_hits + (len(hits) - exact_hits) * probe_scale) / total)
+            # Neighbour matches come from probes only, so they are scaled like the query side.
+            near = len(near_chunks[evidence_id] - matched_chunks[evidence_id])
+            size = max(1, candidate_sizes.get(evidence_id, 0))
+            candidate_coverage = min(1.0, (len(matched_chunks[evidence_id]) + near * probe_scale) / size)
+            coverage = min(query_coverage, candidate_coverage)
+            if coverage < self.min_chunk_coverage:
+                continue
+            score = coverage * (sum(hits.values()) / len(hits))
+            if best is None or score > best[1]:
+                best = (evidence_id, score)
+
+        if best is None:
+            return None
+        source = Evidence.objects.filter(pk=best[0]).first()
+        if source is None:
+            return None
+        return self._build_response(source, similarity=round(best[1], 4), source=source, accepted=accepted)
+
     def store_embedding(
         self,
         *,
         evidence: Evidence,
         text: str,
         content_hash: str,
+        vector: Optional[List[float]] = None,
     ) -> EvidenceEmbedding:
         return self.embedding_service.upsert_embedding(
             evidence=evidence,
             text=text,
             content_hash=content_hash,
+            vector=vector,
         )
+
+    def store_chunk_embeddings(self, *, evidence: Evidence, text: str) -> Dict[str, int]:
+        return self.embedding_service.upsert_chunk_embeddings(evidence=evidence, text=text)
@@ -0,0 +1,163 @@
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, Max
+
+from audit_api.models import Control, ControlCatalogSnapshot
+from audit_api.models.evidence import EVIDENCE_SEARCH_CONFIG
+
+
+def control_hash(reference: str, title: str, description: Optional[str]) -> str:
+    """Hash of the fields FTS retrieval ranks on; any change can move candidates."""
+    payload = "\x1f".join([reference or "", title or "", (description or "").strip()])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CatalogDiff:
+    added: List[str] = field(default_factory=list)  # control ids
+    removed: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    references: Set[str] = field(default_factory=set)  # old and new references of touched controls
+    terms: Set[str] = field(default_factory=set)  # old and new lexemes of touched controls
+
+    @property
+    def empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "added": len(self.added),
+            "removed": len(self.removed),
+            "changed": len(self.changed),
+            "references": sorted(self.references),
+            "term_count": len(self.terms),
+        }
+
+
+class ControlCatalogService:
+    """
+    Versions the control catalog (every framework's controls).
+
+    `current_version()` is called on every classification, so the version is
+    cached per process: for CONTROL_CATALOG_VERSION_TTL_SECONDS it is returned
+    without a query, after that a cheap (count, max(updated_at)) check decides
+    whether to recompute it. Catalog writers (seeding, reclassification) pass
+    `fresh=True`. The first time a version is seen it is recorded as a
+    ControlCatalogSnapshot with each control's FTS lexemes.
+
+    Classifications written before versioning carry no version and are treated
+    as belonging to the earliest snapshot (the baseline).
+    """
+
+    _state: Dict[str, Any] = {}
+    _lock = threading.Lock()
+
+    # --- versions --------------------------------------------------------
+
+    @staticmethod
+    def _fingerprint() -> Tuple[int, Any]:
+        agg = Control.objects.aggregate(n=Count("id"), latest=Max("updated_at"))
+        return agg["n"], agg["latest"]
+
+    def current_version(self, *, fresh: bool = False) -> str:
+        """The catalog version, possibly up to CONTROL_CATALOG_VERSION_TTL_SECONDS old unless `fresh`."""
+        now = time.monotonic()
+        with self._lock:
+            if not fresh and "version" in self._state and now < self._state["expires_at"]:
+                return self._state["version"]
+        fingerprint = self._fingerprint()
+        expires_at = now + settings.CONTROL_CATALOG_VERSION_TTL_SECONDS
+        with self._lock:
+            if self._state.get("fingerprint") == fingerprint:
+                self._state["expires_at"] = expires_at
+                return self._state["version"]
+        version = self.snapshot().version
+        with self._lock:
+            self._state.update(fingerprint=fingerprint, version=version, expires_at=expires_at)
+        return version
+
+    def baseline_version(self) -> Optional[str]:
+        with self._lock:
+            if self._state.get("baseline"):
+                return self._state["baseline"]
+        baseline = ControlCatalogSnapshot.objects.order_by("created_at").values_list("version", flat=True).first()
+        if baseline:
+            with self._lock:
+                self._state["baseline"] = baseline
+        return baseline
+
+    def is_current(self, version: Optional[str], current: str) -> bool:
+        if version is None:
+            return self.baseline_version() in (None, current)
+        return version == current
+
+    @staticmethod
+    def compute() -> Tuple[str, Dict[str, str], Dict[str, Dict[str, Any]]]:
+        rows = Control.objects.order_by("framework__code", "reference", "id").values_list(
+            "id", "framework__code", "reference", "title", "description"
+        )
+        digests: Dict[str, Any] = {}
+        controls: Dict[str, Dict[str, Any]] = {}
+        for control_id, framework, reference, title, description in rows:
+            digest = control_hash(reference, title, description)
+            controls[str(control_id)] = {"reference": reference, "framework": framework, "hash": digest}
+            digests.setdefault(framework, hashlib.sha256()).update(digest.encode("ascii"))
+        frameworks = {code: d.hexdigest() for code, d in sorted(digests.items())}
+        version = hashlib.sha256(json.dumps(frameworks, sort_keys=True).encode("utf-8")).hexdigest()
+        return version, frameworks, controls
+
+    def snapshot(self) -> ControlCatalogSnapshot:
+        version, frameworks, controls = self.compute()
+        existing = ControlCatalogSnapshot.objects.filter(version=version).first()
+        if existing:
+            return existing
+        terms = self._control_terms()
+        for control_id, entry in controls.items():
+            entry["terms"] = terms.get(control_id, [])
+        snapshot, _ = ControlCatalogSnapshot.objects.get_or_create(
+            version=version,
+            defaults={"frameworks": frameworks, "controls": controls, "control_count": len(controls)},
+        )
+        return snapshot
+
+    @staticmethod
+    def _control_terms() -> Dict[str, List[str]]:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT id::text, tsvector_to_array(to_tsvector(%s::regconfig, "
+                "concat_ws(' ', reference, title, description))) FROM controls",
+                [EVIDENCE_SEARCH_CONFIG],
+            )
+            return {control_id: sorted(terms or []) for control_id, terms in cursor.fetchall()}
+
+    # --- diffs -----------------------------------------------------------
+
+    @staticmethod
+    def diff(old: ControlCatalogSnapshot, new: ControlCatalogSnapshot) -> CatalogDiff:
+        out = CatalogDiff()
+        old_controls, new_controls = old.controls or {}, new.controls or {}
+        for control_id, entry in new_controls.items():
+            before = old_controls.get(control_id)
+            if before is None:
+                out.added.append(control_id)
+            elif before["hash"] != entry["hash"]:
+                out.changed.append(control_id)
+                out.references.add(before["reference"])
+                out.terms.update(before.get("terms") or [])
+            else:
+                continue
+            out.references.add(entry["reference"])
+            out.terms.update(entry.get("terms") or [])
+        for control_id, entry in old_controls.items():
+            if control_id not in new_controls:
+                out.removed.append(control_id)
+                out.references.add(entry["reference"])
+                out.terms.update(entry.get("terms") or [])
+        return out
@@ -0,0 +1,58 @@
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from django.db import transaction
+
+from audit_api.models import AiPipelineRun, Control, Evidence, EvidenceControlMatch
+
+
+class ControlMatchService:
+    """
+    Keeps `evidence_control_matches` in sync with an evidence item's latest
+    classification. Each call replaces the previous matches for the evidence.
+    """
+
+    @staticmethod
+    def resolve_controls(references: Iterable[str]) -> Dict[str, Control]:
+        # References are not unique across frameworks; take the oldest row per
+        # reference so repeated runs resolve to the same control.
+        resolved: Dict[str, Control] = {}
+        for control in Control.objects.filter(reference__in=set(references)).order_by("created_at"):
+            resolved.setdefault(control.reference, control)
+        return resolved
+
+    @transaction.atomic
+    def replace_matches(
+        self,
+        *,
+        evidence: Evidence,
+        primary_controls: Sequence[str],
+        confidence: float,
+        pipeline_run: Optional[AiPipelineRun] = None,
+        controls: Optional[Sequence[Control]] = None,
+    ) -> List[EvidenceControlMatch]:
+        by_reference = {c.reference: c for c in controls or []}
+        missing = [ref for ref in primary_controls if ref not in by_reference]
+        if missing:
+            by_reference.update(
+                {ref: c for ref, c in self.resolve_controls(missing).items() if ref not in by_reference}
+            )
+
+        EvidenceControlMatch.objects.filter(evidence=evidence).delete()
+        seen = set()
+        matches = []
+        for rank, reference in enumerate(primary_controls):
+            if reference in seen:
+                continue
+            seen.add(reference)
+            matches.append(
+                EvidenceControlMatch(
+                    organization_id=evidence.organization_id,
+                    evidence=evidence,
+                    control=by_reference.get(reference),
+                    control_reference=reference,
+                    rank=rank,
+                    confidence=float(confidence),
+                    pipeline_run=pipeline_run,
+                )
+            )
+        return EvidenceControlMatch.objects.bulk_create(matches)
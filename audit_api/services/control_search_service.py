@@ -1,45 +1,206 @@
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import List
+from typing import Dict, List, Optional, Sequence, Tuple
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.postgres.search import (
     SearchVector,
     SearchQuery,
     SearchRank,
 )
-from audit_api.models import Control
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from audit_api.models import Control, OrganizationFramework
+from audit_api.services.control_vector_service import ControlVectorService
 
 
 @dataclass
 class ControlCandidate:
     control: Control
     score: float
+    framework_rank: int = 1  # position within the control's framework (per-framework retrieval)
+    similarity: Optional[float] = None  # cosine similarity, when found by semantic retrieval
+    fused: float = 0.0  # reciprocal rank fusion score
 
 
 class ControlSearchService:
     """
     Postgres full-text search over controls.
     Tuned for small SOC2 dataset + JSON-ish evidence text.
+
+    Organizations with active OrganizationFramework rows get candidates from
+    each adopted framework: one query ranks controls of those frameworks and a
+    ROW_NUMBER() window partitioned by framework keeps the top
+    `per_framework` of each, so a large catalog cannot crowd out a small one.
+    Organizations without adopted frameworks search every control.
+
+    With CONTROL_SEMANTIC_RETRIEVAL on, the same text is also matched against
+    the in-memory control-embedding matrix (ControlVectorService) and the two
+    rankings are merged by reciprocal rank fusion, per framework when scoped.
+    Semantic matches below CONTROL_SEMANTIC_MIN_SIMILARITY are ignored, so a
+    weak embedding model leaves the FTS ranking untouched.
     """
 
-    def top_candidates(self, *, text: str, limit: int = 5) -> List[ControlCandidate]:
-        text = (text or "").strip()
-        if not text:
-            return []
+    def __init__(self, vectors: Optional[ControlVectorService] = None) -> None:
+        self._vectors = vectors
 
+    @staticmethod
+    def _vector():
         # Weighted vector: description matters most
-        vector = (
+        return (
             SearchVector("reference", weight="A")
             + SearchVector("title", weight="B")
             + SearchVector("description", weight="A")
         )
 
+    @staticmethod
+    def _query(text: str):
         # websearch handles “IAM policy S3” better than plain
-        query = SearchQuery(text, search_type="websearch")
+        return SearchQuery(text, search_type="websearch")
 
-        qs = (
-            Control.objects.annotate(rank=SearchRank(vector, query))
+    def _ranked(self, text: str, limit: int):
+        return (
+            Control.objects.annotate(rank=SearchRank(self._vector(), self._query(text)))
             .filter(rank__gt=0.0)
             .order_by("-rank")[:limit]
         )
 
-        return [ControlCandidate(control=c, score=float(c.rank)) for c in qs]
+    def _ranked_per_framework(self, text: str, framework_ids: Sequence, per_framework: int):
+        return (
+            Control.objects.filter(framework_id__in=list(framework_ids))
+            .annotate(rank=SearchRank(self._vector(), self._query(text)))
+            .filter(rank__gt=0.0)
+            .annotate(
+                framework_rank=Window(
+                    RowNumber(),
+                    partition_by=[F("framework_id")],
+                    order_by=[F("rank").desc(), F("reference").asc()],
+                )
+            )
+            .filter(framework_rank__lte=per_framework)
+            .order_by("framework_rank", "-rank")
+        )
+
+    @staticmethod
+    def _active_frameworks(organization_id):
+        return OrganizationFramework.objects.filter(organization_id=organization_id, is_active=True).values_list(
+            "framework_id", flat=True
+        )
+
+    @staticmethod
+    def _per_framework(per_framework: Optional[int]) -> int:
+        return settings.CONTROL_CANDIDATES_PER_FRAMEWORK if per_framework is None else per_framework
+
+    @staticmethod
+    def _candidate(control: Control) -> ControlCandidate:
+        return ControlCandidate(
+            control=control,
+            score=float(control.rank),
+            framework_rank=getattr(control, "framework_rank", 1),
+        )
+
+    @property
+    def vectors(self) -> ControlVectorService:
+        if self._vectors is None:
+            self._vectors = ControlVectorService()
+        return self._vectors
+
+    def _semantic(self, text: str, framework_ids: Sequence) -> List[Tuple[Control, float]]:
+        if not settings.CONTROL_SEMANTIC_RETRIEVAL:
+            return []
+        return self.vectors.similar(
+            text,
+            k=settings.CONTROL_SEMANTIC_TOP_K,
+            min_similarity=settings.CONTROL_SEMANTIC_MIN_SIMILARITY,
+            framework_ids=framework_ids or None,
+        )
+
+    @staticmethod
+    def _fuse(
+        fts: List[ControlCandidate],
+        semantic: List[Tuple[Control, float]],
+        *,
+        scoped: bool,
+        keep: int,
+    ) -> List[ControlCandidate]:
+        """RRF over the FTS and semantic rankings; ranks count within a framework when scoped."""
+        if not semantic:
+            return fts
+        k = settings.CONTROL_RRF_K
+        group = (lambda control: control.framework_id) if scoped else (lambda control: None)
+
+        merged: Dict[object, ControlCandidate] = {}
+        for position, candidate in enumerate(fts, start=1):
+            candidate.fused += 1.0 / (k + (candidate.framework_rank if scoped else position))
+            merged[candidate.control.id] = candidate
+        seen: Dict[object, int] = defaultdict(int)
+        for control, similarity in semantic:
+            seen[group(control)] += 1
+            candidate = merged.get(control.id)
+            if candidate is None:
+                candidate = merged[control.id] = ControlCandidate(control=control, score=0.0)
+            candidate.similarity = similarity
+            candidate.fused += 1.0 / (k + seen[group(control)])
+
+        groups: Dict[object, List[ControlCandidate]] = defaultdict(list)
+        for candidate in merged.values():
+            groups[group(candidate.control)].append(candidate)
+        out: List[ControlCandidate] = []
+        for members in groups.values():
+            members.sort(key=lambda c: (-c.fused, -c.score))
+            for rank, candidate in enumerate(members[:keep], start=1):
+                if scoped:
+                    candidate.framework_rank = rank
+                out.append(candidate)
+        out.sort(key=lambda c: (c.framework_rank, -c.fused))
+        return out
+
+    def top_candidates(
+        self,
+        *,
+        text: str,
+        limit: int = 5,
+        organization_id=None,
+        per_framework: Optional[int] = None,
+    ) -> List[ControlCandidate]:
+        """
+        Best controls for `text`. With an organization that has active
+        frameworks, returns up to `per_framework` per framework, ordered so the
+        best control of every framework comes before any second choice;
+        otherwise the global top `limit`.
+        """
+        text = (text or "").strip()
+        if not text:
+            return []
+        framework_ids = list(self._active_frameworks(organization_id)) if organization_id else []
+        keep = self._per_framework(per_framework) if framework_ids else limit
+        if framework_ids:
+            rows = self._ranked_per_framework(text, framework_ids, keep)
+        else:
+            rows = self._ranked(text, limit)
+        fts = [self._candidate(c) for c in rows]
+        return self._fuse(fts, self._semantic(text, framework_ids), scoped=bool(framework_ids), keep=keep)
+
+    async def atop_candidates(
+        self,
+        *,
+        text: str,
+        limit: int = 5,
+        organization_id=None,
+        per_framework: Optional[int] = None,
+    ) -> List[ControlCandidate]:
+        text = (text or "").strip()
+        if not text:
+            return []
+        framework_ids = [f async for f in self._active_frameworks(organization_id)] if organization_id else []
+        keep = self._per_framework(per_framework) if framework_ids else limit
+        if framework_ids:
+            rows = self._ranked_per_framework(text, framework_ids, keep)
+        else:
+            rows = self._ranked(text, limit)
+        fts = [self._candidate(c) async for c in rows]
+        # Embedding and a catalog-version check may touch the DB; run them off the event loop.
+        semantic = await sync_to_async(self._semantic)(text, framework_ids)
+        return self._fuse(fts, semantic, scoped=bool(framework_ids), keep=keep)
@@ -0,0 +1,199 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from django.conf import settings
+
+from audit_api.models import Control, ControlEmbedding
+from audit_api.services.control_catalog_service import ControlCatalogService, control_hash
+from audit_api.services.embedding_service import EmbeddingService
+
+logger = logging.getLogger(__name__)
+
+
+def control_hash_of(control: Control) -> str:
+    return control_hash(control.reference, control.title, control.description)
+
+
+def control_text(control: Control) -> str:
+    return " ".join(part for part in (control.reference, control.title, control.description or "") if part)
+
+
+@dataclass
+class ControlVectorIndex:
+    """
+    Row-normalized control vectors for one model and catalog version. An
+    incomplete index (some control has no up-to-date embedding) is empty, so
+    retrieval stays FTS-only until the embeddings are synced.
+    """
+
+    version: str
+    controls: List[Control]
+    matrix: np.ndarray  # (controls, dims) float32, unit rows
+    framework_ids: np.ndarray  # framework_id per row, for scoped searches
+    complete: bool = True
+    loaded_at: float = field(default_factory=time.monotonic)
+
+    def search(
+        self,
+        vector: Sequence[float],
+        *,
+        k: int,
+        min_similarity: float,
+        framework_ids: Optional[Sequence] = None,
+    ) -> List[Tuple[Control, float]]:
+        """Top `k` controls by cosine similarity (top `k` per framework when scoped)."""
+        if not self.controls:
+            return []
+        query = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(query))
+        if norm == 0.0:
+            return []
+        scores = self.matrix @ (query / norm)
+
+        if framework_ids:
+            groups = [np.flatnonzero(self.framework_ids == f) for f in {str(f) for f in framework_ids}]
+        else:
+            groups = [np.arange(len(self.controls))]
+
+        out: List[Tuple[Control, float]] = []
+        for rows in groups:
+            rows = rows[scores[rows] >= min_similarity]
+            if len(rows) > k:
+                rows = rows[np.argpartition(-scores[rows], k - 1)[:k]]
+            out.extend((self.controls[i], float(scores[i])) for i in rows)
+        out.sort(key=lambda pair: -pair[1])
+        return out
+
+
+_indexes: Dict[str, ControlVectorIndex] = {}
+_lock = threading.Lock()
+_sync_requested: Set[Tuple[str, str]] = set()  # (model, version) pairs this process already enqueued
+_sync_lock = threading.Lock()  # separate: _request_sync runs while index() holds _lock
+
+
+class ControlVectorService:
+    """
+    Keeps every control embedded for the serving model, in `control_embeddings`
+    and as an in-process NumPy matrix, so semantic candidate retrieval is one
+    matrix-vector product instead of a database scan.
+
+    The matrix is rebuilt when the control catalog version changes. Loading
+    never embeds: embeddings are written by `sync()` (seed_soc2_controls,
+    sync_control_embeddings or the job enqueued on a load that finds controls
+    missing). Until every control has an up-to-date row, the index is empty,
+    so retrieval is FTS-only, and it is re-read every
+    CONTROL_CATALOG_VERSION_TTL_SECONDS until the sync lands.
+    """
+
+    def __init__(self, embedding_service: Optional[EmbeddingService] = None, *, catalog=None) -> None:
+        self.embedding = embedding_service or EmbeddingService()
+        self.catalog = catalog or ControlCatalogService()
+
+    def sync(self) -> Dict[str, int]:
+        """Embed new or changed controls and delete stale rows for the model."""
+        model_name = self.embedding.model_name
+        controls = list(Control.objects.order_by("id"))
+        stored = dict(
+            ControlEmbedding.objects.filter(model_name=model_name).values_list("control_id", "content_hash")
+        )
+        pending = [c for c in controls if stored.get(c.id) != control_hash_of(c)]
+        if pending:
+            vectors = self.embedding.embed_batch([control_text(c) for c in pending])
+            ControlEmbedding.objects.bulk_create(
+                [
+                    ControlEmbedding(
+                        control=c,
+                        model_name=model_name,
+                        content_hash=control_hash_of(c),
+                        vector=vector,
+                    )
+                    for c, vector in zip(pending, vectors)
+                ],
+                update_conflicts=True,
+                unique_fields=["control", "model_name"],
+                update_fields=["content_hash", "vector", "updated_at"],
+            )
+        removed, _ = (
+            ControlEmbedding.objects.filter(model_name=model_name)
+            .exclude(control_id__in=[c.id for c in controls])
+            .delete()
+        )
+        return {"controls": len(controls), "embedded": len(pending), "removed": removed}
+
+    def load(self, version: str) -> ControlVectorIndex:
+        model_name = self.embedding.model_name
+        rows = list(
+            ControlEmbedding.objects.filter(model_name=model_name).select_related("control").order_by("control_id")
+        )
+        current = [row for row in rows if row.content_hash == control_hash_of(row.control)]
+        complete = len(current) == Control.objects.count()
+        if not complete:
+            self._request_sync(model_name, version)
+            current = []
+        controls = [row.control for row in current]
+        if current:
+            matrix = np.asarray([list(row.vector) for row in current], dtype=np.float32)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix /= np.where(norms == 0.0, 1.0, norms)
+        else:
+            matrix = np.zeros((0, self.embedding.model_dim), dtype=np.float32)
+        framework_ids = np.asarray([str(c.framework_id) for c in controls], dtype=object)
+        return ControlVectorIndex(
+            version=version, controls=controls, matrix=matrix, framework_ids=framework_ids, complete=complete
+        )
+
+    @staticmethod
+    def _request_sync(model_name: str, version: str) -> None:
+        """Enqueue one background sync per model and catalog version per process."""
+        with _sync_lock:
+            if (model_name, version) in _sync_requested:
+                return
+            _sync_requested.add((model_name, version))
+        from audit_api.tasks import enqueue_control_embedding_sync
+
+        try:
+            enqueue_control_embedding_sync(model_name)
+        except Exception:
+            logger.warning("Could not enqueue control embedding sync for %s", model_name, exc_info=True)
+
+    @staticmethod
+    def _fresh(index: Optional[ControlVectorIndex], version: str) -> bool:
+        if index is None or index.version != version:
+            return False
+        return index.complete or time.monotonic() - index.loaded_at < settings.CONTROL_CATALOG_VERSION_TTL_SECONDS
+
+    def index(self) -> ControlVectorIndex:
+        """Process-wide index for the serving model at the current catalog version."""
+        version = self.catalog.current_version()
+        model_name = self.embedding.model_name
+        current = _indexes.get(model_name)
+        if self._fresh(current, version):
+            return current
+        with _lock:
+            current = _indexes.get(model_name)
+            if not self._fresh(current, version):
+                current = _indexes[model_name] = self.load(version)
+        return current
+
+    def similar(
+        self,
+        text: str,
+        *,
+        k: int,
+        min_similarity: float,
+        framework_ids: Optional[Sequence] = None,
+    ) -> List[Tuple[Control, float]]:
+        return self.index().search(
+            self.embedding.embed_vector(text), k=k, min_similarity=min_similarity, framework_ids=framework_ids
+        )
+
+
+def clear_control_indexes() -> None:
+    with _lock:
+        _indexes.clear()
+    with _sync_lock:
+        _sync_requested.clear()
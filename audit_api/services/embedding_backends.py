@@ -0,0 +1,135 @@
+import hashlib
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+from audit_api.models import ModelRegistry
+
+DEFAULT_EMBEDDING_MODEL = {"name": "hash-embed-128", "provider": "local", "version": "1.0", "dims": 128}
+
+
+class EmbeddingBackend:
+    """
+    One embedding model. Subclasses implement `embed`; instances are built from
+    a ModelRegistry row (model_type="embedding") via EMBEDDING_BACKENDS, keyed
+    by the row's provider.
+    """
+
+    def __init__(self, *, name: str, version: str, provider: str, dims: int, metadata: Optional[dict] = None):
+        self.name = name
+        self.version = version
+        self.provider = provider
+        self.dims = dims
+        self.metadata = metadata or {}
+
+    def embed(self, text: str) -> List[float]:
+        raise NotImplementedError
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Override for providers with a batch endpoint; one request per batch."""
+        return [self.embed(text) for text in texts]
+
+    def describe(self) -> Dict[str, Any]:
+        """Shape stored in pipeline run details."""
+        return {"name": self.name, "provider": self.provider, "version": self.version, "dims": self.dims}
+
+    def spec(self) -> Tuple[str, Dict[str, Any]]:
+        """Picklable (class path, kwargs) for rebuilding this backend in a worker process."""
+        cls = type(self)
+        return f"{cls.__module__}.{cls.__qualname__}", {
+            "name": self.name,
+            "version": self.version,
+            "provider": self.provider,
+            "dims": self.dims,
+            "metadata": self.metadata,
+        }
+
+
+class HashEmbeddingBackend(EmbeddingBackend):
+    """Deterministic, local sha256 pseudo-embedding (any dimension)."""
+
+    def embed(self, text: str) -> List[float]:
+        text = (text or "").strip()
+        if not text:
+            return [0.0] * self.dims
+
+        # Hash-based pseudo-embedding (repeat hash to fill dim)
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        floats: List[float] = []
+        while len(floats) < self.dims:
+            for b in digest:
+                floats.append((b / 255.0) * 2 - 1)  # scale to [-1, 1]
+                if len(floats) == self.dims:
+                    break
+            digest = hashlib.sha256(digest).digest()
+
+        # L2 normalize so pgvector distances are meaningful
+        norm = sum(x * x for x in floats) ** 0.5 or 1.0
+        return [x / norm for x in floats]
+
+
+_backends: Dict[str, EmbeddingBackend] = {}
+_lock = threading.Lock()
+
+
+def _build(name: str) -> EmbeddingBackend:
+    entry = (
+        ModelRegistry.objects.filter(model_type="embedding", name=name)
+        .order_by("-created_at")
+        .first()
+    )
+    if entry is None:
+        if name != DEFAULT_EMBEDDING_MODEL["name"]:
+            raise ImproperlyConfigured(f"Embedding model {name!r} is not in the model registry.")
+        spec = DEFAULT_EMBEDDING_MODEL
+        provider, version, dims, metadata = spec["provider"], spec["version"], spec["dims"], None
+    else:
+        provider, version, dims, metadata = entry.provider, entry.version, entry.embedding_dims, entry.metadata
+        if not dims:
+            raise ImproperlyConfigured(f"Embedding model {name!r} has no embedding_dims in the registry.")
+
+    path = settings.EMBEDDING_BACKENDS.get(provider)
+    if not path:
+        raise ImproperlyConfigured(f"No EMBEDDING_BACKENDS entry for provider {provider!r}.")
+    return import_string(path)(name=name, version=version, provider=provider, dims=dims, metadata=metadata)
+
+
+def resolve_embedding_backend(name: Optional[str] = None) -> EmbeddingBackend:
+    """
+    Backend for `name` (default: EMBEDDING_MODEL), resolved from ModelRegistry
+    once per process. Several models can be resolved side by side, e.g. the
+    serving model and one being backfilled.
+    """
+    name = name or settings.EMBEDDING_MODEL
+    backend = _backends.get(name)
+    if backend is None:
+        with _lock:
+            backend = _backends.get(name)
+            if backend is None:
+                backend = _backends[name] = _build(name)
+    return backend
+
+
+def backend_from_spec(spec: Tuple[str, Dict[str, Any]]) -> EmbeddingBackend:
+    """
+    Backend rebuilt from EmbeddingBackend.spec(), cached like
+    resolve_embedding_backend but without the ModelRegistry lookup, so worker
+    processes never query the database.
+    """
+    path, kwargs = spec
+    name = kwargs["name"]
+    backend = _backends.get(name)
+    if backend is None:
+        with _lock:
+            backend = _backends.get(name)
+            if backend is None:
+                backend = _backends[name] = import_string(path)(**kwargs)
+    return backend
+
+
+def clear_backend_cache() -> None:
+    with _lock:
+        _backends.clear()
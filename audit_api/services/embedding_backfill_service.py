@@ -0,0 +1,225 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from audit_api.models import EmbeddingBackfillCursor, Evidence, EvidenceEmbedding
+from audit_api.services.bulk_preprocessing_service import BulkPreprocessingService
+from audit_api.services.embedding_service import EmbeddingService
+from audit_api.services.preprocessing_service import EvidencePreprocessingService
+from audit_api.services.process_pool import WorkerPool
+from audit_api.services.vector_storage_service import quantized_columns
+
+
+class RateLimiter:
+    """Thread-safe limit on embedding backend calls per second (0 disables it)."""
+
+    def __init__(self, per_second: float) -> None:
+        self.interval = 1.0 / per_second if per_second > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class EmbeddingBackfillService:
+    """
+    Recomputes evidence embeddings for one model without re-running
+    classification.
+
+    Each batch reads the next `batch_size` Evidence rows after the cursor (pk
+    order), builds the classifier's text, embeds it in `sub_batch_size`
+    backend calls spread over `workers` threads (rate limited), then upserts
+    evidence_embeddings with INSERT ... ON CONFLICT and advances the cursor in
+    the same transaction. Worker threads never touch the database.
+
+    With `processes > 1`, text building, hashing and embedding run in a pool
+    of worker processes instead (BulkPreprocessingService), which suits local
+    CPU-bound backends; `run` keeps the same pool for every batch.
+    """
+
+    def __init__(
+        self,
+        *,
+        model_name: Optional[str] = None,
+        batch_size: int = 200,
+        sub_batch_size: int = 32,
+        workers: int = 4,
+        rate_limit: float = 0.0,
+        processes: int = 0,
+    ) -> None:
+        self.embedding = EmbeddingService(model_name=model_name)
+        self.preprocessing = EvidencePreprocessingService()
+        self.batch_size = batch_size
+        self.sub_batch_size = max(1, sub_batch_size)
+        self.workers = max(1, workers)
+        self.limiter = RateLimiter(rate_limit)
+        self.processes = processes
+
+    @property
+    def model_name(self) -> str:
+        return self.embedding.model_name
+
+    # --- cursor ----------------------------------------------------------
+
+    def get_cursor(self, *, reset: bool = False, only_missing: bool = False, include_chunks: bool = False):
+        cursor, created = EmbeddingBackfillCursor.objects.get_or_create(
+            model_name=self.model_name,
+            defaults={"only_missing": only_missing, "include_chunks": include_chunks},
+        )
+        if not (reset or created):
+            dropped = [
+                flag
+                for flag, requested, stored in (
+                    ("--only-missing", only_missing, cursor.only_missing),
+                    ("--chunks", include_chunks, cursor.include_chunks),
+                )
+                if requested and not stored
+            ]
+            if dropped:
+                raise ValueError(
+                    f"The existing backfill for {self.model_name} was started without {' and '.join(dropped)}; "
+                    "pass --reset to start over with the new options."
+                )
+        if reset and not created:
+            cursor.last_evidence_id = None
+            cursor.processed_count = 0
+            cursor.embedded_count = 0
+            cursor.last_error = None
+            cursor.finished_at = None
+            cursor.only_missing = only_missing
+            cursor.include_chunks = include_chunks
+            cursor.status = "running"
+            cursor.save()
+        elif cursor.status in {"paused", "failed"}:
+            cursor.status = "running"
+            cursor.save(update_fields=["status", "updated_at"])
+        return cursor
+
+    def pause(self) -> bool:
+        return bool(
+            EmbeddingBackfillCursor.objects.filter(model_name=self.model_name, status="running").update(
+                status="paused", updated_at=timezone.now()
+            )
+        )
+
+    # --- batches ---------------------------------------------------------
+
+    def _pending(self, cursor: EmbeddingBackfillCursor):
+        qs = Evidence.objects.order_by("id").only(
+            "id", "title", "description", "evidence_type_id", "source_type_id", "extracted_text"
+        )
+        if cursor.last_evidence_id:
+            qs = qs.filter(id__gt=cursor.last_evidence_id)
+        return qs
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        def call(chunk: List[str]) -> List[List[float]]:
+            self.limiter.wait()
+            return self.embedding.embed_batch(chunk, durable=False)
+
+        parts = [texts[i : i + self.sub_batch_size] for i in range(0, len(texts), self.sub_batch_size)]
+        if self.workers == 1 or len(parts) == 1:
+            results = [call(part) for part in parts]
+        else:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                results = list(pool.map(call, parts))
+        return [vector for part in results for vector in part]
+
+    def _prepare(
+        self, targets: List[Evidence], *, pool: WorkerPool, with_text: bool
+    ) -> List[Tuple[str, str, List[float]]]:
+        """(text, content hash, vector) per target; text is only kept when needed for chunks."""
+        if self.processes > 1:
+            bulk = BulkPreprocessingService(
+                self.embedding.backend, pool, sub_batch_size=self.sub_batch_size, before_task=self.limiter.wait
+            )
+            return [(r.text, r.content_hash, r.vector_list()) for r in bulk.preprocess(targets, with_text=with_text)]
+        texts = [self.preprocessing.build_classification_text(e)[0] for e in targets]
+        vectors = self._embed(texts) if texts else []
+        return [(text, self.preprocessing.content_hash(text), vector) for text, vector in zip(texts, vectors)]
+
+    def run_batch(self, cursor: EmbeddingBackfillCursor, *, pool: Optional[WorkerPool] = None) -> int:
+        """Process one batch; returns the number of evidence rows scanned (0 = done)."""
+        if pool is None:
+            with WorkerPool(self.processes) as pool:
+                return self.run_batch(cursor, pool=pool)
+
+        batch = list(self._pending(cursor)[: self.batch_size])
+        if not batch:
+            cursor.status = "completed"
+            cursor.finished_at = timezone.now()
+            cursor.save(update_fields=["status", "finished_at", "updated_at"])
+            return 0
+
+        targets = batch
+        if cursor.only_missing:
+            has_embedding = EvidenceEmbedding.objects.filter(evidence_id=OuterRef("pk"), model_name=self.model_name)
+            missing = set(
+                Evidence.objects.filter(id__in=[e.id for e in batch])
+                .annotate(has_embedding=Exists(has_embedding))
+                .filter(has_embedding=False)
+                .values_list("id", flat=True)
+            )
+            targets = [e for e in batch if e.id in missing]
+
+        prepared = self._prepare(targets, pool=pool, with_text=cursor.include_chunks)
+        rows = [
+            EvidenceEmbedding(
+                evidence=evidence,
+                model_name=self.model_name,
+                content_hash=content_hash,
+                vector=vector,
+                **quantized_columns(vector),
+            )
+            for evidence, (_text, content_hash, vector) in zip(targets, prepared)
+        ]
+
+        with transaction.atomic():
+            if rows:
+                EvidenceEmbedding.objects.bulk_create(
+                    rows,
+                    update_conflicts=True,
+                    unique_fields=["evidence", "model_name", "content_hash"],
+                    update_fields=["vector", "vector_half", "vector_bits", "updated_at"],
+                )
+            if cursor.include_chunks:
+                for evidence, (text, _hash, _vector) in zip(targets, prepared):
+                    self.embedding.upsert_chunk_embeddings(evidence=evidence, text=text)
+            cursor.last_evidence_id = batch[-1].id
+            cursor.processed_count += len(batch)
+            cursor.embedded_count += len(rows)
+            cursor.save(update_fields=["last_evidence_id", "processed_count", "embedded_count", "updated_at"])
+        return len(batch)
+
+    def run(self, cursor: EmbeddingBackfillCursor, *, max_batches: Optional[int] = None) -> Dict[str, int]:
+        batches = scanned = 0
+        with WorkerPool(self.processes) as pool:
+            while max_batches is None or batches < max_batches:
+                cursor.refresh_from_db(fields=["status"])
+                if cursor.status != "running":
+                    break
+                try:
+                    count = self.run_batch(cursor, pool=pool)
+                except Exception as exc:
+                    cursor.status = "failed"
+                    cursor.last_error = str(exc)
+                    cursor.save(update_fields=["status", "last_error", "updated_at"])
+                    raise
+                if not count:
+                    break
+                batches += 1
+                scanned += count
+        return {"batches": batches, "scanned": scanned}
@@ -0,0 +1,176 @@
+import hashlib
+import logging
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Callable, List, Optional
+
+from django.conf import settings
+
+from audit_api.models import EvidenceEmbedding
+from audit_api.services.metrics_service import record_memo_lookup
+
+logger = logging.getLogger(__name__)
+
+
+def text_hash(text: str) -> str:
+    """Same hash as EvidencePreprocessingService.content_hash, so evidence_embeddings rows double as memo entries."""
+    return hashlib.sha256((text or "").strip().encode("utf-8")).hexdigest()
+
+
+class EmbeddingMemo:
+    """
+    Memoizes embeddings by (model_name, sha256 of text), checked in order:
+
+    1. an in-process LRU (`EMBEDDING_MEMO_SIZE` entries, shared by the process),
+    2. Redis when `EMBEDDING_MEMO_REDIS_URL` is set (shared across workers,
+       entries expire after `EMBEDDING_MEMO_REDIS_TTL` seconds),
+    3. `evidence_embeddings`, the durable store written by upsert_embedding.
+
+    Redis errors are logged and treated as a miss; the memo never fails an
+    embedding call.
+    """
+
+    KEY_PREFIX = "auditmind:embedding"
+
+    def __init__(self, *, max_size: Optional[int] = None, redis_url: Optional[str] = None) -> None:
+        self.max_size = settings.EMBEDDING_MEMO_SIZE if max_size is None else max_size
+        self._lru: "OrderedDict[tuple, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = None
+        redis_url = settings.EMBEDDING_MEMO_REDIS_URL if redis_url is None else redis_url
+        if redis_url:
+            import redis
+
+            self._redis = redis.Redis.from_url(redis_url)
+
+    # --- tiers -----------------------------------------------------------
+
+    def _local_get(self, key: tuple) -> Optional[List[float]]:
+        with self._lock:
+            vector = self._lru.get(key)
+            if vector is not None:
+                self._lru.move_to_end(key)
+            return vector
+
+    def _local_put(self, key: tuple, vector: List[float]) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._lru[key] = vector
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_size:
+                self._lru.popitem(last=False)
+
+    def _redis_key(self, key: tuple) -> str:
+        return f"{self.KEY_PREFIX}:{key[0]}:{key[1]}"
+
+    def _redis_get(self, key: tuple) -> Optional[List[float]]:
+        if self._redis is None:
+            return None
+        try:
+            raw = self._redis.get(self._redis_key(key))
+        except Exception:
+            logger.warning("Embedding memo Redis read failed", exc_info=True)
+            return None
+        return array("d", raw).tolist() if raw else None
+
+    def _redis_put(self, key: tuple, vector: List[float]) -> None:
+        if self._redis is None:
+            return
+        try:
+            self._redis.set(self._redis_key(key), array("d", vector).tobytes(), ex=settings.EMBEDDING_MEMO_REDIS_TTL)
+        except Exception:
+            logger.warning("Embedding memo Redis write failed", exc_info=True)
+
+    @staticmethod
+    def _db_get(key: tuple) -> Optional[List[float]]:
+        vector = (
+            EvidenceEmbedding.objects.filter(model_name=key[0], content_hash=key[1])
+            .values_list("vector", flat=True)
+            .first()
+        )
+        return list(vector) if vector is not None else None
+
+    # --- public ----------------------------------------------------------
+
+    def get(self, model_name: str, content_hash: str, *, durable: bool = True) -> Optional[List[float]]:
+        """`durable=False` skips the evidence_embeddings tier (e.g. for chunk texts, which never live there)."""
+        key = (model_name, content_hash)
+        vector = self._local_get(key)
+        if vector is not None:
+            record_memo_lookup(tier="local")
+            return vector
+
+        vector = self._redis_get(key)
+        if vector is not None:
+            record_memo_lookup(tier="redis")
+            self._local_put(key, vector)
+            return vector
+
+        vector = self._db_get(key) if durable else None
+        if vector is not None:
+            record_memo_lookup(tier="db")
+            self._local_put(key, vector)
+            self._redis_put(key, vector)
+            return vector
+
+        record_memo_lookup(tier="miss")
+        return None
+
+    def put(self, model_name: str, content_hash: str, vector: List[float]) -> None:
+        key = (model_name, content_hash)
+        self._local_put(key, vector)
+        self._redis_put(key, vector)
+
+    def get_or_compute(
+        self,
+        model_name: str,
+        text: str,
+        compute: Callable[[str], List[float]],
+        *,
+        durable: bool = True,
+    ) -> List[float]:
+        content_hash = text_hash(text)
+        vector = self.get(model_name, content_hash, durable=durable)
+        if vector is None:
+            vector = compute(text)
+            self.put(model_name, content_hash, vector)
+        return vector
+
+    def get_or_compute_many(
+        self,
+        model_name: str,
+        texts: List[str],
+        compute_many: Callable[[List[str]], List[List[float]]],
+        *,
+        durable: bool = True,
+    ) -> List[List[float]]:
+        """Batch form of get_or_compute: one `compute_many` call for all misses."""
+        hashes = [text_hash(text) for text in texts]
+        vectors: List[Optional[List[float]]] = [self.get(model_name, h, durable=durable) for h in hashes]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            computed = compute_many([texts[i] for i in missing])
+            for i, vector in zip(missing, computed):
+                vectors[i] = vector
+                self.put(model_name, hashes[i], vector)
+        return vectors  # type: ignore[return-value]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
+
+
+_default_memo: Optional[EmbeddingMemo] = None
+_default_lock = threading.Lock()
+
+
+def get_embedding_memo() -> EmbeddingMemo:
+    """Process-wide memo, so the LRU is shared by every EmbeddingService instance."""
+    global _default_memo
+    if _default_memo is None:
+        with _default_lock:
+            if _default_memo is None:
+                _default_memo = EmbeddingMemo()
+    return _default_memo
@@ -1,37 +1,63 @@
 import hashlib
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
-from audit_api.models import Evidence, EvidenceEmbedding
+from django.db import transaction
+
+from audit_api.models import Evidence, EvidenceChunkEmbedding, EvidenceEmbedding
+from audit_api.services.chunking_service import TextChunk, TextChunkingService
+from audit_api.services.embedding_backends import resolve_embedding_backend
+from audit_api.services.embedding_memo_service import EmbeddingMemo, get_embedding_memo
+from audit_api.services.vector_storage_service import quantized_columns
 
 
 class EmbeddingService:
     """
-    Deterministic, local embedding stub.
-    Replace `embed_vector` with a real embedding provider (OpenAI, Cohere, etc.)
-    but keep the vector length stable with the model_dim constant.
+    Embeds text with the model resolved from ModelRegistry (EMBEDDING_MODEL by
+    default; see embedding_backends). Real providers plug in as
+    EmbeddingBackend subclasses; `embed_vector` goes through the EmbeddingMemo
+    first. Every stored row carries `model_name`, so several models can
+    coexist in the same tables.
     """
 
-    model_name = "hash-embed-128"
-    model_dim = 128
+    def __init__(
+        self,
+        chunker: TextChunkingService | None = None,
+        memo: EmbeddingMemo | None = None,
+        *,
+        model_name: str | None = None,
+    ):
+        self.backend = resolve_embedding_backend(model_name)
+        self.model_name = self.backend.name
+        self.model_dim = self.backend.dims
+        self.chunker = chunker or TextChunkingService()
+        self.memo = memo or get_embedding_memo()
 
-    def embed_vector(self, text: str) -> List[float]:
-        text = (text or "").strip()
-        if not text:
+    def embed_vector(self, text: str, *, durable: bool = True) -> List[float]:
+        """Pass durable=False when evidence_embeddings was just checked for this text's hash."""
+        if not (text or "").strip():
             return [0.0] * self.model_dim
+        return self.memo.get_or_compute(self.model_name, text, self.compute_vector, durable=durable)
 
-        # Hash-based pseudo-embedding (repeat hash to fill dim)
-        digest = hashlib.sha256(text.encode("utf-8")).digest()
-        floats: List[float] = []
-        while len(floats) < self.model_dim:
-            for b in digest:
-                floats.append((b / 255.0) * 2 - 1)  # scale to [-1, 1]
-                if len(floats) == self.model_dim:
-                    break
-            digest = hashlib.sha256(digest).digest()
+    def compute_vector(self, text: str) -> List[float]:
+        return self.backend.embed(text)
 
-        # L2 normalize so pgvector distances are meaningful
-        norm = sum(x * x for x in floats) ** 0.5 or 1.0
-        return [x / norm for x in floats]
+    def embed_batch(self, texts: List[str], *, durable: bool = True) -> List[List[float]]:
+        """
+        Embed many texts with one backend batch call for the memo misses.
+        Pass durable=False from worker threads: the durable tier queries the DB.
+        """
+        vectors: List[List[float]] = [[0.0] * self.model_dim for _ in texts]
+        indexes = [i for i, text in enumerate(texts) if (text or "").strip()]
+        if indexes:
+            computed = self.memo.get_or_compute_many(
+                self.model_name,
+                [texts[i] for i in indexes],
+                self.backend.embed_batch,
+                durable=durable,
+            )
+            for i, vector in zip(indexes, computed):
+                vectors[i] = vector
+        return vectors
 
     def upsert_embedding(
         self,
@@ -39,13 +65,15 @@ class EmbeddingService:
         evidence: Evidence,
         text: str,
         content_hash: str,
+        vector: Optional[List[float]] = None,
     ) -> EvidenceEmbedding:
-        vector = self.embed_vector(text)
+        if vector is None:
+            vector = self.embed_vector(text)
         embedding, _ = EvidenceEmbedding.objects.update_or_create(
             evidence=evidence,
             model_name=self.model_name,
             content_hash=content_hash,
-            defaults={"vector": vector},
+            defaults={"vector": vector, **quantized_columns(vector)},
         )
         return embedding
 
@@ -53,3 +81,57 @@ class EmbeddingService:
         text = (text or "").strip()
         content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
         return self.embed_vector(text), content_hash
+
+    def chunk_vectors(self, text: str) -> Tuple[List[Tuple[TextChunk, List[float]]], int]:
+        """
+        Chunk `text` and return (chunk, vector) pairs plus the number of chunks
+        that had to be embedded. Vectors already stored for the same chunk hash
+        (any evidence) are reused instead of recomputed.
+        """
+        chunks = self.chunker.chunk(text)
+        if not chunks:
+            return [], 0
+
+        known: Dict[str, List[float]] = {}
+        rows = (
+            EvidenceChunkEmbedding.objects.filter(
+                model_name=self.model_name,
+                chunk_hash__in={c.chunk_hash for c in chunks},
+            )
+            .order_by("chunk_hash", "-created_at")
+            .distinct("chunk_hash")
+            .values_list("chunk_hash", "vector")
+        )
+        for chunk_hash, vector in rows:
+            known[chunk_hash] = list(vector)
+
+        embedded = 0
+        pairs = []
+        for chunk in chunks:
+            vector = known.get(chunk.chunk_hash)
+            if vector is None:
+                vector = self.memo.get_or_compute(self.model_name, chunk.text, self.compute_vector, durable=False)
+                known[chunk.chunk_hash] = vector
+                embedded += 1
+            pairs.append((chunk, vector))
+        return pairs, embedded
+
+    @transaction.atomic
+    def upsert_chunk_embeddings(self, *, evidence: Evidence, text: str) -> Dict[str, int]:
+        pairs, embedded = self.chunk_vectors(text)
+        EvidenceChunkEmbedding.objects.filter(evidence=evidence, model_name=self.model_name).delete()
+        EvidenceChunkEmbedding.objects.bulk_create(
+            [
+                EvidenceChunkEmbedding(
+                    evidence=evidence,
+                    model_name=self.model_name,
+                    chunk_index=chunk.index,
+                    chunk_hash=chunk.chunk_hash,
+                    char_start=chunk.start,
+                    char_end=chunk.end,
+                    vector=vector,
+                )
+                for chunk, vector in pairs
+            ]
+        )
+        return {"chunks": len(pairs), "embedded": embedded, "reused": len(pairs) - embedded}
@@ -1,11 +1,12 @@
 # audit_api/services/evidence_service.py
 
+import json
 from typing import Iterable, Optional
 from uuid import UUID
 
 from django.core.files.uploadedfile import UploadedFile
 
-from audit_api.models import Evidence, Organization
+from audit_api.models import Evidence, EvidenceControlMatch, Organization
 from audit_api.services.storage_service import EvidenceStorageService
 from audit_api.services.preprocessing_service import EvidencePreprocessingService
 
@@ -44,24 +45,39 @@ class EvidenceService:
             status="uploaded",
         )
 
+        raw_text, raw_json = self._normalize_raw(payload.get("raw_text"), payload.get("raw_json"))
         storage_uri, computed_size = self.storage.write_raw_payload(
             org.id,
             evidence.id,
-            raw_text=payload.get("raw_text"),
-            raw_json=payload.get("raw_json"),
+            raw_text=raw_text,
+            raw_json=raw_json,
         )
 
         evidence.storage_path = storage_uri
         evidence.file_size = payload.get("file_size") or computed_size
 
-        evidence.extracted_text = self.preprocessing.extract_text(
-            raw_text=payload.get("raw_text"),
-            raw_json=payload.get("raw_json"),
-        )
+        evidence.extracted_text = self.preprocessing.extract_text(raw_text=raw_text, raw_json=raw_json)
 
         evidence.save(update_fields=["storage_path", "file_size", "extracted_text"])
         return evidence
 
+    @staticmethod
+    def _normalize_raw(raw_text, raw_json):
+        """
+        raw_json sent as a string is parsed, so raw.json holds the document
+        itself and re-extraction reads back what was classified. Strings that
+        are not a JSON object or array are kept as raw text.
+        """
+        if not isinstance(raw_json, str):
+            return raw_text, raw_json
+        try:
+            parsed = json.loads(raw_json)
+        except ValueError:
+            parsed = None
+        if isinstance(parsed, (dict, list)):
+            return raw_text, parsed
+        return raw_json, None
+
     def create_from_file(
         self,
         *,
@@ -105,12 +121,23 @@ class EvidenceService:
         evidence.save(update_fields=["storage_path", "file_size", "checksum", "extracted_text"])
         return evidence
 
-    def list_by_org(self, organization_id: UUID) -> Iterable[Evidence]:
-        return (
-            Evidence.objects
-            .filter(organization_id=organization_id)
-            .order_by("-created_at")
-        )
+    def list_by_org(
+        self,
+        organization_id: UUID,
+        *,
+        control: Optional[str] = None,
+        min_confidence: Optional[float] = None,
+    ) -> Iterable[Evidence]:
+        qs = Evidence.objects.filter(organization_id=organization_id)
+        if control or min_confidence is not None:
+            # Served by control_matches_lookup_idx (organization, control_reference, confidence).
+            matches = EvidenceControlMatch.objects.filter(organization_id=organization_id)
+            if control:
+                matches = matches.filter(control_reference=control)
+            if min_confidence is not None:
+                matches = matches.filter(confidence__gte=min_confidence)
+            qs = qs.filter(id__in=matches.values("evidence_id"))
+        return qs.order_by("-created_at")
 
     def get(self, evidence_id: UUID) -> Evidence:
         return Evidence.objects.get(pk=evidence_id)
@@ -0,0 +1,451 @@
+import csv
+import gzip
+import io
+import json
+import mimetypes
+import random
+import re
+import threading
+import zipfile
+from collections import Counter, deque
+from contextlib import contextmanager
+from typing import BinaryIO, Dict, Iterator, List, Optional, Sequence, TextIO
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from audit_api.services.json_flattener import JSONStreamError, flatten_events, iter_json_events, iter_object_events
+
+
+class ExtractionError(ValueError):
+    """The payload does not match the extractor's format; the registry falls back to plain text."""
+
+
+@contextmanager
+def _text(stream: BinaryIO) -> Iterator[io.TextIOWrapper]:
+    """utf-8 text view of `stream`; detached afterwards so the binary stream stays open."""
+    wrapper = io.TextIOWrapper(stream, encoding="utf-8", errors="ignore", newline="")
+    try:
+        yield wrapper
+    finally:
+        wrapper.detach()
+
+
+def _lines(text: TextIO) -> Iterator[str]:
+    for line in text:
+        line = line.rstrip("\r\n")
+        if line.strip():
+            yield line
+
+
+class _Output:
+    """Accumulates lines until `max_len` characters; `full` tells callers to stop reading."""
+
+    def __init__(self, max_len: int) -> None:
+        self.max_len = max_len
+        self.lines: List[str] = []
+        self.size = 0
+
+    @property
+    def full(self) -> bool:
+        return self.size >= self.max_len
+
+    def add(self, line: str) -> bool:
+        if not self.full:
+            self.lines.append(line)
+            self.size += len(line) + 1
+        return not self.full
+
+    def text(self) -> str:
+        return "\n".join(self.lines)[: self.max_len].strip()
+
+
+class _Sampler:
+    """
+    Head rows plus a reservoir sample of the rest, over at most `max_scan`
+    rows. Seeded, so the same input always gives the same sample (content
+    hashes stay stable).
+    """
+
+    def __init__(self, *, head: int, sample: int, max_scan: int) -> None:
+        self.head: List = []
+        self.reservoir: List = []
+        self.head_size = head
+        self.sample_size = sample
+        self.max_scan = max_scan
+        self.seen = 0
+        self.truncated = False
+        self._random = random.Random(0)
+
+    def offer(self, item) -> bool:
+        """Returns False once the scan limit is reached."""
+        if self.seen >= self.max_scan:
+            self.truncated = True
+            return False
+        index = self.seen
+        self.seen += 1
+        if index < self.head_size:
+            self.head.append((index, item))
+        elif len(self.reservoir) < self.sample_size:
+            self.reservoir.append((index, item))
+        else:
+            slot = self._random.randint(0, index - self.head_size)
+            if slot < self.sample_size:
+                self.reservoir[slot] = (index, item)
+        return True
+
+    def rows(self) -> List:
+        return self.head + sorted(self.reservoir, key=lambda pair: pair[0])
+
+    @property
+    def count_label(self) -> str:
+        return f"{self.seen}+ (scan limit)" if self.truncated else str(self.seen)
+
+
+class TextExtractor:
+    """
+    Turns an uploaded file into compact text for classification. Subclasses
+    declare the `extensions` and `mime_types` they handle and are registered
+    through EVIDENCE_EXTRACTORS; `extract` reads the stream incrementally and
+    returns at most `max_len` characters.
+    """
+
+    name = "text"
+    extensions: Sequence[str] = ()
+    mime_types: Sequence[str] = ()
+
+    def extract(self, stream: BinaryIO, *, filename: str, max_len: int, registry: "ExtractorRegistry") -> str:
+        raise NotImplementedError
+
+
+class PlainTextExtractor(TextExtractor):
+    """Fallback: decode the first `max_len` characters (utf-8, else latin-1)."""
+
+    name = "plain"
+    extensions = (".txt", ".md")
+    mime_types = ("text/plain", "text/markdown")
+
+    def extract(self, stream, *, filename, max_len, registry):
+        data = stream.read(max_len * 4)  # utf-8 is at most 4 bytes per character
+        try:
+            text = data.decode("utf-8")
+        except UnicodeDecodeError as exc:
+            if exc.start >= len(data) - 3:
+                # Only a multi-byte character cut by the read limit.
+                text = data[: exc.start].decode("utf-8")
+            else:
+                text = data.decode("latin-1", errors="ignore")
+        return text.strip()[:max_len]
+
+
+class JSONExtractor(TextExtractor):
+    """`path: value` lines in document order (see json_flattener)."""
+
+    name = "json"
+    extensions = (".json",)
+    mime_types = ("application/json",)
+
+    def extract(self, stream, *, filename, max_len, registry):
+        try:
+            with _text(stream) as text:
+                return flatten_events(iter_json_events(text, max_string=max_len), max_len=max_len).strip()
+        except JSONStreamError as exc:
+            raise ExtractionError(str(exc)) from None
+
+
+class NDJSONExtractor(TextExtractor):
+    """
+    Newline-delimited JSON (e.g. CloudTrail Lake or VPC flow log exports):
+    record count, how often each key path occurs, the most common short
+    values per key, then sampled records flattened.
+    """
+
+    name = "ndjson"
+    extensions = (".ndjson", ".jsonl")
+    mime_types = ("application/x-ndjson", "application/jsonl")
+
+    HEAD_RECORDS = 5
+    SAMPLE_RECORDS = 15
+    MAX_SCAN_RECORDS = 50_000
+    TOP_KEYS = 60
+    TOP_VALUES = 5
+    MAX_VALUE_CHARS = 64
+    MAX_KEYS = 5_000
+    MAX_DISTINCT_VALUES = 50  # per key, to bound memory on high-cardinality fields
+
+    @staticmethod
+    def _leaves(obj, prefix: str = ""):
+        if isinstance(obj, dict):
+            for key, value in obj.items():
+                yield from NDJSONExtractor._leaves(value, f"{prefix}.{key}" if prefix else str(key))
+        elif isinstance(obj, list):
+            for item in obj:
+                yield from NDJSONExtractor._leaves(item, f"{prefix}[]")
+        else:
+            yield prefix, obj
+
+    def extract(self, stream, *, filename, max_len, registry):
+        sampler = _Sampler(head=self.HEAD_RECORDS, sample=self.SAMPLE_RECORDS, max_scan=self.MAX_SCAN_RECORDS)
+        keys: Counter = Counter()
+        values: Dict[str, Counter] = {}
+        invalid = 0
+        with _text(stream) as text:
+            for line in _lines(text):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    invalid += 1
+                    if invalid > 10 and sampler.seen == 0:
+                        raise ExtractionError("Not newline-delimited JSON")
+                    continue
+                if not sampler.offer(record):
+                    break
+                for path, value in self._leaves(record):
+                    if path not in keys and len(keys) >= self.MAX_KEYS:
+                        continue
+                    keys[path] += 1
+                    if isinstance(value, str) and len(value) <= self.MAX_VALUE_CHARS:
+                        counter = values.setdefault(path, Counter())
+                        if value in counter or len(counter) < self.MAX_DISTINCT_VALUES:
+                            counter[value] += 1
+        if sampler.seen == 0:
+            raise ExtractionError("No JSON records")
+
+        out = _Output(max_len)
+        out.add(f"records: {sampler.count_label}" + (f" (invalid lines: {invalid})" if invalid else ""))
+        out.add("keys:")
+        for path, count in sorted(keys.items(), key=lambda kv: (-kv[1], kv[0]))[: self.TOP_KEYS]:
+            top = ""
+            counter = values.get(path)
+            if counter and len(counter) < self.MAX_DISTINCT_VALUES:  # skip ids and other unique values
+                common = [(v, n) for v, n in sorted(counter.items(), key=lambda kv: (-kv[1], kv[0])) if n > 1]
+                if common:
+                    top = " [" + ", ".join(f"{value} x{n}" for value, n in common[: self.TOP_VALUES]) + "]"
+            if not out.add(f"{path}: {count}{top}"):
+                break
+        for index, record in sampler.rows():
+            if out.full:
+                break
+            out.add(f"record {index}:")
+            out.add(flatten_events(iter_object_events(record), max_len=max(0, max_len - out.size)))
+        return out.text()
+
+
+class CSVExtractor(TextExtractor):
+    """Header, row count, then head and sampled rows as `column=value` pairs."""
+
+    name = "csv"
+    extensions = (".csv", ".tsv")
+    mime_types = ("text/csv", "text/tab-separated-values")
+
+    HEAD_ROWS = 10
+    SAMPLE_ROWS = 20
+    MAX_SCAN_ROWS = 200_000
+    MAX_CELL_CHARS = 200
+
+    def extract(self, stream, *, filename, max_len, registry):
+        sampler = _Sampler(head=self.HEAD_ROWS, sample=self.SAMPLE_ROWS, max_scan=self.MAX_SCAN_ROWS)
+        with _text(stream) as text:
+            preview = text.read(8192)
+            if filename.lower().endswith(".tsv"):
+                dialect = csv.excel_tab
+            else:
+                try:
+                    dialect = csv.Sniffer().sniff(preview, delimiters=",;\t|")
+                except csv.Error:
+                    dialect = csv.excel
+            reader = csv.reader(_chain(preview, text), dialect)
+            header = next(reader, None)
+            if not header:
+                raise ExtractionError("Empty CSV")
+            header = [h.strip() or f"column_{i + 1}" for i, h in enumerate(header)]
+            for row in reader:
+                if any(cell.strip() for cell in row) and not sampler.offer(row):
+                    break
+
+        out = _Output(max_len)
+        out.add("columns: " + ", ".join(header))
+        out.add(f"rows: {sampler.count_label}")
+        for index, row in sampler.rows():
+            cells = [
+                f"{header[i] if i < len(header) else f'column_{i + 1}'}={cell.strip()[: self.MAX_CELL_CHARS]}"
+                for i, cell in enumerate(row)
+                if cell.strip()
+            ]
+            if not out.add(f"row {index + 1}: " + "; ".join(cells)):
+                break
+        return out.text()
+
+
+def _chain(preview: str, rest: TextIO) -> Iterator[str]:
+    """Lines of `preview` followed by the rest of the stream, for csv.reader."""
+    buffered = io.StringIO(preview + rest.readline())
+    yield from buffered
+    yield from rest
+
+
+class LogExtractor(TextExtractor):
+    """
+    Plain logs: line count, the most frequent message shapes (digits and hex
+    ids masked), then head, sampled and tail lines.
+    """
+
+    name = "log"
+    extensions = (".log", ".out")
+    mime_types = ("text/x-log",)
+
+    HEAD_LINES = 20
+    SAMPLE_LINES = 40
+    TAIL_LINES = 10
+    MAX_SCAN_LINES = 500_000
+    TOP_PATTERNS = 15
+    MAX_PATTERNS = 2_000
+    MAX_LINE_CHARS = 500
+
+    _VARIABLE = re.compile(r"\b[0-9a-f]{8,}\b|(?<![a-z])\d+", re.IGNORECASE)
+
+    def extract(self, stream, *, filename, max_len, registry):
+        sampler = _Sampler(head=self.HEAD_LINES, sample=self.SAMPLE_LINES, max_scan=self.MAX_SCAN_LINES)
+        tail: deque = deque(maxlen=self.TAIL_LINES)
+        patterns: Counter = Counter()
+        with _text(stream) as text:
+            for line in _lines(text):
+                line = line[: self.MAX_LINE_CHARS]
+                if not sampler.offer(line):
+                    break
+                tail.append((sampler.seen - 1, line))
+                shape = self._VARIABLE.sub("#", line)
+                if shape in patterns or len(patterns) < self.MAX_PATTERNS:
+                    patterns[shape] += 1
+
+        out = _Output(max_len)
+        out.add(f"lines: {sampler.count_label}")
+        out.add("frequent patterns:")
+        for shape, count in patterns.most_common(self.TOP_PATTERNS):
+            if count > 1 and not out.add(f"{count} x {shape}"):
+                break
+        sampled = dict(sampler.rows())
+        for index, line in tail:
+            sampled.setdefault(index, line)
+        out.add("lines:")
+        for index in sorted(sampled):
+            if not out.add(sampled[index]):
+                break
+        return out.text()
+
+
+class GzipExtractor(TextExtractor):
+    """Decompresses on the fly and extracts the inner file by its name (`x.csv.gz` -> CSV)."""
+
+    name = "gzip"
+    extensions = (".gz", ".gzip")
+    mime_types = ("application/gzip", "application/x-gzip")
+
+    def extract(self, stream, *, filename, max_len, registry):
+        inner = re.sub(r"\.(gz|gzip)$", "", filename, flags=re.IGNORECASE)
+        try:
+            with gzip.GzipFile(fileobj=stream, mode="rb") as member:
+                return registry.extract(member, filename=inner, max_len=max_len)
+        except (OSError, EOFError) as exc:
+            raise ExtractionError(str(exc)) from None
+
+
+class ZipExtractor(TextExtractor):
+    """
+    Log bundles: each member is extracted by its own name, in archive order,
+    with the remaining budget split evenly over the remaining members.
+    """
+
+    name = "zip"
+    extensions = (".zip",)
+    mime_types = ("application/zip", "application/x-zip-compressed")
+
+    MAX_MEMBERS = 200
+    MIN_MEMBER_CHARS = 500
+
+    def extract(self, stream, *, filename, max_len, registry):
+        if not stream.seekable():
+            stream = io.BytesIO(stream.read())
+        try:
+            archive = zipfile.ZipFile(stream)
+        except zipfile.BadZipFile as exc:
+            raise ExtractionError(str(exc)) from None
+        with archive:
+            members = [m for m in archive.infolist() if not m.is_dir()][: self.MAX_MEMBERS]
+            out = _Output(max_len)
+            out.add(f"archive members: {len(members)}")
+            for position, member in enumerate(members):
+                remaining = max_len - out.size
+                if remaining <= 0:
+                    break
+                budget = max(self.MIN_MEMBER_CHARS, remaining // (len(members) - position))
+                with archive.open(member) as handle:
+                    text = registry.extract(handle, filename=member.filename, max_len=budget)
+                out.add(f"== {member.filename} ==")
+                out.add(text)
+            return out.text()
+
+
+class ExtractorRegistry:
+    """
+    Maps file extensions and MIME types to the extractors listed in
+    EVIDENCE_EXTRACTORS. The longest matching extension wins (`.csv.gz` is
+    gzip, then CSV inside); otherwise the guessed MIME type decides. Unknown
+    formats, and files an extractor rejects, fall back to plain text.
+    Archives recurse through the registry at most MAX_DEPTH levels deep.
+    """
+
+    MAX_DEPTH = 3
+
+    def __init__(self, extractors: Optional[Sequence[TextExtractor]] = None) -> None:
+        if extractors is None:
+            extractors = [import_string(path)() for path in settings.EVIDENCE_EXTRACTORS]
+        self.extractors = list(extractors)
+        self.fallback = PlainTextExtractor()
+        self._local = threading.local()
+
+    def resolve(self, filename: str) -> TextExtractor:
+        name = (filename or "").lower()
+        best, best_len = None, 0
+        for extractor in self.extractors:
+            for ext in extractor.extensions:
+                if name.endswith(ext) and len(ext) > best_len:
+                    best, best_len = extractor, len(ext)
+        if best is not None:
+            return best
+        mime, encoding = mimetypes.guess_type(name)
+        if encoding == "gzip":
+            mime = "application/gzip"
+        for extractor in self.extractors:
+            if mime and mime in extractor.mime_types:
+                return extractor
+        return self.fallback
+
+    def extract(self, stream: BinaryIO, *, filename: str, max_len: int) -> str:
+        depth = getattr(self._local, "depth", 0)
+        extractor = self.resolve(filename)
+        if depth >= self.MAX_DEPTH and extractor.name in ("gzip", "zip"):
+            return ""
+        self._local.depth = depth + 1
+        try:
+            return extractor.extract(stream, filename=filename, max_len=max_len, registry=self)[:max_len]
+        except ExtractionError:
+            if not stream.seekable():
+                return ""
+            stream.seek(0)
+            return self.fallback.extract(stream, filename=filename, max_len=max_len, registry=self)
+        finally:
+            self._local.depth = depth
+
+
+_registry: Optional[ExtractorRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_extractor_registry() -> ExtractorRegistry:
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ExtractorRegistry()
+    return _registry
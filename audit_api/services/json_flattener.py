@@ -0,0 +1,259 @@
+import json
+import re
+from typing import Any, Iterator, List, Optional, TextIO, Tuple
+
+Event = Tuple[str, Any]
+
+_WS = re.compile(r"[ \t\n\r]*")
+_NUMBER = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][-+]?\d+)?")
+_NUMBER_TAIL = re.compile(r"[-+0-9.eE]*")
+_LITERALS = {"true": "true", "false": "false", "null": "null"}
+_STRING_RUN = re.compile(r'[^"\\\x00-\x1f]*')  # characters that need no decoding
+_ESCAPE = re.compile(
+    r"\\u[dD][89abAB][0-9a-fA-F]{2}\\u[dD][c-fC-F][0-9a-fA-F]{2}"  # surrogate pair
+    r"|\\u[0-9a-fA-F]{4}"
+    r'|\\["\\/bfnrt]'
+)
+_MAX_ESCAPE = 12
+
+
+class JSONStreamError(ValueError):
+    """Raised when the stream is not valid JSON (up to the point it was read)."""
+
+
+class _Reader:
+    """Character buffer over a text stream; keeps only the unconsumed tail in memory."""
+
+    def __init__(self, stream: TextIO, chunk_size: int) -> None:
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.base = 0  # characters dropped from the front of buf
+        self.eof = False
+
+    @property
+    def offset(self) -> int:
+        return self.base + self.pos
+
+    def more(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.base += self.pos
+        self.buf = self.buf[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.more():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise JSONStreamError(f"Expected {char!r} at offset {self.offset}")
+        self.pos += 1
+
+    def string(self, limit: Optional[int] = None) -> str:
+        """
+        The string at pos (on its opening quote), scanned chunk by chunk: each
+        character is looked at once and only the first `limit` characters are
+        kept, so a huge value costs time linear in its length and no memory
+        beyond the buffer.
+        """
+        self.pos += 1
+        parts: List[str] = []
+        room = limit
+        while True:
+            end = _STRING_RUN.match(self.buf, self.pos).end()
+            if room is None or room > 0:
+                piece = self.buf[self.pos : end if room is None else min(end, self.pos + room)]
+                parts.append(piece)
+                room = None if room is None else room - len(piece)
+            self.pos = end
+            if end == len(self.buf):
+                if not self.more():
+                    raise JSONStreamError(f"Unterminated string at offset {self.offset}")
+                continue
+            char = self.buf[end]
+            if char == '"':
+                self.pos += 1
+                return "".join(parts)
+            if char != "\\":
+                raise JSONStreamError(f"Invalid control character at offset {self.offset}")
+            # An escape (or surrogate pair) may straddle the chunk boundary.
+            while len(self.buf) - self.pos < _MAX_ESCAPE and self.more():
+                pass
+            match = _ESCAPE.match(self.buf, self.pos)
+            if not match:
+                raise JSONStreamError(f"Invalid \\escape at offset {self.offset}")
+            if room is None or room > 0:
+                decoded = json.loads(f'"{match.group(0)}"')
+                parts.append(decoded if room is None else decoded[:room])
+                room = None if room is None else room - len(parts[-1])
+            self.pos = match.end()
+
+    def number(self) -> str:
+        # Read until the token is followed by a non-number character, so a
+        # chunk boundary cannot split it.
+        while _NUMBER_TAIL.match(self.buf, self.pos).end() == len(self.buf) and self.more():
+            pass
+        match = _NUMBER.match(self.buf, self.pos)
+        if not match:
+            raise JSONStreamError(f"Invalid number at offset {self.offset}")
+        self.pos = match.end()
+        return match.group(0)
+
+    def literal(self) -> str:
+        while len(self.buf) - self.pos < 5 and self.more():
+            pass
+        for word in _LITERALS:
+            if self.buf.startswith(word, self.pos):
+                self.pos += len(word)
+                return _LITERALS[word]
+        raise JSONStreamError(f"Unexpected character {self.buf[self.pos:self.pos + 1]!r} at offset {self.offset}")
+
+
+def iter_json_events(
+    stream: TextIO, *, chunk_size: int = 64 * 1024, max_string: Optional[int] = None
+) -> Iterator[Event]:
+    """
+    Incremental JSON parser yielding events in document order:
+    ("start_map"|"end_map"|"start_array"|"end_array", None), ("key", str),
+    ("string", str) and ("scalar", token) for numbers/true/false/null, with
+    the token text kept verbatim. Reads `chunk_size` characters at a time;
+    keys and strings are cut to `max_string` characters (the rest is still
+    validated, never kept).
+    """
+    reader = _Reader(stream, chunk_size)
+    stack: List[str] = []  # "map" / "array"
+
+    def value() -> Iterator[Event]:
+        char = reader.peek()
+        if char == "{":
+            reader.pos += 1
+            stack.append("map")
+            yield "start_map", None
+        elif char == "[":
+            reader.pos += 1
+            stack.append("array")
+            yield "start_array", None
+        elif char == '"':
+            yield "string", reader.string(max_string)
+        elif char == "-" or char.isdigit():
+            yield "scalar", reader.number()
+        elif char:
+            yield "scalar", reader.literal()
+        else:
+            raise JSONStreamError("Unexpected end of input")
+
+    def key() -> Iterator[Event]:
+        if reader.peek() != '"':
+            raise JSONStreamError(f"Expected object key at offset {reader.offset}")
+        yield "key", reader.string(max_string)
+        reader.expect(":")
+        yield from value()
+
+    yield from value()
+    first = True  # no element read yet in the innermost open container
+    while stack:
+        char = reader.peek()
+        closing = "}" if stack[-1] == "map" else "]"
+        if char == closing:
+            reader.pos += 1
+            yield ("end_map" if stack.pop() == "map" else "end_array"), None
+            first = False
+            continue
+        if not first:
+            reader.expect(",")
+        depth = len(stack)
+        yield from (key() if stack[-1] == "map" else value())
+        first = len(stack) > depth
+
+    if reader.peek():
+        raise JSONStreamError(f"Extra data at offset {reader.offset}")
+
+
+def iter_object_events(obj: Any) -> Iterator[Event]:
+    """The same events for an already-parsed object; non-JSON types are rendered with str()."""
+    if isinstance(obj, dict):
+        yield "start_map", None
+        for k, v in obj.items():
+            yield "key", str(k)
+            yield from iter_object_events(v)
+        yield "end_map", None
+    elif isinstance(obj, (list, tuple)):
+        yield "start_array", None
+        for item in obj:
+            yield from iter_object_events(item)
+        yield "end_array", None
+    elif isinstance(obj, str):
+        yield "string", obj
+    elif obj is None or isinstance(obj, bool):
+        yield "scalar", json.dumps(obj)
+    elif isinstance(obj, (int, float)):
+        yield "scalar", json.dumps(obj)
+    else:
+        yield "string", str(obj)
+
+
+def flatten_events(events: Iterator[Event], *, max_len: int) -> str:
+    """
+    One `path: value` line per leaf, e.g. `Records[0].eventName: AssumeRole`,
+    in document order; empty containers render as `{}` / `[]`. Stops pulling
+    events once `max_len` characters are produced, so work and memory are
+    bounded by the cap rather than the input.
+    """
+    lines: List[str] = []
+    size = 0
+    path: List[str] = []  # rendered path segments
+    kinds: List[str] = []  # container kind per open level
+    counts: List[int] = []  # children seen per open level
+    pending_key: Optional[str] = None
+
+    def child_segment() -> str:
+        nonlocal pending_key
+        if not kinds:
+            return ""
+        counts[-1] += 1
+        if kinds[-1] == "array":
+            return f"[{counts[-1] - 1}]"
+        segment, pending_key = pending_key, None
+        return f".{segment}" if any(path) else segment
+
+    def emit(segment: str, rendered: str) -> bool:
+        nonlocal size
+        name = "".join(path) + segment
+        line = f"{name}: {rendered}" if name else rendered
+        lines.append(line)
+        size += len(line) + 1
+        return size >= max_len
+
+    for event, payload in events:
+        if event == "key":
+            pending_key = payload
+            continue
+        if event in ("start_map", "start_array"):
+            path.append(child_segment())
+            kinds.append("map" if event == "start_map" else "array")
+            counts.append(0)
+            continue
+        if event in ("end_map", "end_array"):
+            kinds.pop()
+            empty = counts.pop() == 0
+            segment = path.pop()
+            if empty and emit(segment, "{}" if event == "end_map" else "[]"):
+                break
+            continue
+        rendered = payload.replace("\r", " ").replace("\n", " ") if event == "string" else payload
+        if emit(child_segment(), rendered):
+            break
+
+    return "\n".join(lines)[:max_len]
@@ -0,0 +1,204 @@
+import json
+import threading
+import time
+import urllib.request
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+
+@dataclass
+class ValidationRequest:
+    text: str
+    control_references: List[str]
+    confidence: float
+
+
+@dataclass
+class ValidationResult:
+    confidence: float
+    justification: str
+    provider: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency_ms: float = 0.0
+    fallback: bool = False
+    cached: bool = False
+    error: Optional[str] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    def as_snapshot(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["validated_confidence"] = data.pop("confidence")
+        return data
+
+
+class ValidationProvider:
+    """
+    Validates classifier output for a batch of requests in one call. Providers
+    return one result per request, in order, and raise on transport errors;
+    timeouts, retries and fallback are handled by LLMValidationService.
+    """
+
+    name = "base"
+    cacheable = True  # False for providers whose results cost nothing to recompute
+
+    def validate_batch(self, requests: List[ValidationRequest], *, timeout: float) -> List[ValidationResult]:
+        raise NotImplementedError
+
+
+class StubValidationProvider(ValidationProvider):
+    """No model call: keeps confidence as-is (the original placeholder behaviour)."""
+
+    name = "stub"
+    cacheable = False
+
+    def validate_batch(self, requests: List[ValidationRequest], *, timeout: float) -> List[ValidationResult]:
+        return [
+            ValidationResult(
+                confidence=r.confidence,
+                justification="LLM validation stub: no adjustment applied.",
+                provider=self.name,
+            )
+            for r in requests
+        ]
+
+
+class HttpValidationProvider(ValidationProvider):
+    """
+    JSON-over-HTTP provider (see run_llm_stub_server for the contract):
+
+        POST {"model": str, "requests": [{"text", "controls", "confidence"}]}
+        200  {"results": [{"confidence", "justification",
+                           "usage": {"prompt_tokens", "completion_tokens"}}]}
+    """
+
+    name = "http"
+
+    def __init__(self, *, url: Optional[str] = None, model: Optional[str] = None) -> None:
+        self.url = url or settings.LLM_VALIDATION_URL
+        if not self.url:
+            raise ImproperlyConfigured("LLM_VALIDATION_URL is required for the http validation provider.")
+        self.model = model or settings.LLM_VALIDATION_MODEL
+
+    def _body(self, requests: List[ValidationRequest]) -> bytes:
+        return json.dumps(
+            {
+                "model": self.model,
+                "requests": [
+                    {"text": r.text, "controls": list(r.control_references), "confidence": r.confidence}
+                    for r in requests
+                ],
+            }
+        ).encode("utf-8")
+
+    def validate_batch(self, requests: List[ValidationRequest], *, timeout: float) -> List[ValidationResult]:
+        http_request = urllib.request.Request(
+            self.url,
+            data=self._body(requests),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        started = time.perf_counter()
+        with urllib.request.urlopen(http_request, timeout=timeout) as response:
+            payload = json.loads(response.read().decode("utf-8"))
+        return self._results(requests, payload, (time.perf_counter() - started) * 1000)
+
+    def _results(
+        self, requests: List[ValidationRequest], payload: Dict[str, Any], latency_ms: float
+    ) -> List[ValidationResult]:
+        results = payload.get("results") or []
+        if len(results) != len(requests):
+            raise ValueError(f"Provider returned {len(results)} results for {len(requests)} requests")
+        out = []
+        for request, item in zip(requests, results):
+            usage = item.get("usage") or {}
+            out.append(
+                ValidationResult(
+                    confidence=float(item.get("confidence", request.confidence)),
+                    justification=str(item.get("justification") or ""),
+                    provider=self.name,
+                    prompt_tokens=int(usage.get("prompt_tokens") or 0),
+                    completion_tokens=int(usage.get("completion_tokens") or 0),
+                    latency_ms=round(latency_ms, 3),
+                    extra={"model": self.model, "batch_size": len(requests)},
+                )
+            )
+        return out
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures; while open every call
+    is short-circuited until `reset_seconds` pass, then one trial call is let
+    through (half-open) and its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, *, failure_threshold: int, reset_seconds: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_seconds:
+                return "half_open"
+            return "open"
+
+    def allow(self) -> bool:
+        return self.admit()[0]
+
+    def admit(self) -> Tuple[bool, bool]:
+        """(allowed, is the half-open trial); the trial's owner must report an outcome or release_trial()."""
+        with self._lock:
+            if self._opened_at is None:
+                return True, False
+            if time.monotonic() - self._opened_at < self.reset_seconds or self._trial_in_flight:
+                return False, False
+            self._trial_in_flight = True
+            return True, True
+
+    def release_trial(self) -> None:
+        """Give back the trial slot of a call that never reached the provider; the failure count is unchanged."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+def build_provider(name: Optional[str] = None) -> ValidationProvider:
+    name = name or settings.LLM_VALIDATION_PROVIDER
+    path = settings.LLM_VALIDATION_PROVIDERS.get(name)
+    if not path:
+        raise ImproperlyConfigured(f"No LLM_VALIDATION_PROVIDERS entry for {name!r}.")
+    return import_string(path)()
+
+
+def fallback_result(request: ValidationRequest, *, provider: str, reason: str) -> ValidationResult:
+    return ValidationResult(
+        confidence=request.confidence,
+        justification=f"LLM validation skipped ({reason}); unvalidated confidence kept.",
+        provider=provider,
+        fallback=True,
+        error=reason,
+    )
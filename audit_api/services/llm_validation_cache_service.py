@@ -0,0 +1,226 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+from audit_api.models import LLMValidationCacheEntry, ModelRegistry
+from audit_api.services.llm_providers import ValidationRequest, ValidationResult
+from audit_api.services.metrics_service import record_validation_cache_lookup
+
+
+def normalized_text_hash(text: str) -> str:
+    """sha256 of the text with whitespace runs collapsed, so re-wrapped copies share an entry."""
+    return hashlib.sha256(" ".join((text or "").split()).encode("utf-8")).hexdigest()
+
+
+_resolved_models: Dict[str, Tuple[str, float]] = {}
+_resolved_lock = threading.Lock()
+
+
+def resolve_validation_model(name: Optional[str] = None) -> str:
+    """
+    `name@version` of the newest ModelRegistry llm entry for LLM_VALIDATION_MODEL
+    (`@unregistered` if none). Memoised per process for
+    LLM_VALIDATION_MODEL_TTL_SECONDS, so a newly registered version takes
+    effect within that window without a query per validation.
+    """
+    name = name or settings.LLM_VALIDATION_MODEL
+    now = time.monotonic()
+    with _resolved_lock:
+        entry = _resolved_models.get(name)
+    if entry is not None and now < entry[1]:
+        return entry[0]
+    version = (
+        ModelRegistry.objects.filter(name=name, model_type="llm")
+        .order_by("-created_at")
+        .values_list("version", flat=True)
+        .first()
+    )
+    resolved = f"{name}@{version or 'unregistered'}"
+    with _resolved_lock:
+        _resolved_models[name] = (resolved, now + settings.LLM_VALIDATION_MODEL_TTL_SECONDS)
+    return resolved
+
+
+@dataclass(frozen=True)
+class PromptFingerprint:
+    provider: str
+    model: str
+    prompt_template: str
+    text_hash: str
+    control_references: Tuple[str, ...]
+    confidence: float  # the classifier confidence sent in the prompt, rounded to 3 decimals
+
+    @classmethod
+    def build(cls, request: ValidationRequest, *, provider: str, model: str, prompt_template: str) -> "PromptFingerprint":
+        return cls(
+            provider=provider,
+            model=model,
+            prompt_template=prompt_template,
+            text_hash=normalized_text_hash(request.text),
+            control_references=tuple(sorted(set(request.control_references))),
+            confidence=round(float(request.confidence), 3),
+        )
+
+    @property
+    def key(self) -> str:
+        parts = [
+            self.provider,
+            self.model,
+            self.prompt_template,
+            self.text_hash,
+            list(self.control_references),
+            self.confidence,
+        ]
+        return hashlib.sha256(json.dumps(parts, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+class LLMValidationCache:
+    """
+    Validation results keyed by PromptFingerprint, checked in order:
+
+    1. an in-process LRU (`LLM_VALIDATION_CACHE_SIZE` entries),
+    2. the `llm_validation_cache` table, shared by all workers.
+
+    Entries expire after `LLM_VALIDATION_CACHE_TTL_SECONDS` (0 = never); a
+    new model version or prompt template changes the fingerprint, so old
+    entries simply stop matching. Fallback results are never stored.
+    """
+
+    def __init__(self, *, max_size: Optional[int] = None, ttl_seconds: Optional[int] = None) -> None:
+        self.max_size = settings.LLM_VALIDATION_CACHE_SIZE if max_size is None else max_size
+        self.ttl_seconds = settings.LLM_VALIDATION_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self._lru: "OrderedDict[str, Tuple[ValidationResult, Optional[datetime]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # --- tiers -----------------------------------------------------------
+
+    def _local_get(self, key: str) -> Optional[ValidationResult]:
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is None:
+                return None
+            result, expires_at = entry
+            if expires_at is not None and expires_at <= timezone.now():
+                del self._lru[key]
+                return None
+            self._lru.move_to_end(key)
+            return result
+
+    def _local_put(self, key: str, result: ValidationResult, expires_at: Optional[datetime]) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._lru[key] = (result, expires_at)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_size:
+                self._lru.popitem(last=False)
+
+    @staticmethod
+    def _to_result(entry: LLMValidationCacheEntry) -> ValidationResult:
+        return ValidationResult(
+            confidence=entry.confidence,
+            justification=entry.justification,
+            provider=entry.provider,
+            prompt_tokens=entry.prompt_tokens,
+            completion_tokens=entry.completion_tokens,
+            extra={"model": entry.model, "prompt_template": entry.prompt_template},
+        )
+
+    # --- public ----------------------------------------------------------
+
+    def get_many(self, fingerprints: List[PromptFingerprint]) -> Dict[str, ValidationResult]:
+        """Cached results by fingerprint key; misses are absent."""
+        found: Dict[str, ValidationResult] = {}
+        remote = []
+        for fingerprint in fingerprints:
+            result = self._local_get(fingerprint.key)
+            if result is not None:
+                record_validation_cache_lookup(tier="local")
+                found[fingerprint.key] = result
+            else:
+                remote.append(fingerprint.key)
+
+        if remote:
+            now = timezone.now()
+            rows = LLMValidationCacheEntry.objects.filter(cache_key__in=set(remote)).filter(
+                Q(expires_at__isnull=True) | Q(expires_at__gt=now)
+            )
+            hits = []
+            for row in rows:
+                found[row.cache_key] = self._to_result(row)
+                self._local_put(row.cache_key, found[row.cache_key], row.expires_at)
+                hits.append(row.cache_key)
+            if hits:
+                LLMValidationCacheEntry.objects.filter(cache_key__in=hits).update(
+                    hit_count=F("hit_count") + 1,
+                    last_hit_at=now,
+                )
+            for key in remote:
+                record_validation_cache_lookup(tier="db" if key in found else "miss")
+        return found
+
+    def put_many(self, items: Iterable[Tuple[PromptFingerprint, ValidationResult]]) -> int:
+        expires_at = timezone.now() + timedelta(seconds=self.ttl_seconds) if self.ttl_seconds > 0 else None
+        rows = {}
+        for fingerprint, result in items:
+            if result.fallback:
+                continue
+            self._local_put(fingerprint.key, result, expires_at)
+            rows[fingerprint.key] = LLMValidationCacheEntry(
+                cache_key=fingerprint.key,
+                provider=fingerprint.provider,
+                model=fingerprint.model,
+                prompt_template=fingerprint.prompt_template,
+                text_hash=fingerprint.text_hash,
+                control_references=list(fingerprint.control_references),
+                confidence=result.confidence,
+                justification=result.justification,
+                prompt_tokens=result.prompt_tokens,
+                completion_tokens=result.completion_tokens,
+                expires_at=expires_at,
+            )
+        if rows:
+            LLMValidationCacheEntry.objects.bulk_create(
+                list(rows.values()),
+                update_conflicts=True,
+                unique_fields=["cache_key"],
+                update_fields=[
+                    "confidence",
+                    "justification",
+                    "prompt_tokens",
+                    "completion_tokens",
+                    "expires_at",
+                ],
+            )
+        return len(rows)
+
+    def purge_expired(self) -> int:
+        deleted, _ = LLMValidationCacheEntry.objects.filter(expires_at__lte=timezone.now()).delete()
+        return deleted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
+
+
+_default_cache: Optional[LLMValidationCache] = None
+_default_lock = threading.Lock()
+
+
+def get_validation_cache() -> LLMValidationCache:
+    """Process-wide cache, so the LRU is shared by every LLMValidationService instance."""
+    global _default_cache
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                _default_cache = LLMValidationCache()
+    return _default_cache
@@ -1,14 +1,296 @@
-from typing import Iterable, Tuple
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from dataclasses import replace
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from audit_api.services.llm_providers import (
+    CircuitBreaker,
+    ValidationProvider,
+    ValidationRequest,
+    ValidationResult,
+    build_provider,
+    fallback_result,
+)
+from audit_api.services.llm_validation_cache_service import (
+    LLMValidationCache,
+    PromptFingerprint,
+    get_validation_cache,
+    resolve_validation_model,
+)
+
+_pool: Optional[ThreadPoolExecutor] = None
+_breaker: Optional[CircuitBreaker] = None
+_shared_lock = threading.Lock()
+
+
+def _shared() -> Tuple[ThreadPoolExecutor, CircuitBreaker]:
+    """Process-wide pool and breaker, so concurrency limits and failure counts span all agents."""
+    global _pool, _breaker
+    if _pool is None:
+        with _shared_lock:
+            if _pool is None:
+                _breaker = CircuitBreaker(
+                    failure_threshold=settings.LLM_VALIDATION_BREAKER_FAILURES,
+                    reset_seconds=settings.LLM_VALIDATION_BREAKER_RESET_SECONDS,
+                )
+                _pool = ThreadPoolExecutor(
+                    max_workers=settings.LLM_VALIDATION_MAX_CONCURRENCY,
+                    thread_name_prefix="llm-validation",
+                )
+    return _pool, _breaker
+
+
+class _QueueTimeout(Exception):
+    """A batch waited longer than LLM_VALIDATION_QUEUE_TIMEOUT_SECONDS for a pool thread."""
+
+
+class _PendingBatch:
+    """A batch submitted to the shared pool; `started` resolves with the monotonic time a thread picks it up."""
+
+    def __init__(self, start: int, requests: List[ValidationRequest], *, trial: bool = False) -> None:
+        self.start = start
+        self.requests = requests
+        self.trial = trial  # holds the breaker's half-open trial slot
+        self.submitted_at = time.monotonic()
+        self.started: Future = Future()
+        self.future: Optional[Future] = None
+
+    def mark_started(self) -> float:
+        now = time.monotonic()
+        self.started.set_result(now)
+        return now
 
 
 class LLMValidationService:
     """
-    Placeholder LLM validation stage.
+    LLM validation stage in front of a pluggable ValidationProvider
+    (LLM_VALIDATION_PROVIDER; the default "stub" keeps confidence as-is).
+
+    Requests passed to validate_many are grouped into batches of
+    LLM_VALIDATION_BATCH_SIZE and run on a shared pool of
+    LLM_VALIDATION_MAX_CONCURRENCY threads; the sync and async paths both
+    submit to it, so it is the one process-wide limit. A batch that times out
+    or errors, or any batch while the circuit breaker is open, falls back to
+    the unvalidated confidence instead of failing the pipeline.
 
-    Keeps confidence as-is but captures a justification string so the
-    pipeline surface area is wired for future LLM calls.
+    The timeout starts when a pool thread picks the batch up, and providers
+    get the same timeout for their own I/O, so a slow call also frees its
+    thread. A batch that waited longer than LLM_VALIDATION_QUEUE_TIMEOUT_SECONDS
+    for a thread is cancelled (or skipped by the thread that picks it up) and
+    falls back without counting against the breaker: the backlog is ours,
+    not the provider's.
+
+    The classification pipeline validates one evidence item per call
+    (validate_detailed), so there a batch is a single request; batching only
+    takes effect for callers that pass several requests to validate_many.
+
+    With LLM_VALIDATION_CACHE_ENABLED, results are looked up by prompt
+    fingerprint (model, prompt template, normalized text, sorted controls,
+    input confidence) first, so identical evidence against the same controls
+    is only sent to the provider once. Providers that make no model call
+    (`cacheable = False`, e.g. the stub) bypass the cache.
     """
 
+    def __init__(
+        self,
+        provider: Optional[ValidationProvider] = None,
+        *,
+        timeout: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        prompt_template: str = "classifier-default@1.0",
+        cache: Optional[LLMValidationCache] = None,
+    ) -> None:
+        self.provider = provider or build_provider()
+        self.timeout = settings.LLM_VALIDATION_TIMEOUT_SECONDS if timeout is None else timeout
+        self.queue_timeout = settings.LLM_VALIDATION_QUEUE_TIMEOUT_SECONDS
+        self.batch_size = max(1, batch_size or settings.LLM_VALIDATION_BATCH_SIZE)
+        self.prompt_template = prompt_template
+        if not self.provider.cacheable:
+            self.cache = None
+        else:
+            self.cache = cache or (get_validation_cache() if settings.LLM_VALIDATION_CACHE_ENABLED else None)
+        self.pool, self.breaker = _shared()
+
+    @property
+    def model(self) -> str:
+        # Resolved per call (memoised briefly), so long-lived services pick up new registry versions.
+        return resolve_validation_model()
+
+    def _fingerprint(self, request: ValidationRequest) -> PromptFingerprint:
+        return PromptFingerprint.build(
+            request,
+            provider=self.provider.name,
+            model=self.model,
+            prompt_template=self.prompt_template,
+        )
+
+    def _call(self, pending: _PendingBatch) -> List[ValidationResult]:
+        if pending.mark_started() - pending.submitted_at > self.queue_timeout:
+            raise _QueueTimeout()
+        started = time.perf_counter()
+        results = self.provider.validate_batch(pending.requests, timeout=self.timeout)
+        return self._stamp(results, started)
+
+    @staticmethod
+    def _stamp(results: List[ValidationResult], started: float) -> List[ValidationResult]:
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 3)
+        for result in results:
+            result.latency_ms = result.latency_ms or elapsed_ms
+        return results
+
+    def _failed(self, batch: List[ValidationRequest], reason: str) -> List[ValidationResult]:
+        self.breaker.record_failure()
+        return [fallback_result(r, provider=self.provider.name, reason=reason) for r in batch]
+
+    def _lookup(self, requests: List[ValidationRequest]):
+        """Cached results in request order (None for misses) plus fingerprint key -> indexes still to validate."""
+        fingerprints = [self._fingerprint(r) for r in requests]
+        cached = self.cache.get_many(fingerprints)
+        results: List[Optional[ValidationResult]] = [None] * len(requests)
+        misses: Dict[str, List[int]] = {}
+        for index, fingerprint in enumerate(fingerprints):
+            hit = cached.get(fingerprint.key)
+            if hit is not None:
+                # Nothing was spent on this call, so usage and latency are zero.
+                results[index] = replace(hit, cached=True, prompt_tokens=0, completion_tokens=0, latency_ms=0.0)
+            else:
+                misses.setdefault(fingerprint.key, []).append(index)
+        return fingerprints, results, misses
+
+    def _fill(self, fingerprints, results, misses, fresh: List[ValidationResult]) -> List[ValidationResult]:
+        first = [indexes[0] for indexes in misses.values()]
+        self.cache.put_many((fingerprints[i], result) for i, result in zip(first, fresh))
+        for indexes, result in zip(misses.values(), fresh):
+            for index in indexes:
+                results[index] = result
+        return results
+
+    def validate_many(self, requests: List[ValidationRequest]) -> List[ValidationResult]:
+        if self.cache is None:
+            return self._validate_uncached(requests)
+        fingerprints, results, misses = self._lookup(requests)
+        if not misses:
+            return results
+        # Duplicates within one call are sent once and fanned out.
+        fresh = self._validate_uncached([requests[indexes[0]] for indexes in misses.values()])
+        return self._fill(fingerprints, results, misses, fresh)
+
+    async def avalidate_many(self, requests: List[ValidationRequest]) -> List[ValidationResult]:
+        """
+        Async form of validate_many for the ASGI path: batches go to the same
+        shared pool and their futures are awaited, so the request does not
+        hold a thread while waiting; cache reads and writes go through a
+        worker thread.
+        """
+        if self.cache is None:
+            return await self._avalidate_uncached(requests)
+        fingerprints, results, misses = await sync_to_async(self._lookup)(requests)
+        if not misses:
+            return results
+        fresh = await self._avalidate_uncached([requests[indexes[0]] for indexes in misses.values()])
+        return await sync_to_async(self._fill)(fingerprints, results, misses, fresh)
+
+    def _submit(self, requests: List[ValidationRequest]):
+        """Results prefilled for batches short-circuited by the breaker, plus the batches submitted."""
+        results: List[Optional[ValidationResult]] = [None] * len(requests)
+        pending: List[_PendingBatch] = []
+        for start in range(0, len(requests), self.batch_size):
+            batch = requests[start : start + self.batch_size]
+            allowed, trial = self.breaker.admit()
+            if not allowed:
+                for offset, request in enumerate(batch):
+                    results[start + offset] = fallback_result(request, provider=self.provider.name, reason="circuit open")
+                continue
+            job = _PendingBatch(start, batch, trial=trial)
+            job.future = self.pool.submit(self._call, job)
+            pending.append(job)
+        return results, pending
+
+    def _queued_too_long(self, job: _PendingBatch) -> List[ValidationResult]:
+        # The provider never saw this batch, so its outcome is not counted; a
+        # half-open trial gives its slot back so the next batch can try.
+        if job.trial:
+            self.breaker.release_trial()
+        return [fallback_result(r, provider=self.provider.name, reason="queue timeout") for r in job.requests]
+
+    def _queue_remaining(self, job: _PendingBatch) -> float:
+        return max(0.0, job.submitted_at + self.queue_timeout - time.monotonic())
+
+    def _remaining(self, started_at: float) -> float:
+        return max(0.0, started_at + self.timeout - time.monotonic())
+
+    @staticmethod
+    def _place(results: List[Optional[ValidationResult]], job: _PendingBatch, out: List[ValidationResult]) -> None:
+        for offset, result in enumerate(out):
+            results[job.start + offset] = result
+
+    def _validate_uncached(self, requests: List[ValidationRequest]) -> List[ValidationResult]:
+        results, pending = self._submit(requests)
+        for job in pending:
+            try:
+                started_at = job.started.result(timeout=self._queue_remaining(job))
+            except FuturesTimeout:
+                if job.future.cancel():
+                    self._place(results, job, self._queued_too_long(job))
+                    continue
+                started_at = job.started.result()  # picked up just now
+            try:
+                out = job.future.result(timeout=self._remaining(started_at))
+            except _QueueTimeout:
+                out = self._queued_too_long(job)
+            except FuturesTimeout:
+                out = self._failed(job.requests, "timeout")
+            except Exception as exc:
+                out = self._failed(job.requests, f"error: {type(exc).__name__}: {exc}")
+            else:
+                self.breaker.record_success()
+            self._place(results, job, out)
+        return results  # type: ignore[return-value]
+
+    async def _avalidate_uncached(self, requests: List[ValidationRequest]) -> List[ValidationResult]:
+        async def wait(future: Future, timeout: float):
+            # shield: timing out must not cancel the underlying pool future.
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+
+        async def collect(job: _PendingBatch) -> List[ValidationResult]:
+            try:
+                started_at = await wait(job.started, self._queue_remaining(job))
+            except asyncio.TimeoutError:
+                if job.future.cancel():
+                    return self._queued_too_long(job)
+                started_at = await asyncio.wrap_future(job.started)
+            try:
+                out = await wait(job.future, self._remaining(started_at))
+            except _QueueTimeout:
+                return self._queued_too_long(job)
+            except asyncio.TimeoutError:
+                return self._failed(job.requests, "timeout")
+            except Exception as exc:
+                return self._failed(job.requests, f"error: {type(exc).__name__}: {exc}")
+            self.breaker.record_success()
+            return out
+
+        results, pending = self._submit(requests)
+        outs = await asyncio.gather(*(collect(job) for job in pending))
+        for job, out in zip(pending, outs):
+            self._place(results, job, out)
+        return results  # type: ignore[return-value]
+
+    def validate_detailed(
+        self,
+        *,
+        text: str,
+        control_references: Iterable[str],
+        confidence: float,
+    ) -> ValidationResult:
+        request = ValidationRequest(text=text, control_references=list(control_references), confidence=confidence)
+        return self.validate_many([request])[0]
+
     def validate(
         self,
         *,
@@ -16,5 +298,15 @@ class LLMValidationService:
         control_references: Iterable[str],
         confidence: float,
     ) -> Tuple[float, str]:
-        justification = "LLM validation stub: no adjustment applied."
-        return confidence, justification
+        result = self.validate_detailed(text=text, control_references=control_references, confidence=confidence)
+        return result.confidence, result.justification
+
+    async def avalidate_detailed(
+        self,
+        *,
+        text: str,
+        control_references: Iterable[str],
+        confidence: float,
+    ) -> ValidationResult:
+        request = ValidationRequest(text=text, control_references=list(control_references), confidence=confidence)
+        return (await self.avalidate_many([request]))[0]
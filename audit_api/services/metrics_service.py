@@ -0,0 +1,142 @@
+import os
+import time
+from typing import Any, Tuple
+
+import django_rq
+from django.conf import settings
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+
+# Shared by step/request histograms so p99 panels line up across metrics.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+PIPELINE_STEP_SECONDS = Histogram(
+    "auditmind_pipeline_step_duration_seconds",
+    "Duration of pipeline steps logged through PipelineLogger.",
+    ["pipeline_type", "step_name", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+CLASSIFICATION_CACHE_LOOKUPS = Counter(
+    "auditmind_classification_cache_lookups_total",
+    "Classification cache lookups by outcome (hit/miss) and match type.",
+    ["result", "match"],
+)
+
+EMBEDDING_MEMO_LOOKUPS = Counter(
+    "auditmind_embedding_memo_lookups_total",
+    "Embedding memo lookups by the tier that answered (local, redis, db) or miss.",
+    ["tier"],
+)
+
+LLM_VALIDATION_CACHE_LOOKUPS = Counter(
+    "auditmind_llm_validation_cache_lookups_total",
+    "LLM validation cache lookups by the tier that answered (local, db) or miss.",
+    ["tier"],
+)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "auditmind_http_request_duration_seconds",
+    "API request latency by method, URL route and status code.",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+class QueryStats:
+    """`connection.execute_wrapper` callable tallying the SQL run inside a scope."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_seconds = 0.0
+        self.slowest_seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.total_seconds += elapsed
+            self.slowest_seconds = max(self.slowest_seconds, elapsed)
+
+    def as_metadata(self) -> dict[str, Any]:
+        return {
+            "query_count": self.count,
+            "query_time_ms": round(self.total_seconds * 1000, 3),
+            "slowest_query_ms": round(self.slowest_seconds * 1000, 3),
+        }
+
+
+class RQQueueDepthCollector:
+    """Reads RQ queue depth from Redis at scrape time (never cached per process)."""
+
+    def collect(self):
+        gauge = GaugeMetricFamily(
+            "auditmind_rq_queue_depth",
+            "Jobs waiting in each configured RQ queue.",
+            labels=["queue"],
+        )
+        for name in getattr(settings, "RQ_QUEUES", {}):
+            try:
+                depth = django_rq.get_queue(name).count
+            except Exception:
+                # Redis being down must not break the scrape.
+                continue
+            gauge.add_metric([name], depth)
+        yield gauge
+
+
+_queue_registry = CollectorRegistry(auto_describe=False)
+_queue_registry.register(RQQueueDepthCollector())
+
+
+def observe_step(*, pipeline_type: str, step_name: str, status: str, seconds: float) -> None:
+    PIPELINE_STEP_SECONDS.labels(pipeline_type, step_name, status).observe(max(0.0, seconds))
+
+
+def record_cache_lookup(*, hit: bool, match: str) -> None:
+    CLASSIFICATION_CACHE_LOOKUPS.labels("hit" if hit else "miss", match).inc()
+
+
+def record_memo_lookup(*, tier: str) -> None:
+    EMBEDDING_MEMO_LOOKUPS.labels(tier=tier).inc()
+
+
+def record_validation_cache_lookup(*, tier: str) -> None:
+    LLM_VALIDATION_CACHE_LOOKUPS.labels(tier=tier).inc()
+
+
+def observe_request(*, method: str, route: str, status: int, seconds: float) -> None:
+    HTTP_REQUEST_SECONDS.labels(method, route, str(status)).observe(max(0.0, seconds))
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Text exposition for /metrics.
+
+    With PROMETHEUS_MULTIPROC_DIR set (gunicorn workers, RQ work horses) the
+    per-process files are aggregated; otherwise the in-process registry is used.
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry) + generate_latest(_queue_registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int) -> None:
+    """Call from gunicorn's `child_exit` hook so dead workers stop reporting."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,209 @@
+import gzip
+import re
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+# table -> range partition key (see migration 0008)
+PARTITIONED_TABLES: Dict[str, str] = {
+    "events": "created_at",
+    "agent_step_logs": "started_at",
+}
+
+_PARTITION_RE = re.compile(r"^(?P<table>.+)_p(?P<year>\d{4})_(?P<month>\d{2})$")
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    index = value.year * 12 + (value.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y_%m}"
+
+
+@dataclass
+class PartitionInfo:
+    table: str
+    name: str
+    month: date
+
+    @property
+    def upper(self) -> date:
+        return add_months(self.month, 1)
+
+
+class PartitionService:
+    """
+    Maintains monthly range partitions for the high-volume log tables.
+
+    - `ensure_future_partitions` creates the current month plus `months_ahead`.
+      Each partition is built as a standalone table with a CHECK constraint
+      matching its range and then attached, which only takes SHARE UPDATE
+      EXCLUSIVE on the parent, so pipeline writes keep flowing. Partitions
+      are created ahead of time, so DEFAULT stays empty and the attach check
+      against it is instant. Only if rows already landed in DEFAULT for that
+      month (maintenance was skipped) does it fall back to detaching DEFAULT
+      and moving them, which locks the parent.
+    - `apply_retention` detaches partitions older than the table's retention,
+      archives them as gzipped CSV under PARTITION_ARCHIVE_DIR and drops them,
+      instead of running row-by-row DELETEs. Rows older than the cutoff that
+      sit in DEFAULT are archived and deleted the same way.
+    - `default_row_counts` reports rows in DEFAULT so cron can alert on them.
+    """
+
+    def __init__(self, *, archive_dir: Optional[Path] = None) -> None:
+        self.archive_dir = Path(archive_dir or settings.PARTITION_ARCHIVE_DIR)
+
+    def list_partitions(self, table: str) -> List[PartitionInfo]:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT child.relname
+                FROM pg_inherits
+                JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE parent.relname = %s
+                """,
+                [table],
+            )
+            names = [row[0] for row in cursor.fetchall()]
+
+        partitions = []
+        for name in names:
+            match = _PARTITION_RE.match(name)
+            if match and match.group("table") == table:
+                month = date(int(match.group("year")), int(match.group("month")), 1)
+                partitions.append(PartitionInfo(table=table, name=name, month=month))
+        return sorted(partitions, key=lambda p: p.month)
+
+    def ensure_future_partitions(self, *, months_ahead: Optional[int] = None, dry_run: bool = False) -> List[str]:
+        months_ahead = settings.PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+        current = month_start(timezone.now().date())
+        created = []
+        for table, column in PARTITIONED_TABLES.items():
+            existing = {p.month for p in self.list_partitions(table)}
+            for offset in range(months_ahead + 1):
+                month = add_months(current, offset)
+                if month in existing:
+                    continue
+                if not dry_run:
+                    self._create_partition(table, column, month)
+                created.append(partition_name(table, month))
+        return created
+
+    def apply_retention(self, *, dry_run: bool = False) -> List[str]:
+        current = month_start(timezone.now().date())
+        archived = []
+        for table in PARTITIONED_TABLES:
+            months = settings.PARTITION_RETENTION_MONTHS.get(table)
+            if not months:
+                continue
+            cutoff = add_months(current, -months)
+            for partition in self.list_partitions(table):
+                if partition.upper > cutoff:
+                    continue
+                if not dry_run:
+                    self._archive_and_drop(partition)
+                archived.append(partition.name)
+            if self._default_rows(table, before=cutoff):
+                if not dry_run:
+                    self._archive_default_rows(table, cutoff)
+                archived.append(f"{table}_default (rows before {cutoff.isoformat()})")
+        return archived
+
+    def default_row_counts(self) -> Dict[str, int]:
+        """Rows per table sitting in the DEFAULT partition (should be 0)."""
+        return {table: self._default_rows(table) for table in PARTITIONED_TABLES}
+
+    def _default_rows(self, table: str, *, since: Optional[date] = None, before: Optional[date] = None) -> int:
+        column = PARTITIONED_TABLES[table]
+        clauses, params = [], []
+        if since is not None:
+            clauses.append(f'"{column}" >= %s')
+            params.append(since.isoformat())
+        if before is not None:
+            clauses.append(f'"{column}" < %s')
+            params.append(before.isoformat())
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT count(*) FROM "{table}_default"{where}', params)
+            return cursor.fetchone()[0]
+
+    def _create_partition(self, table: str, column: str, month: date) -> None:
+        if self._default_rows(table, since=month, before=add_months(month, 1)):
+            self._create_partition_moving_default_rows(table, column, month)
+            return
+        name = partition_name(table, month)
+        lower, upper = month.isoformat(), add_months(month, 1).isoformat()
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'CREATE TABLE "{name}" (LIKE "{table}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+            # The matching CHECK lets ATTACH skip scanning the new table.
+            cursor.execute(
+                f'ALTER TABLE "{name}" ADD CONSTRAINT "{name}_range" '
+                f'CHECK ("{column}" IS NOT NULL AND "{column}" >= %s AND "{column}" < %s)',
+                [lower, upper],
+            )
+            cursor.execute(
+                f'ALTER TABLE "{table}" ATTACH PARTITION "{name}" FOR VALUES FROM (%s) TO (%s)',
+                [lower, upper],
+            )
+            cursor.execute(f'ALTER TABLE "{name}" DROP CONSTRAINT "{name}_range"')
+
+    def _create_partition_moving_default_rows(self, table: str, column: str, month: date) -> None:
+        name = partition_name(table, month)
+        lower, upper = month.isoformat(), add_months(month, 1).isoformat()
+        default = f"{table}_default"
+        with transaction.atomic(), connection.cursor() as cursor:
+            # A partition cannot be created while DEFAULT holds rows in its range,
+            # so temporarily detach DEFAULT and move those rows across. This
+            # locks the parent; it only happens when maintenance fell behind.
+            cursor.execute(f'ALTER TABLE "{table}" DETACH PARTITION "{default}"')
+            cursor.execute(
+                f'CREATE TABLE "{name}" PARTITION OF "{table}" FOR VALUES FROM (%s) TO (%s)',
+                [lower, upper],
+            )
+            cursor.execute(
+                f'WITH moved AS (DELETE FROM "{default}" WHERE "{column}" >= %s AND "{column}" < %s RETURNING *) '
+                f'INSERT INTO "{table}" SELECT * FROM moved',
+                [lower, upper],
+            )
+            cursor.execute(f'ALTER TABLE "{table}" ATTACH PARTITION "{default}" DEFAULT')
+
+    def _archive_default_rows(self, table: str, cutoff: date) -> Path:
+        column = PARTITIONED_TABLES[table]
+        target_dir = self.archive_dir / table
+        target_dir.mkdir(parents=True, exist_ok=True)
+        target = target_dir / f"{table}_default_before_{cutoff:%Y_%m}.csv.gz"
+        default = f"{table}_default"
+        with transaction.atomic(), connection.cursor() as cursor:
+            # Same cutoff literal for COPY and DELETE; COPY cannot take parameters.
+            literal = f"'{cutoff.isoformat()}'"
+            with gzip.open(target, "ab") as fh:
+                cursor.copy_expert(
+                    f'COPY (SELECT * FROM "{default}" WHERE "{column}" < {literal}) TO STDOUT WITH (FORMAT csv, HEADER true)',
+                    fh,
+                )
+            cursor.execute(f'DELETE FROM "{default}" WHERE "{column}" < %s', [cutoff.isoformat()])
+        return target
+
+    def _archive_and_drop(self, partition: PartitionInfo) -> Path:
+        target_dir = self.archive_dir / partition.table
+        target_dir.mkdir(parents=True, exist_ok=True)
+        target = target_dir / f"{partition.name}.csv.gz"
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'ALTER TABLE "{partition.table}" DETACH PARTITION "{partition.name}"')
+            with gzip.open(target, "wb") as fh:
+                cursor.copy_expert(f'COPY "{partition.name}" TO STDOUT WITH (FORMAT csv, HEADER true)', fh)
+            cursor.execute(f'DROP TABLE "{partition.name}"')
+        return target
@@ -0,0 +1,208 @@
+import gzip
+import json
+import os
+from collections import defaultdict
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery
+from django.forms.models import model_to_dict
+from django.utils import timezone
+
+from audit_api.models import (
+    AgentRun,
+    AgentStepLog,
+    AiPipelineRun,
+    ArchivedAgentRun,
+    ClassifierOutput,
+    Event,
+)
+from audit_api.serializers import AgentRunSerializer, AgentStepLogSerializer, EventSerializer
+
+
+class PipelineArchiveService:
+    """
+    Moves cold pipeline history out of the hot tables.
+
+    Each archived AgentRun becomes one gzip member (NDJSON: agent run with its
+    pipeline run, step logs, events, classifier outputs) appended to a per-batch
+    file under PIPELINE_ARCHIVE_DIR, plus an ArchivedAgentRun summary row that
+    records where the member lives. Rows are written in API shape so the
+    timeline endpoints can serve them as-is.
+
+    By default the latest run of each evidence item is kept hot, since that is
+    the one the dashboard shows.
+    """
+
+    def __init__(self, *, archive_dir: Optional[Path] = None) -> None:
+        self.archive_dir = Path(archive_dir or settings.PIPELINE_ARCHIVE_DIR)
+
+    # --- archiving -------------------------------------------------------
+
+    def archivable_runs(self, organization_id: UUID | str, *, older_than_days: int, include_latest: bool = False):
+        cutoff = timezone.now() - timedelta(days=older_than_days)
+        qs = AgentRun.objects.filter(
+            evidence__organization_id=organization_id,
+            created_at__lt=cutoff,
+        ).exclude(status="running")
+        if not include_latest:
+            latest = (
+                AgentRun.objects.filter(evidence_id=OuterRef("evidence_id"))
+                .order_by("-created_at")
+                .values("id")[:1]
+            )
+            qs = qs.annotate(latest_id=Subquery(latest)).exclude(id=F("latest_id"))
+        return qs.order_by("created_at")
+
+    def archive_organization(
+        self,
+        organization_id: UUID | str,
+        *,
+        older_than_days: int,
+        batch_size: int = 200,
+        include_latest: bool = False,
+        dry_run: bool = False,
+    ) -> Dict[str, int]:
+        totals = defaultdict(int)
+        qs = self.archivable_runs(organization_id, older_than_days=older_than_days, include_latest=include_latest)
+        if dry_run:
+            totals["runs"] = qs.count()
+            return dict(totals)
+
+        while True:
+            batch = list(qs.select_related("pipeline_run")[:batch_size])
+            if not batch:
+                break
+            for key, value in self._archive_batch(organization_id, batch).items():
+                totals[key] += value
+        return dict(totals)
+
+    def _archive_batch(self, organization_id: UUID | str, runs: List[AgentRun]) -> Dict[str, int]:
+        run_ids = [r.id for r in runs]
+        pipeline_ids = [r.pipeline_run_id for r in runs if r.pipeline_run_id]
+        evidence_ids = {r.evidence_id for r in runs if r.evidence_id}
+
+        # Both log tables are partitioned by month; a lower time bound lets Postgres prune older partitions.
+        earliest = min(r.created_at for r in runs)
+        steps_by_run = defaultdict(list)
+        steps = AgentStepLog.objects.filter(agent_run_id__in=run_ids, started_at__gte=earliest)
+        for step in steps.order_by("started_at"):
+            steps_by_run[step.agent_run_id].append(step)
+
+        outputs_by_pipeline = defaultdict(list)
+        for output in ClassifierOutput.objects.filter(pipeline_run_id__in=pipeline_ids):
+            outputs_by_pipeline[output.pipeline_run_id].append(output)
+
+        # Events are linked to runs through payload.pipeline_run_id; narrow by the
+        # indexed evidence column first instead of scanning JSON.
+        pipeline_keys = {str(pid): pid for pid in pipeline_ids}
+        events_by_pipeline = defaultdict(list)
+        latest_started = max(r.created_at for r in runs)
+        for event in Event.objects.filter(
+            evidence_id__in=evidence_ids,
+            created_at__gte=earliest,
+            created_at__lte=latest_started + timedelta(days=1),
+        ).order_by("created_at"):
+            key = (event.payload or {}).get("pipeline_run_id")
+            if key in pipeline_keys:
+                events_by_pipeline[pipeline_keys[key]].append(event)
+
+        target_dir = self.archive_dir / str(organization_id)
+        target_dir.mkdir(parents=True, exist_ok=True)
+        target = target_dir / f"{timezone.now():%Y%m%dT%H%M%S%f}.ndjson.gz"
+        relative = str(target.relative_to(settings.AUDITMIND_VAR_DIR))
+
+        summaries = []
+        event_ids, output_ids = [], []
+        with open(target, "wb") as fh:
+            for run in runs:
+                steps = steps_by_run.get(run.id, [])
+                outputs = outputs_by_pipeline.get(run.pipeline_run_id, [])
+                events = events_by_pipeline.get(run.pipeline_run_id, [])
+                records = [{"type": "agent_run", "data": AgentRunSerializer(run).data}]
+                records += [{"type": "step_log", "data": AgentStepLogSerializer(s).data} for s in steps]
+                records += [{"type": "event", "data": EventSerializer(e).data} for e in events]
+                records += [
+                    {"type": "classifier_output", "data": {**model_to_dict(o), "id": o.id, "created_at": o.created_at}}
+                    for o in outputs
+                ]
+                member = gzip.compress(
+                    "".join(json.dumps(r, cls=DjangoJSONEncoder) + "\n" for r in records).encode("utf-8")
+                )
+                offset = fh.tell()
+                fh.write(member)
+
+                summaries.append(
+                    ArchivedAgentRun(
+                        id=run.id,
+                        organization_id=organization_id,
+                        evidence_id=run.evidence_id,
+                        pipeline_run_id=run.pipeline_run_id,
+                        agent_name=run.agent_name,
+                        agent_version=run.agent_version,
+                        status=run.status,
+                        started_at=run.started_at,
+                        finished_at=run.finished_at,
+                        details=run.details,
+                        step_count=len(steps),
+                        event_count=len(events),
+                        output_count=len(outputs),
+                        archive_path=relative,
+                        archive_offset=offset,
+                        archive_length=len(member),
+                    )
+                )
+                event_ids += [e.id for e in events]
+                output_ids += [o.id for o in outputs]
+            fh.flush()
+            os.fsync(fh.fileno())
+
+        with transaction.atomic():
+            ArchivedAgentRun.objects.bulk_create(summaries, ignore_conflicts=True)
+            Event.objects.filter(id__in=event_ids).delete()
+            ClassifierOutput.objects.filter(id__in=output_ids).delete()
+            AgentStepLog.objects.filter(agent_run_id__in=run_ids).delete()
+            AgentRun.objects.filter(id__in=run_ids).delete()
+            AiPipelineRun.objects.filter(id__in=pipeline_ids, agent_runs__isnull=True).delete()
+
+        return {
+            "runs": len(runs),
+            "step_logs": sum(s.step_count for s in summaries),
+            "events": len(event_ids),
+            "classifier_outputs": len(output_ids),
+        }
+
+    # --- reading ---------------------------------------------------------
+
+    def load_run(self, archived: ArchivedAgentRun) -> Dict[str, Any]:
+        """Read one archived run back in API shape (run detail with step_logs, events, outputs)."""
+        path = Path(settings.AUDITMIND_VAR_DIR) / archived.archive_path
+        with open(path, "rb") as fh:
+            fh.seek(archived.archive_offset)
+            member = fh.read(archived.archive_length)
+
+        run: Dict[str, Any] = {}
+        steps, events, outputs = [], [], []
+        for line in gzip.decompress(member).decode("utf-8").splitlines():
+            record = json.loads(line)
+            kind, data = record["type"], record["data"]
+            if kind == "agent_run":
+                run = data
+            elif kind == "step_log":
+                steps.append(data)
+            elif kind == "event":
+                events.append(data)
+            elif kind == "classifier_output":
+                outputs.append(data)
+        return {
+            **run,
+            "archived": True,
+            "step_logs": steps,
+            "events": events,
+            "classifier_outputs": outputs,
+        }
@@ -1,5 +1,7 @@
-from typing import Any, Iterable, Optional
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, Optional
 
+from django.db import connection
 from django.utils import timezone
 
 from audit_api.models import (
@@ -9,10 +11,20 @@ from audit_api.models import (
     Event,
     Evidence,
 )
+from audit_api.services.metrics_service import QueryStats, observe_step
 
 
 class PipelineLogger:
-    """Small helper to persist pipeline + agent run + step logs + events."""
+    """
+    Small helper to persist pipeline + agent run + step logs + events.
+
+    The `a*` methods are async equivalents for the ASGI classification path.
+    They use the async ORM; step logs written through them carry no `sql`
+    metadata, since queries issued from async code do not run on the calling
+    thread's connection.
+    """
+
+    STEP_COMPLETION_FIELDS = ["status", "finished_at", "output_snapshot", "error", "metadata"]
 
     def __init__(
         self,
@@ -37,30 +49,51 @@ class PipelineLogger:
         cache_hit: bool = False,
     ) -> AiPipelineRun:
         now = timezone.now()
-        details = {
-            "steps": list(step_names) if step_names else [],
-            "agent": self.agent_name,
-            "version": self.agent_version,
-            "cache_hit": cache_hit,
-            **(initial_details or {}),
-        }
         self.pipeline_run = AiPipelineRun.objects.create(
-            pipeline_type=self.pipeline_type,
-            status="running",
-            started_at=now,
-            details=details,
+            **self._pipeline_fields(now, step_names, initial_details, cache_hit)
         )
-        self.agent_run = AgentRun.objects.create(
-            agent_name=self.agent_name,
-            agent_version=self.agent_version,
-            pipeline_run=self.pipeline_run,
-            evidence=self.evidence,
-            status="running",
-            started_at=now,
-            details={"cache_hit": cache_hit},
+        self.agent_run = AgentRun.objects.create(**self._agent_fields(now, cache_hit))
+        return self.pipeline_run
+
+    async def astart(
+        self,
+        *,
+        step_names: Optional[Iterable[str]] = None,
+        initial_details: Optional[dict[str, Any]] = None,
+        cache_hit: bool = False,
+    ) -> AiPipelineRun:
+        now = timezone.now()
+        self.pipeline_run = await AiPipelineRun.objects.acreate(
+            **self._pipeline_fields(now, step_names, initial_details, cache_hit)
         )
+        self.agent_run = await AgentRun.objects.acreate(**self._agent_fields(now, cache_hit))
         return self.pipeline_run
 
+    def _pipeline_fields(self, now, step_names, initial_details, cache_hit) -> dict[str, Any]:
+        return {
+            "pipeline_type": self.pipeline_type,
+            "status": "running",
+            "started_at": now,
+            "details": {
+                "steps": list(step_names) if step_names else [],
+                "agent": self.agent_name,
+                "version": self.agent_version,
+                "cache_hit": cache_hit,
+                **(initial_details or {}),
+            },
+        }
+
+    def _agent_fields(self, now, cache_hit) -> dict[str, Any]:
+        return {
+            "agent_name": self.agent_name,
+            "agent_version": self.agent_version,
+            "pipeline_run": self.pipeline_run,
+            "evidence": self.evidence,
+            "status": "running",
+            "started_at": now,
+            "details": {"cache_hit": cache_hit},
+        }
+
     def start_step(
         self,
         step_name: str,
@@ -79,6 +112,35 @@ class PipelineLogger:
             metadata=metadata,
         )
 
+    @contextmanager
+    def measure_queries(self) -> Iterator[QueryStats]:
+        """
+        Counts the queries of a step body on the calling thread's connection.
+        Wrap only the body, so the step log writes are not counted and nested
+        wrappers unwind in order even when steps overlap on other threads.
+        """
+        stats = QueryStats()
+        with connection.execute_wrapper(stats):
+            yield stats
+
+    async def astart_step(
+        self,
+        step_name: str,
+        *,
+        input_snapshot: Optional[dict[str, Any]] = None,
+        metadata: Optional[dict[str, Any]] = None,
+    ) -> AgentStepLog:
+        if not self.agent_run:
+            raise RuntimeError("astart() must be called before logging steps.")
+        return await AgentStepLog.objects.acreate(
+            agent_run=self.agent_run,
+            step_name=step_name,
+            status="running",
+            started_at=timezone.now(),
+            input_snapshot=input_snapshot,
+            metadata=metadata,
+        )
+
     def complete_step(
         self,
         step: AgentStepLog,
@@ -87,7 +149,29 @@ class PipelineLogger:
         output_snapshot: Optional[dict[str, Any]] = None,
         error: Optional[str] = None,
         metadata: Optional[dict[str, Any]] = None,
+        queries: Optional[QueryStats] = None,
+    ) -> None:
+        if queries is not None:
+            metadata = {**(metadata or {}), "sql": queries.as_metadata()}
+        self._apply_completion(step, status=status, output_snapshot=output_snapshot, error=error, metadata=metadata)
+        step.save(update_fields=self.STEP_COMPLETION_FIELDS)
+        self._observe(step, status)
+
+    async def acomplete_step(
+        self,
+        step: AgentStepLog,
+        *,
+        status: str = "completed",
+        output_snapshot: Optional[dict[str, Any]] = None,
+        error: Optional[str] = None,
+        metadata: Optional[dict[str, Any]] = None,
     ) -> None:
+        self._apply_completion(step, status=status, output_snapshot=output_snapshot, error=error, metadata=metadata)
+        await step.asave(update_fields=self.STEP_COMPLETION_FIELDS)
+        self._observe(step, status)
+
+    @staticmethod
+    def _apply_completion(step: AgentStepLog, *, status, output_snapshot, error, metadata) -> None:
         step.status = status
         step.finished_at = timezone.now()
         if output_snapshot is not None:
@@ -96,31 +180,36 @@ class PipelineLogger:
             step.error = error
         if metadata:
             step.metadata = {**(step.metadata or {}), **metadata}
-        step.save(
-            update_fields=[
-                "status",
-                "finished_at",
-                "output_snapshot",
-                "error",
-                "metadata",
-            ]
-        )
+
+    def _observe(self, step: AgentStepLog, status: str) -> None:
+        if step.started_at:
+            observe_step(
+                pipeline_type=self.pipeline_type,
+                step_name=step.step_name,
+                status=status,
+                seconds=(step.finished_at - step.started_at).total_seconds(),
+            )
 
     def finish_pipeline(self, status: str, *, details: Optional[dict[str, Any]] = None) -> None:
-        finished_at = timezone.now()
-        if self.pipeline_run:
-            self.pipeline_run.status = status
-            self.pipeline_run.finished_at = finished_at
-            if details:
-                self.pipeline_run.details = {**(self.pipeline_run.details or {}), **details}
-            self.pipeline_run.save(update_fields=["status", "finished_at", "details", "updated_at"])
+        for run, fields in self._finish_runs(status, details):
+            run.save(update_fields=fields)
 
-        if self.agent_run:
-            self.agent_run.status = status
-            self.agent_run.finished_at = finished_at
+    async def afinish_pipeline(self, status: str, *, details: Optional[dict[str, Any]] = None) -> None:
+        for run, fields in self._finish_runs(status, details):
+            await run.asave(update_fields=fields)
+
+    def _finish_runs(self, status: str, details: Optional[dict[str, Any]]):
+        finished_at = timezone.now()
+        runs = []
+        for run in (self.pipeline_run, self.agent_run):
+            if not run:
+                continue
+            run.status = status
+            run.finished_at = finished_at
             if details:
-                self.agent_run.details = {**(self.agent_run.details or {}), **details}
-            self.agent_run.save(update_fields=["status", "finished_at", "details", "updated_at"])
+                run.details = {**(run.details or {}), **details}
+            runs.append((run, ["status", "finished_at", "details", "updated_at"]))
+        return runs
 
     def emit_event(self, event_type: str, payload: Optional[dict[str, Any]] = None) -> Event:
         return Event.objects.create(
@@ -129,3 +218,11 @@ class PipelineLogger:
             organization=self.evidence.organization if self.evidence else None,
             payload=payload or {},
         )
+
+    async def aemit_event(self, event_type: str, payload: Optional[dict[str, Any]] = None) -> Event:
+        return await Event.objects.acreate(
+            event_type=event_type,
+            evidence=self.evidence,
+            organization_id=self.evidence.organization_id if self.evidence else None,
+            payload=payload or {},
+        )
@@ -1,73 +1,83 @@
 import hashlib
-import json
-import mimetypes
-from typing import Any
+import io
+from typing import BinaryIO, TextIO
+
+from audit_api.services.extractors import get_extractor_registry
+from audit_api.services.json_flattener import (
+    JSONStreamError,
+    flatten_events,
+    iter_json_events,
+    iter_object_events,
+)
 
 
 class EvidencePreprocessingService:
-    """Deterministic text extraction + hashing for Evidence."""
+    """
+    Deterministic text extraction + hashing for Evidence.
+
+    JSON evidence is flattened to one `path: value` line per leaf in document
+    order (see json_flattener), streamed and cut off at MAX_LEN. Uploaded
+    files go through format-specific extractors (CSV, NDJSON, logs, archives).
+    """
 
     MAX_LEN = 200_000  # safety cap to avoid storing megabytes in a single row
+    AWS_SOURCE_TYPES = {"aws_s3", "aws"}
+    AWS_SOURCE_HINT = "iam policy permissions access control authorization"
+    S3_POLICY_HINT = "iam policy s3 access control authorization"
 
     def extract_text(self, *, raw_text: str | None, raw_json: object | None) -> str:
         if raw_json is not None:
-            obj: Any = raw_json
-
-            # If someone passed JSON as a string, try to parse it.
+            # If someone passed JSON as a string, parse it incrementally.
             if isinstance(raw_json, str):
                 s = raw_json.strip()
-                if s:
-                    try:
-                        obj = json.loads(s)
-                    except Exception:
-                        # Not valid JSON; store the string as-is.
-                        return self._cap(s)
-
-            try:
-                text = json.dumps(
-                    obj,
-                    ensure_ascii=False,
-                    indent=2,
-                    sort_keys=True,
-                    default=str,  # UUID/Decimal/etc.
-                )
-            except Exception:
-                text = str(obj)
-
-            text = (text or "").strip()
-
-            if text in {"{", "["}:
-                text = str(obj).strip()
+                try:
+                    return self.extract_json_stream(io.StringIO(s))
+                except JSONStreamError:
+                    # Not valid JSON; store the string as-is.
+                    return self._cap(s)
 
-            return self._cap(text)
+            return self._cap(flatten_events(iter_object_events(raw_json), max_len=self.MAX_LEN).strip())
 
         return self._cap((raw_text or "").strip())
 
-    def extract_text_from_file(self, *, filename: str, data: bytes) -> str:
-        """Best-effort extraction for uploaded files (text/json)."""
-        name = (filename or "").lower()
-        mime, _ = mimetypes.guess_type(name)
-
-        # Try JSON first if hinted by extension or MIME type.
-        if name.endswith(".json") or (mime and mime == "application/json"):
-            try:
-                decoded = data.decode("utf-8", errors="ignore")
-                parsed = json.loads(decoded)
-                return self.extract_text(raw_text=None, raw_json=parsed)
-            except Exception:
-                pass
-
-        # Text-like files: decode and trim.
-        if name.endswith((".txt", ".md", ".log", ".csv")) or (mime and mime.startswith("text/")):
-            return self._cap(data.decode("utf-8", errors="ignore").strip())
+    def extract_json_stream(self, stream: TextIO) -> str:
+        """
+        `path: value` lines for a JSON document read incrementally from a text
+        stream. Parsing stops once MAX_LEN characters are produced, so a large
+        export costs no more than its first MAX_LEN characters of output.
+        Raises JSONStreamError if the document is invalid before that point.
+        """
+        events = iter_json_events(stream, max_string=self.MAX_LEN)
+        return self._cap(flatten_events(events, max_len=self.MAX_LEN).strip())
 
-        # Fallback: attempt utf-8 then latin-1 decode.
-        try:
-            text = data.decode("utf-8")
-        except UnicodeDecodeError:
-            text = data.decode("latin-1", errors="ignore")
-
-        return self._cap(text.strip())
+    def extract_text_from_file(self, *, filename: str, data: bytes) -> str:
+        """Format-aware extraction for uploaded files (see extractors.ExtractorRegistry)."""
+        return self.extract_file_stream(filename=filename, stream=io.BytesIO(data))
+
+    def extract_file_stream(self, *, filename: str, stream: BinaryIO) -> str:
+        """Like extract_text_from_file, reading a binary stream incrementally."""
+        return self._cap(get_extractor_registry().extract(stream, filename=filename or "", max_len=self.MAX_LEN))
+
+    def build_classification_text(self, evidence) -> tuple[str, list[str]]:
+        """
+        Text the classifier (and its embeddings) work on: evidence fields plus
+        keyword hints for sources the FTS catalog would otherwise miss.
+        Shared with the embedding backfill so content hashes line up.
+        """
+        parts = [
+            evidence.title or "",
+            evidence.description or "",
+            evidence.evidence_type_id or "",
+            evidence.source_type_id or "",
+            evidence.extracted_text or "",
+        ]
+        text = "\n".join([p for p in parts if p]).strip()
+        hints = []
+        if (evidence.source_type_id or "").lower() in self.AWS_SOURCE_TYPES:
+            hints.append(self.AWS_SOURCE_HINT)
+        if "s3:" in (evidence.extracted_text or "").lower():
+            hints.append(self.S3_POLICY_HINT)
+        return text + "\n" + " ".join(hints), hints
 
     def content_hash(self, text: str) -> str:
         """Stable hash used to reuse classifications for identical payloads."""
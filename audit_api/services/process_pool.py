@@ -0,0 +1,75 @@
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import get_context
+from typing import Callable, Iterable, Iterator, Optional, TypeVar
+
+import django
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class WorkerPool:
+    """
+    Spawned process pool whose `map` keeps a bounded number of tasks in
+    flight. Use as a context manager to reuse the same processes across
+    several `map` calls (e.g. one per database batch); with `workers <= 1`
+    everything runs inline.
+
+    Workers are spawned, not forked, so they never share the parent's
+    database connection; each runs django.setup() before unpickling its first
+    task, since importing audit_api needs ready apps. Task functions must be
+    module-level and must not use the database.
+    """
+
+    def __init__(self, workers: int, *, max_in_flight: Optional[int] = None) -> None:
+        self.workers = max(1, workers)
+        self.max_in_flight = max_in_flight or self.workers * 2
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "WorkerPool":
+        if self.workers > 1:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=get_context("spawn"), initializer=django.setup
+            )
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def map(self, fn: Callable[[T], R], items: Iterable[T]) -> Iterator[R]:
+        """
+        Yield `fn(item)` for each item as tasks complete (unordered). At most
+        `max_in_flight` tasks are submitted ahead of the consumer, so `items`
+        is pulled lazily and a slow consumer (e.g. the parent writing to the
+        database) applies backpressure instead of letting results pile up.
+        """
+        if self._executor is None:
+            for item in items:
+                yield fn(item)
+            return
+
+        pending = set()
+        for item in items:
+            if len(pending) >= self.max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            pending.add(self._executor.submit(fn, item))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def parallel_map(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    *,
+    workers: int,
+    max_in_flight: Optional[int] = None,
+) -> Iterator[R]:
+    """One-shot WorkerPool(workers).map(fn, items); see WorkerPool."""
+    with WorkerPool(workers, max_in_flight=max_in_flight) as pool:
+        yield from pool.map(fn, items)
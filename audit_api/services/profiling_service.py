@@ -0,0 +1,99 @@
+import cProfile
+import random
+from pathlib import Path
+from typing import Any, Optional
+from uuid import UUID
+
+from django.conf import settings
+from django.utils import timezone
+
+from audit_api.models import AiPipelineRun
+
+PROFILE_HEADER = "X-AuditMind-Profile"
+TRUTHY = {"1", "true", "yes"}
+
+
+def profile_requested(request) -> bool:
+    """
+    Header (or ?profile=1) opt-in used by the classify/upload views. Only staff
+    may force a profile: profiled runs are serialized and written to disk.
+    """
+    user = getattr(request, "user", None)
+    if not (user is not None and user.is_authenticated and user.is_staff):
+        return False
+    value = request.headers.get(PROFILE_HEADER) or request.query_params.get("profile") or ""
+    return value.strip().lower() in TRUTHY
+
+
+class ClassificationProfiler:
+    """
+    Opt-in cProfile capture for classification runs.
+
+    A run is profiled when the caller asks for it (header / job flag) or when it
+    falls inside CLASSIFICATION_PROFILE_SAMPLE_RATE. Profiles are written as
+    pstats dumps under CLASSIFICATION_PROFILE_DIR and referenced from
+    AiPipelineRun.details["profile"]; only the newest MAX_FILES are kept.
+    """
+
+    def __init__(
+        self,
+        *,
+        sample_rate: Optional[float] = None,
+        profile_dir: Optional[Path] = None,
+        max_files: Optional[int] = None,
+    ) -> None:
+        self.sample_rate = (
+            settings.CLASSIFICATION_PROFILE_SAMPLE_RATE if sample_rate is None else sample_rate
+        )
+        self.profile_dir = Path(profile_dir or settings.CLASSIFICATION_PROFILE_DIR)
+        self.max_files = settings.CLASSIFICATION_PROFILE_MAX_FILES if max_files is None else max_files
+
+    def should_profile(self, requested: bool = False) -> bool:
+        if requested:
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def start(self) -> Optional[cProfile.Profile]:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active on this thread; skip rather than fail the run.
+            return None
+        return profiler
+
+    def path_for(self, pipeline_run_id: UUID | str) -> Path:
+        return self.profile_dir / f"{UUID(str(pipeline_run_id))}.prof"
+
+    def attach(self, profiler: cProfile.Profile, *, pipeline_run_id: UUID | str) -> dict[str, Any]:
+        profiler.disable()
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(pipeline_run_id)
+        profiler.dump_stats(str(path))
+
+        reference = {
+            "path": str(path.relative_to(settings.AUDITMIND_VAR_DIR)),
+            "format": "pstats",
+            "bytes": path.stat().st_size,
+            "captured_at": timezone.now().isoformat(),
+        }
+        run = AiPipelineRun.objects.filter(pk=pipeline_run_id).first()
+        if run:
+            run.details = {**(run.details or {}), "profile": reference}
+            run.save(update_fields=["details", "updated_at"])
+
+        self._prune()
+        return reference
+
+    def _prune(self) -> None:
+        if self.max_files <= 0:
+            return
+        dated = []
+        for path in self.profile_dir.glob("*.prof"):
+            try:
+                dated.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                continue  # pruned concurrently by another process
+        dated.sort(reverse=True)
+        for _mtime, stale in dated[self.max_files:]:
+            stale.unlink(missing_ok=True)
@@ -0,0 +1,123 @@
+import json
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from django.db.models import QuerySet
+
+from audit_api.models import Evidence
+from audit_api.services.preprocessing_service import EvidencePreprocessingService
+from audit_api.services.process_pool import parallel_map
+from audit_api.services.storage_service import EvidenceStorageService
+
+Item = Tuple[str, str]  # (evidence_id, storage_path)
+
+
+def reextract_chunk(items: List[Item]) -> List[Dict]:
+    """
+    Worker-side: re-extract text for stored files. Each file is mapped, not
+    read: the checksum hashes the mapping directly and the extractor streams
+    from it. Runs in pool processes, so it never touches the database.
+    """
+    storage = EvidenceStorageService()
+    preprocessing = EvidencePreprocessingService()
+    results = []
+    for evidence_id, storage_path in items:
+        filename = storage_path.rsplit("/", 1)[-1]
+        try:
+            with storage.open_mapped(storage_path) as view:
+                checksum = storage.checksum(view)
+                if filename == "raw.json" and view[:1] == b'"':
+                    # Legacy payload: JSON sent as a string was stored as a string
+                    # literal; extract it the way ingest did (see EvidenceService).
+                    text = preprocessing.extract_text(raw_text=None, raw_json=json.loads(bytes(view)))
+                else:
+                    with storage.stream_view(view) as stream:
+                        text = preprocessing.extract_file_stream(filename=filename, stream=stream)
+                size = len(view)
+        except (OSError, ValueError) as exc:
+            results.append({"id": evidence_id, "error": str(exc)})
+            continue
+        results.append({"id": evidence_id, "text": text, "checksum": checksum, "file_size": size})
+    return results
+
+
+class EvidenceReextractionService:
+    """
+    Re-runs text extraction over stored evidence files (e.g. after an
+    extractor improvement) in a process pool. The parent pages through
+    evidence by primary key, feeds (id, storage_path) chunks to the workers
+    with bounded look-ahead, and writes back only rows whose text, checksum
+    or size changed. Evidence whose text changed is reported so it can be
+    re-classified.
+    """
+
+    def __init__(self, *, workers: int, chunk_size: int = 8, batch_size: int = 200) -> None:
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+
+    @staticmethod
+    def queryset(organization_id=None) -> QuerySet:
+        qs = Evidence.objects.filter(storage_path__startswith=EvidenceStorageService.SCHEME)
+        if organization_id:
+            qs = qs.filter(organization_id=organization_id)
+        return qs
+
+    def _chunks(self, qs: QuerySet, limit: Optional[int]) -> Iterator[List[Item]]:
+        last_id = None
+        sent = 0
+        while limit is None or sent < limit:
+            page = qs.order_by("id")
+            if last_id is not None:
+                page = page.filter(id__gt=last_id)
+            size = self.batch_size if limit is None else min(self.batch_size, limit - sent)
+            rows = [(str(pk), path) for pk, path in page.values_list("id", "storage_path")[:size]]
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            sent += len(rows)
+            for start in range(0, len(rows), self.chunk_size):
+                yield rows[start : start + self.chunk_size]
+
+    def _write(self, results: List[Dict], *, dry_run: bool) -> Tuple[int, List[str]]:
+        """Returns (rows updated, ids whose extracted text changed)."""
+        by_id = {r["id"]: r for r in results}
+        updated = []
+        text_changed = []
+        for evidence in Evidence.objects.filter(id__in=list(by_id)).only("id", "extracted_text", "checksum", "file_size"):
+            result = by_id[str(evidence.id)]
+            current = (evidence.extracted_text or "", evidence.checksum, evidence.file_size)
+            if current == (result["text"], result["checksum"], result["file_size"]):
+                continue
+            if current[0] != result["text"]:
+                text_changed.append(str(evidence.id))
+            evidence.extracted_text = result["text"]
+            evidence.checksum = result["checksum"]
+            evidence.file_size = result["file_size"]
+            updated.append(evidence)
+        if updated and not dry_run:
+            Evidence.objects.bulk_update(updated, ["extracted_text", "checksum", "file_size"])
+        return len(updated), text_changed
+
+    def run(self, *, organization_id=None, limit: Optional[int] = None, dry_run: bool = False) -> Dict:
+        totals = {"processed": 0, "updated": 0, "errors": 0, "text_changed_ids": []}
+        pending: List[Dict] = []
+
+        def flush() -> None:
+            count, ids = self._write(pending, dry_run=dry_run)
+            totals["updated"] += count
+            totals["text_changed_ids"].extend(ids)
+            pending.clear()
+
+        chunks = self._chunks(self.queryset(organization_id), limit)
+        for results in parallel_map(reextract_chunk, chunks, workers=self.workers):
+            for result in results:
+                totals["processed"] += 1
+                if "error" in result:
+                    totals["errors"] += 1
+                    continue
+                pending.append(result)
+            if len(pending) >= self.batch_size:
+                flush()
+        if pending:
+            flush()
+        return totals
@@ -0,0 +1,242 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from django.db import transaction
+from django.db.models import F, Q, Sum
+from django.utils import timezone
+
+from audit_api.models import (
+    AgentRun,
+    AgentStepLog,
+    ClassificationDailyRollup,
+    PipelineDailyRollup,
+    RollupWatermark,
+    StepLatencyDailyRollup,
+)
+from audit_api.services.metrics_service import LATENCY_BUCKETS
+
+WATERMARK_NAME = "classification_rollups"
+CONFIDENCE_BUCKETS: Tuple[Tuple[float, str], ...] = (
+    (0.5, "0.0-0.5"),
+    (0.7, "0.5-0.7"),
+    (0.9, "0.7-0.9"),
+    (float("inf"), "0.9-1.0"),
+)
+
+
+def confidence_bucket(confidence: float) -> str:
+    for upper, label in CONFIDENCE_BUCKETS:
+        if confidence < upper:
+            return label
+    return CONFIDENCE_BUCKETS[-1][1]
+
+
+def latency_bucket_index(seconds: float) -> int:
+    for index, upper in enumerate(LATENCY_BUCKETS):
+        if seconds <= upper:
+            return index
+    return len(LATENCY_BUCKETS)
+
+
+def histogram_percentile(bucket_counts: List[int], pct: float) -> Optional[float]:
+    """Estimate a percentile in ms from bucket counts (linear within a bucket, like histogram_quantile)."""
+    total = sum(bucket_counts)
+    if not total:
+        return None
+    target = pct / 100.0 * total
+    seen = 0
+    for index, count in enumerate(bucket_counts):
+        if count and seen + count >= target:
+            lower = LATENCY_BUCKETS[index - 1] if index > 0 else 0.0
+            if index >= len(LATENCY_BUCKETS):
+                return round(LATENCY_BUCKETS[-1] * 1000, 3)
+            upper = LATENCY_BUCKETS[index]
+            return round((lower + (upper - lower) * (target - seen) / count) * 1000, 3)
+        seen += count
+    return round(LATENCY_BUCKETS[-1] * 1000, 3)
+
+
+class RollupService:
+    """
+    Incrementally maintained analytics rollups.
+
+    `refresh` processes AgentRuns finished since the (finished_at, id) watermark,
+    ignoring the last `lag_seconds` so in-flight commits are not skipped, and
+    applies counter increments plus the watermark move in one transaction.
+    Dashboards then read the small rollup tables instead of scanning
+    classifier_outputs / events JSON.
+    """
+
+    def refresh(self, *, lag_seconds: int = 60, batch_size: int = 1000, max_batches: Optional[int] = None) -> int:
+        processed = 0
+        batches = 0
+        upper = timezone.now() - timedelta(seconds=lag_seconds)
+        while max_batches is None or batches < max_batches:
+            count = self._process_batch(upper=upper, batch_size=batch_size)
+            processed += count
+            batches += 1
+            if count < batch_size:
+                break
+        return processed
+
+    @transaction.atomic
+    def _process_batch(self, *, upper: datetime, batch_size: int) -> int:
+        watermark, _ = RollupWatermark.objects.select_for_update().get_or_create(
+            name=WATERMARK_NAME,
+            defaults={"position": datetime(1970, 1, 1, tzinfo=dt_timezone.utc)},
+        )
+        after = Q(finished_at__gt=watermark.position)
+        if watermark.last_id:
+            after |= Q(finished_at=watermark.position, id__gt=watermark.last_id)
+        runs = list(
+            AgentRun.objects.filter(after, finished_at__lte=upper, evidence__isnull=False)
+            .select_related("evidence")
+            .order_by("finished_at", "id")[:batch_size]
+        )
+        if not runs:
+            return 0
+
+        self._apply(runs)
+        last = runs[-1]
+        watermark.position = last.finished_at
+        watermark.last_id = last.id
+        watermark.save(update_fields=["position", "last_id", "updated_at"])
+        return len(runs)
+
+    def _apply(self, runs: List[AgentRun]) -> None:
+        control_counts: Dict[Tuple[UUID, date, str, str], int] = defaultdict(int)
+        pipeline_counts: Dict[Tuple[UUID, date], Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        run_keys = {}
+
+        for run in runs:
+            org_id = run.evidence.organization_id
+            day = run.finished_at.date()
+            run_keys[run.id] = (org_id, day)
+            details = run.details or {}
+            counts = pipeline_counts[(org_id, day)]
+            counts["run_count"] += 1
+            if run.status == "failed":
+                counts["failed_count"] += 1
+                continue
+            if details.get("cache_hit"):
+                counts["cache_hit_count"] += 1
+            result = details.get("result") or {}
+            bucket = confidence_bucket(float(result.get("confidence") or 0.0))
+            for reference in result.get("primary_controls") or []:
+                control_counts[(org_id, day, reference, bucket)] += 1
+
+        step_stats: Dict[Tuple[UUID, date, str], Dict[str, Any]] = {}
+        steps = AgentStepLog.objects.filter(
+            agent_run_id__in=list(run_keys),
+            finished_at__isnull=False,
+        ).values_list("agent_run_id", "step_name", "started_at", "finished_at")
+        for agent_run_id, step_name, started_at, finished_at in steps:
+            org_id, day = run_keys[agent_run_id]
+            seconds = max(0.0, (finished_at - started_at).total_seconds())
+            stats = step_stats.setdefault(
+                (org_id, day, step_name),
+                {"count": 0, "total_ms": 0.0, "buckets": [0] * (len(LATENCY_BUCKETS) + 1)},
+            )
+            stats["count"] += 1
+            stats["total_ms"] += seconds * 1000
+            stats["buckets"][latency_bucket_index(seconds)] += 1
+
+        for (org_id, day, reference, bucket), n in control_counts.items():
+            self._increment(
+                ClassificationDailyRollup,
+                {"organization_id": org_id, "day": day, "control_reference": reference, "confidence_bucket": bucket},
+                {"run_count": n},
+            )
+        for (org_id, day), counts in pipeline_counts.items():
+            self._increment(PipelineDailyRollup, {"organization_id": org_id, "day": day}, counts)
+        for (org_id, day, step_name), stats in step_stats.items():
+            row, _ = StepLatencyDailyRollup.objects.select_for_update().get_or_create(
+                organization_id=org_id,
+                day=day,
+                step_name=step_name,
+                defaults={"bucket_counts": [0] * (len(LATENCY_BUCKETS) + 1)},
+            )
+            existing = list(row.bucket_counts or []) + [0] * (len(stats["buckets"]) - len(row.bucket_counts or []))
+            row.bucket_counts = [a + b for a, b in zip(existing, stats["buckets"])]
+            row.sample_count += stats["count"]
+            row.total_ms += stats["total_ms"]
+            row.save(update_fields=["bucket_counts", "sample_count", "total_ms", "updated_at"])
+
+    @staticmethod
+    def _increment(model, keys: Dict[str, Any], increments: Dict[str, int]) -> None:
+        updated = model.objects.filter(**keys).update(
+            **{field: F(field) + value for field, value in increments.items()},
+            updated_at=timezone.now(),
+        )
+        if not updated:
+            model.objects.create(**keys, **increments)
+
+    # --- read side -------------------------------------------------------
+
+    def summary(self, organization_id: UUID | str, *, start: date, end: date) -> Dict[str, Any]:
+        controls = (
+            ClassificationDailyRollup.objects.filter(organization_id=organization_id, day__range=(start, end))
+            .order_by("day", "control_reference", "confidence_bucket")
+            .values("day", "control_reference", "confidence_bucket", "run_count")
+        )
+        control_totals = (
+            ClassificationDailyRollup.objects.filter(organization_id=organization_id, day__range=(start, end))
+            .values("control_reference")
+            .annotate(run_count=Sum("run_count"))
+            .order_by("-run_count", "control_reference")
+        )
+
+        pipeline = []
+        for row in PipelineDailyRollup.objects.filter(
+            organization_id=organization_id, day__range=(start, end)
+        ).order_by("day"):
+            pipeline.append(
+                {
+                    "day": row.day,
+                    "run_count": row.run_count,
+                    "cache_hit_count": row.cache_hit_count,
+                    "failed_count": row.failed_count,
+                    "cache_hit_ratio": round(row.cache_hit_count / row.run_count, 4) if row.run_count else None,
+                }
+            )
+
+        return {
+            "organization_id": str(organization_id),
+            "start": start,
+            "end": end,
+            "controls": list(controls),
+            "control_totals": list(control_totals),
+            "pipeline": pipeline,
+            "step_latency": self._merged_latency(
+                StepLatencyDailyRollup.objects.filter(organization_id=organization_id, day__range=(start, end))
+            ),
+        }
+
+    @staticmethod
+    def _merged_latency(rows: Iterable[StepLatencyDailyRollup]) -> List[Dict[str, Any]]:
+        merged: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            entry = merged.setdefault(
+                row.step_name,
+                {"count": 0, "total_ms": 0.0, "buckets": [0] * (len(LATENCY_BUCKETS) + 1)},
+            )
+            entry["count"] += row.sample_count
+            entry["total_ms"] += row.total_ms
+            for index, value in enumerate(row.bucket_counts or []):
+                entry["buckets"][index] += value
+
+        out = []
+        for step_name, entry in sorted(merged.items()):
+            out.append(
+                {
+                    "step_name": step_name,
+                    "count": entry["count"],
+                    "mean_ms": round(entry["total_ms"] / entry["count"], 3) if entry["count"] else None,
+                    "p50_ms": histogram_percentile(entry["buckets"], 50),
+                    "p95_ms": histogram_percentile(entry["buckets"], 95),
+                    "p99_ms": histogram_percentile(entry["buckets"], 99),
+                }
+            )
+        return out
@@ -1,14 +1,64 @@
 import hashlib
+import io
 import json
+import mmap
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Iterator
+
 from django.conf import settings
 
+
+class MappedReader(io.RawIOBase):
+    """
+    Seekable read-only stream over a memoryview, so extractors can consume a
+    memory-mapped file through the normal file API (wrap in BufferedReader or
+    TextIOWrapper); reads copy only the requested chunk out of the page cache.
+    """
+
+    def __init__(self, view: memoryview) -> None:
+        super().__init__()
+        self._view = view
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        end = min(len(self._view), self._pos + len(buffer))
+        n = end - self._pos
+        buffer[:n] = self._view[self._pos : end]
+        self._pos = end
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._view)}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def close(self) -> None:
+        self._view = memoryview(b"")  # drop the export so the mmap can close
+        super().close()
+
+
 class EvidenceStorageService:
     """
     Writes evidence payload to local filesystem (dev) and returns a URI like:
     local://uploads/<org>/<evidence>/raw.json
+
+    Stored files are read back memory-mapped (`open_mapped`), so re-extraction
+    and checksums work on the page cache instead of copying whole files into
+    Python bytes.
     """
 
+    SCHEME = "local://uploads/"
+
     def write_raw_payload(
         self,
         organization_id,
@@ -56,3 +106,46 @@ class EvidenceStorageService:
         uri = f"local://uploads/{organization_id}/{evidence_id}/{safe_name}"
         size = len(data)
         return uri, size, checksum
+
+    def resolve_path(self, uri: str) -> Path:
+        """Filesystem path for a `local://uploads/...` URI; refuses other schemes and paths outside the upload dir."""
+        if not (uri or "").startswith(self.SCHEME):
+            raise ValueError(f"Unsupported storage URI: {uri!r}")
+        base_dir = Path(settings.EVIDENCE_UPLOAD_DIR).resolve()
+        path = (base_dir / uri[len(self.SCHEME) :]).resolve()
+        if base_dir not in path.parents:
+            raise ValueError(f"Storage URI escapes the upload directory: {uri!r}")
+        return path
+
+    @contextmanager
+    def open_mapped(self, uri: str) -> Iterator[memoryview]:
+        """Read-only memoryview of a stored file, backed by mmap (empty files give an empty view)."""
+        with open(self.resolve_path(uri), "rb") as handle:
+            if handle.seek(0, io.SEEK_END) == 0:
+                yield memoryview(b"")
+                return
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    yield view
+                finally:
+                    view.release()
+
+    @staticmethod
+    @contextmanager
+    def stream_view(view: memoryview) -> Iterator[io.BufferedReader]:
+        """Buffered binary stream over a mapped view, for extractors."""
+        stream = io.BufferedReader(MappedReader(view), buffer_size=1 << 20)
+        try:
+            yield stream
+        finally:
+            stream.close()
+
+    @contextmanager
+    def open_stream(self, uri: str) -> Iterator[io.BufferedReader]:
+        with self.open_mapped(uri) as view, self.stream_view(view) as stream:
+            yield stream
+
+    @staticmethod
+    def checksum(view: memoryview) -> str:
+        return hashlib.sha256(view).hexdigest()
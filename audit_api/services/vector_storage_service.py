@@ -0,0 +1,200 @@
+import hashlib
+import re
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import QuerySet
+from django.db.models.functions import Cast
+from pgvector import HalfVector
+from pgvector.django import BitField, HalfVectorField, HammingDistance, L2Distance, VectorField
+
+STORAGE_MODES = ("full", "halfvec", "binary")
+
+# mode -> (column, pgvector type, operator class)
+VECTOR_COLUMNS: Dict[str, Tuple[str, str, str]] = {
+    "full": ("vector", "vector", "vector_l2_ops"),
+    "halfvec": ("vector_half", "halfvec", "halfvec_l2_ops"),
+    "binary": ("vector_bits", "bit", "bit_hamming_ops"),
+}
+
+# Tables holding per-model vectors; chunk embeddings only carry full precision.
+VECTOR_TABLES: Dict[str, Tuple[str, ...]] = {
+    "evidence_embeddings": STORAGE_MODES,
+    "evidence_chunk_embeddings": ("full",),
+}
+
+
+def binary_quantize(vector: List[float]) -> str:
+    """Sign bit per dimension, matching pgvector's binary_quantize()."""
+    return "".join("1" if x > 0 else "0" for x in vector)
+
+
+def quantized_columns(vector: List[float]) -> Dict[str, object]:
+    return {"vector_half": HalfVector(vector), "vector_bits": binary_quantize(vector)}
+
+
+def index_name(table: str, model_name: str, mode: str) -> str:
+    """Stable, <= 63 char index name per (table, model, mode)."""
+    slug = re.sub(r"[^a-z0-9]+", "_", model_name.lower()).strip("_")[:20]
+    digest = hashlib.sha1(model_name.encode("utf-8")).hexdigest()[:8]
+    prefix = "emb" if table == "evidence_embeddings" else "chunk"
+    return f"{prefix}_{slug}_{digest}_{mode}_hnsw"
+
+
+def _typed(column: str, mode: str, dims: int) -> Cast:
+    if mode == "halfvec":
+        return Cast(column, HalfVectorField(dimensions=dims))
+    if mode == "binary":
+        return Cast(column, BitField(length=dims))
+    return Cast(column, VectorField(dimensions=dims))
+
+
+class VectorStorageService:
+    """
+    Nearest-neighbour search over one embedding model's vectors in the
+    configured storage mode (EMBEDDING_VECTOR_STORAGE).
+
+    - full: HNSW over the float4 `vector` column.
+    - halfvec: HNSW over `vector_half` (half the index size), then re-rank the
+      top `rerank_k` on full precision.
+    - binary: HNSW over `vector_bits` by Hamming distance (1/32 of the size),
+      then re-rank a wider candidate set on full precision.
+
+    Vector columns are dimensionless, so every index is a partial expression
+    index `((col::type(dims))) WHERE model_name = <model>`; queries filter on
+    the model and use the same cast so the planner can pick it. The threshold
+    is always applied to the full-precision L2 distance, so cache-hit
+    semantics do not change between modes; only recall can.
+    """
+
+    def __init__(
+        self,
+        *,
+        model_name: str,
+        dims: int,
+        mode: Optional[str] = None,
+        rerank_k: Optional[int] = None,
+    ) -> None:
+        self.model_name = model_name
+        self.dims = dims
+        self.mode = mode or settings.EMBEDDING_VECTOR_STORAGE
+        if self.mode not in STORAGE_MODES:
+            raise ValueError(f"Unknown EMBEDDING_VECTOR_STORAGE {self.mode!r}; expected one of {STORAGE_MODES}")
+        self.rerank_k = rerank_k or settings.EMBEDDING_RERANK_K
+
+    def distance(self, vector: List[float], *, mode: str = "full"):
+        column = VECTOR_COLUMNS[mode][0]
+        if mode == "halfvec":
+            return L2Distance(_typed(column, mode, self.dims), HalfVector(vector))
+        if mode == "binary":
+            return HammingDistance(_typed(column, mode, self.dims), binary_quantize(vector))
+        return L2Distance(_typed(column, mode, self.dims), vector)
+
+    def candidate_ids(self, queryset: QuerySet, vector: List[float]) -> List:
+        limit = self.rerank_k if self.mode == "halfvec" else self.rerank_k * 4
+        ranked = queryset.order_by(self.distance(vector, mode=self.mode))[:limit]
+        return list(ranked.values_list("id", flat=True))
+
+    def nearest(self, queryset: QuerySet, vector: List[float], *, threshold: float):
+        """Closest row of this model within `threshold` (full-precision L2), annotated with `distance`, or None."""
+        queryset = queryset.filter(model_name=self.model_name)
+        if self.mode != "full":
+            queryset = queryset.filter(id__in=self.candidate_ids(queryset, vector))
+        return (
+            queryset.annotate(distance=self.distance(vector))
+            .filter(distance__lte=threshold)
+            .order_by("distance")
+            .first()
+        )
+
+    def chunk_neighbours(
+        self, probes: List[Tuple[int, List[float]]], *, k: int, threshold: float
+    ) -> List[Tuple[int, object, int, float]]:
+        """
+        Nearest stored chunks of this model for many query vectors in one round
+        trip: (probe index, evidence_id, chunk_index, distance) rows, at most
+        `k` per probe and within `threshold`. Each probe is a LATERAL
+        subquery ordered by the same expression as the chunk HNSW index.
+        """
+        if not probes:
+            return []
+        typed = f'("vector")::vector({self.dims})'
+        sql = (
+            "SELECT q.idx, n.evidence_id, n.chunk_index, n.distance "
+            "FROM unnest(%s::int[], %s::text[]) AS q(idx, vec) "
+            "CROSS JOIN LATERAL ("
+            f"  SELECT evidence_id, chunk_index, {typed} <-> q.vec::vector({self.dims}) AS distance"
+            "  FROM evidence_chunk_embeddings WHERE model_name = %s"
+            f"  ORDER BY {typed} <-> q.vec::vector({self.dims}) LIMIT %s"
+            ") n WHERE n.distance <= %s"
+        )
+        indexes = [index for index, _vector in probes]
+        literals = ["[" + ",".join(repr(float(x)) for x in vector) + "]" for _index, vector in probes]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [indexes, literals, self.model_name, k, threshold])
+            rows = cursor.fetchall()
+        return [(idx, evidence_id, chunk_index, float(distance)) for idx, evidence_id, chunk_index, distance in rows]
+
+    # --- index management ------------------------------------------------
+
+    def index_sql(self, table: str, mode: str, *, concurrently: bool = True) -> Tuple[str, str]:
+        column, pgtype, opclass = VECTOR_COLUMNS[mode]
+        name = index_name(table, self.model_name, mode)
+        # DDL cannot take bind parameters, so the model name is inlined as a literal.
+        model_literal = "'" + self.model_name.replace("'", "''") + "'"
+        sql = (
+            f'CREATE INDEX {"CONCURRENTLY " if concurrently else ""}IF NOT EXISTS "{name}" '
+            f'ON "{table}" USING hnsw ((("{column}")::{pgtype}({self.dims})) {opclass}) '
+            f"WITH (m = 16, ef_construction = 64) WHERE model_name = {model_literal}"
+        )
+        return name, sql
+
+    def ensure_index(self, mode: Optional[str] = None, *, concurrently: bool = True) -> List[str]:
+        """Create this model's HNSW index for `mode` on every table that stores that column."""
+        mode = mode or self.mode
+        created = []
+        with connection.cursor() as cursor:
+            for table, modes in VECTOR_TABLES.items():
+                if mode not in modes:
+                    continue
+                name, sql = self.index_sql(table, mode, concurrently=concurrently)
+                cursor.execute(sql)
+                created.append(name)
+        return created
+
+    def drop_unused_indexes(self) -> List[str]:
+        dropped = []
+        with connection.cursor() as cursor:
+            for mode in STORAGE_MODES:
+                if mode == self.mode:
+                    continue
+                name = index_name("evidence_embeddings", self.model_name, mode)
+                cursor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+                dropped.append(name)
+        return dropped
+
+    @staticmethod
+    def index_size(name: str) -> Optional[int]:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_relation_size(to_regclass(%s))", [name])
+            row = cursor.fetchone()
+        return row[0] if row and row[0] is not None else None
+
+    @staticmethod
+    def backfill_quantized(batch_size: int = 5000) -> int:
+        """Fill quantized columns for rows written before they existed (idempotent)."""
+        total = 0
+        with connection.cursor() as cursor:
+            while True:
+                cursor.execute(
+                    "UPDATE evidence_embeddings SET vector_half = vector::halfvec, "
+                    "vector_bits = binary_quantize(vector) "
+                    "WHERE id IN (SELECT id FROM evidence_embeddings "
+                    "WHERE vector_half IS NULL OR vector_bits IS NULL LIMIT %s)",
+                    [batch_size],
+                )
+                total += cursor.rowcount
+                if cursor.rowcount < batch_size:
+                    return total
+
@@ -3,17 +3,17 @@ import django_rq
 from audit_api.models import Task
 
 
-def classify_evidence_task(evidence_id: str) -> dict:
+def classify_evidence_task(evidence_id: str, profile: bool = False) -> dict:
     """Background job to classify evidence."""
     from audit_api.orchestration.coordinator import OrchestrationCoordinator
 
     coordinator = OrchestrationCoordinator()
-    return coordinator.classify_evidence(evidence_id=evidence_id)
+    return coordinator.classify_evidence(evidence_id=evidence_id, profile=profile)
 
 
-def enqueue_classification(evidence_id: str):
+def enqueue_classification(evidence_id: str, *, profile: bool = False):
     queue = django_rq.get_queue("default")
-    job = queue.enqueue(classify_evidence_task, evidence_id)
+    job = queue.enqueue(classify_evidence_task, evidence_id, profile)
     return job
 
 
@@ -40,3 +40,102 @@ def enqueue_task_processing(task_id: str):
     queue = django_rq.get_queue("default")
     job = queue.enqueue("audit_api.tasks.process_task_task", task_id)
     return job
+
+
+def refresh_rollups_task(lag_seconds: int = 60) -> dict:
+    """Background job to fold newly finished pipeline runs into the analytics rollups."""
+    from audit_api.services.rollup_service import RollupService
+
+    return {"processed": RollupService().refresh(lag_seconds=lag_seconds)}
+
+
+def enqueue_rollup_refresh(*, lag_seconds: int = 60):
+    queue = django_rq.get_queue("default")
+    job = queue.enqueue(refresh_rollups_task, lag_seconds)
+    return job
+
+
+def sync_control_embeddings_task(model_name: str) -> dict:
+    """Background job to embed new or changed controls for a model."""
+    from audit_api.services.control_vector_service import ControlVectorService
+    from audit_api.services.embedding_service import EmbeddingService
+
+    return ControlVectorService(EmbeddingService(model_name=model_name)).sync()
+
+
+def enqueue_control_embedding_sync(model_name: str):
+    queue = django_rq.get_queue("default")
+    job = queue.enqueue(sync_control_embeddings_task, model_name)
+    return job
+
+
+def embedding_backfill_task(
+    model_name: str,
+    batch_size: int = 200,
+    batches_per_job: int = 10,
+    workers: int = 4,
+    rate_limit: float = 0.0,
+    processes: int = 0,
+    sub_batch_size: int = 32,
+) -> dict:
+    """
+    Runs a slice of an embedding backfill, then re-enqueues itself while the
+    cursor is still running, so the backfill survives worker restarts and
+    never holds a worker for long.
+    """
+    from audit_api.models import EmbeddingBackfillCursor
+    from audit_api.services.embedding_backfill_service import EmbeddingBackfillService
+
+    service = EmbeddingBackfillService(
+        model_name=model_name,
+        batch_size=batch_size,
+        sub_batch_size=sub_batch_size,
+        workers=workers,
+        rate_limit=rate_limit,
+        processes=processes,
+    )
+    cursor = EmbeddingBackfillCursor.objects.get(model_name=service.model_name)
+    result = service.run(cursor, max_batches=batches_per_job)
+
+    cursor.refresh_from_db()
+    if cursor.status == "running":
+        job = enqueue_embedding_backfill(
+            service.model_name,
+            batch_size=batch_size,
+            sub_batch_size=sub_batch_size,
+            batches_per_job=batches_per_job,
+            workers=workers,
+            rate_limit=rate_limit,
+            processes=processes,
+        )
+        result["next_job_id"] = job.id
+    result["status"] = cursor.status
+    return result
+
+
+def enqueue_embedding_backfill(
+    model_name: str,
+    *,
+    batch_size: int = 200,
+    sub_batch_size: int = 32,
+    batches_per_job: int = 10,
+    workers: int = 4,
+    rate_limit: float = 0.0,
+    processes: int = 0,
+):
+    from audit_api.models import EmbeddingBackfillCursor
+
+    queue = django_rq.get_queue("default")
+    # sub_batch_size goes last so jobs queued before it existed still run.
+    job = queue.enqueue(
+        embedding_backfill_task,
+        model_name,
+        batch_size,
+        batches_per_job,
+        workers,
+        rate_limit,
+        processes,
+        sub_batch_size,
+    )
+    EmbeddingBackfillCursor.objects.filter(model_name=model_name).update(job_id=job.id)
+    return job
@@ -1,3 +1,949 @@
-from django.test import TestCase
+import asyncio
+import gzip
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from audit_api.agents.evidence_classifier import EvidenceClassifierAgent
+from audit_api.orchestration.dag import GraphExecutor, WorkflowContext, WorkflowGraph, WorkflowGraphError, WorkflowStep
+from audit_api.services import llm_validation_cache_service
+from audit_api import tasks
+from audit_api.services import (
+    classification_cache_service,
+    control_vector_service,
+    embedding_backends,
+    embedding_backfill_service,
+    embedding_memo_service,
+)
+from audit_api.services.bulk_preprocessing_service import BulkPreprocessingService, preprocess_rows
+from audit_api.services.chunking_service import TextChunk, TextChunkingService
+from audit_api.services.control_catalog_service import ControlCatalogService, control_hash
+from audit_api.services.control_search_service import ControlCandidate, ControlSearchService
+from audit_api.services.evidence_service import EvidenceService
+from audit_api.services.extractors import ExtractorRegistry
+from audit_api.services.json_flattener import JSONStreamError, _Reader, flatten_events, iter_json_events
+from audit_api.services.llm_providers import CircuitBreaker, StubValidationProvider, ValidationRequest
+from audit_api.services.llm_validation_cache_service import PromptFingerprint, resolve_validation_model
+from audit_api.services.llm_validation_service import LLMValidationService
+from audit_api.services.metrics_service import LATENCY_BUCKETS
+from audit_api.services.preprocessing_service import EvidencePreprocessingService
+from audit_api.services.profiling_service import ClassificationProfiler, profile_requested
+from audit_api.services.process_pool import WorkerPool
+from audit_api.services.reextraction_service import reextract_chunk
+from audit_api.services.rollup_service import confidence_bucket, histogram_percentile, latency_bucket_index
+from audit_api.services.storage_service import EvidenceStorageService
+from audit_api.views import MetricsView
+
+
+class MetricsAccessTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+
+    def get(self, **extra):
+        return MetricsView.as_view()(self.factory.get("/metrics", **extra))
+
+    def test_loopback_is_allowed(self):
+        self.assertEqual(self.get(REMOTE_ADDR="127.0.0.1").status_code, 200)
+
+    def test_outside_network_is_refused(self):
+        self.assertEqual(self.get(REMOTE_ADDR="203.0.113.7").status_code, 401)
+
+    @override_settings(METRICS_TOKEN="scrape-secret")
+    def test_bearer_token_is_allowed(self):
+        response = self.get(REMOTE_ADDR="203.0.113.7", HTTP_AUTHORIZATION="Bearer scrape-secret")
+        self.assertEqual(response.status_code, 200)
+        response = self.get(REMOTE_ADDR="203.0.113.7", HTTP_AUTHORIZATION="Bearer wrong")
+        self.assertEqual(response.status_code, 401)
+
+
+class ProfilingAccessTests(SimpleTestCase):
+    def request(self, *, staff: bool, **extra):
+        request = Request(APIRequestFactory().post("/api/evidence/", **extra))
+        request.user = SimpleNamespace(is_authenticated=True, is_staff=staff)
+        return request
+
+    def test_only_staff_can_force_profiling(self):
+        self.assertTrue(profile_requested(self.request(staff=True, HTTP_X_AUDITMIND_PROFILE="1")))
+        self.assertFalse(profile_requested(self.request(staff=False, HTTP_X_AUDITMIND_PROFILE="1")))
+
+    def test_prune_tolerates_files_removed_concurrently(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            profiler = ClassificationProfiler(profile_dir=Path(tmp), max_files=1)
+            for i in range(3):
+                path = Path(tmp) / f"{i}.prof"
+                path.write_bytes(b"")
+                os.utime(path, (i, i))
+            real_glob = Path.glob
+
+            def glob_with_ghost(self, pattern):
+                yield Path(tmp) / "gone.prof"
+                yield from real_glob(self, pattern)
+
+            with mock.patch.object(Path, "glob", glob_with_ghost):
+                profiler._prune()
+            self.assertEqual(sorted(p.name for p in Path(tmp).iterdir()), ["2.prof"])
+
+
+class RollupBucketTests(SimpleTestCase):
+    def test_confidence_bucket_boundaries(self):
+        self.assertEqual(confidence_bucket(0.0), "0.0-0.5")
+        self.assertEqual(confidence_bucket(0.4999), "0.0-0.5")
+        self.assertEqual(confidence_bucket(0.5), "0.5-0.7")
+        self.assertEqual(confidence_bucket(0.9), "0.9-1.0")
+        self.assertEqual(confidence_bucket(1.0), "0.9-1.0")
+
+    def test_latency_bucket_upper_bounds_are_inclusive(self):
+        self.assertEqual(latency_bucket_index(0.005), 0)
+        self.assertEqual(latency_bucket_index(0.006), 1)
+        self.assertEqual(latency_bucket_index(1000.0), len(LATENCY_BUCKETS))
+
+    def test_histogram_percentile(self):
+        counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.assertIsNone(histogram_percentile(counts, 50))
+
+        counts[0] = 10  # all within (0, 5ms]
+        self.assertEqual(histogram_percentile(counts, 50), 2.5)
+        self.assertEqual(histogram_percentile(counts, 100), 5.0)
+
+        counts[1] = 10  # (5ms, 10ms]
+        self.assertEqual(histogram_percentile(counts, 75), 7.5)
+
+        overflow = [0] * len(LATENCY_BUCKETS) + [3]
+        self.assertEqual(histogram_percentile(overflow, 99), LATENCY_BUCKETS[-1] * 1000)
+
+
+class SlowValidationProvider(StubValidationProvider):
+    def __init__(self, seconds: float) -> None:
+        self.seconds = seconds
+
+    def validate_batch(self, requests, *, timeout):
+        time.sleep(self.seconds)
+        return super().validate_batch(requests, timeout=timeout)
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def test_opens_half_opens_and_closes(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_seconds=0.05)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "closed")
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "open")
+        self.assertFalse(breaker.allow())
+
+        time.sleep(0.06)
+        self.assertEqual(breaker.state, "half_open")
+        self.assertTrue(breaker.allow())  # the single trial call
+        self.assertFalse(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.state, "closed")
+
+    def test_failed_trial_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "open")
+
+    def test_released_trial_lets_the_next_call_try(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        self.assertEqual(breaker.admit(), (True, True))
+        self.assertFalse(breaker.allow())
+        breaker.release_trial()
+        self.assertEqual(breaker.state, "half_open")
+        self.assertTrue(breaker.allow())
+
+
+@override_settings(LLM_VALIDATION_CACHE_ENABLED=False)
+class LLMValidationTimeoutTests(SimpleTestCase):
+    def service(self, *, seconds: float, timeout: float, queue_timeout: float = 30.0) -> LLMValidationService:
+        service = LLMValidationService(SlowValidationProvider(seconds), timeout=timeout, batch_size=1)
+        service.pool = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(service.pool.shutdown)
+        service.breaker = CircuitBreaker(failure_threshold=1, reset_seconds=60)
+        service.queue_timeout = queue_timeout
+        return service
+
+    def requests(self, n: int):
+        return [ValidationRequest(text=f"evidence {i}", control_references=["CC6.1"], confidence=0.8) for i in range(n)]
+
+    def test_timeout_starts_when_the_batch_runs(self):
+        # Three 0.1s batches on one thread: the last waits 0.2s but runs well within its 0.3s budget.
+        service = self.service(seconds=0.1, timeout=0.3)
+        results = service.validate_many(self.requests(3))
+        self.assertFalse(any(r.fallback for r in results))
+        self.assertEqual(service.breaker.state, "closed")
+
+    def test_queue_timeout_falls_back_without_tripping_the_breaker(self):
+        service = self.service(seconds=0.2, timeout=1.0, queue_timeout=0.05)
+        results = service.validate_many(self.requests(2))
+        self.assertFalse(results[0].fallback)
+        self.assertEqual(results[1].error, "queue timeout")
+        self.assertEqual(service.breaker.state, "closed")
+
+    def half_open_service(self):
+        service = self.service(seconds=0.0, timeout=1.0, queue_timeout=0.05)
+        service.breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.05)
+        service.breaker.record_failure()
+        time.sleep(0.06)
+        service.pool.submit(time.sleep, 0.2)  # the trial batch waits behind this
+        return service
+
+    def test_trial_batch_queue_timeout_releases_the_trial(self):
+        service = self.half_open_service()
+        results = service.validate_many(self.requests(1))
+        self.assertEqual(results[0].error, "queue timeout")
+        self.assertEqual(service.breaker.state, "half_open")
+        self.assertTrue(service.breaker.allow())
+
+    def test_async_trial_batch_queue_timeout_releases_the_trial(self):
+        service = self.half_open_service()
+        results = asyncio.run(service.avalidate_many(self.requests(1)))
+        self.assertEqual(results[0].error, "queue timeout")
+        self.assertTrue(service.breaker.allow())
+
+    def test_provider_timeout_counts_as_failure(self):
+        service = self.service(seconds=0.2, timeout=0.05)
+        results = service.validate_many(self.requests(1))
+        self.assertEqual(results[0].error, "timeout")
+        self.assertEqual(service.breaker.state, "open")
+
+    def test_async_path_shares_the_pool(self):
+        service = self.service(seconds=0.05, timeout=0.5)
+        results = asyncio.run(service.avalidate_many(self.requests(3)))
+        self.assertFalse(any(r.fallback for r in results))
+        self.assertEqual(len(results), 3)
+
+
+class PromptFingerprintTests(SimpleTestCase):
+    def key(self, text, controls, *, confidence=0.5, **overrides):
+        fields = {"provider": "stub", "model": "local-validator@1", "prompt_template": "classifier-default@1.0"}
+        fields.update(overrides)
+        request = ValidationRequest(text=text, control_references=controls, confidence=confidence)
+        return PromptFingerprint.build(request, **fields).key
+
+    def test_whitespace_and_control_order_do_not_change_the_key(self):
+        base = self.key("MFA is enforced\nfor all users.", ["CC6.1", "CC6.2"])
+        self.assertEqual(self.key("  MFA is enforced for   all users. ", ["CC6.2", "CC6.1", "CC6.1"]), base)
+
+    def test_text_controls_model_and_prompt_change_the_key(self):
+        base = self.key("MFA is enforced.", ["CC6.1"])
+        self.assertNotEqual(self.key("MFA is not enforced.", ["CC6.1"]), base)
+        self.assertNotEqual(self.key("MFA is enforced.", ["CC6.1", "CC6.2"]), base)
+        self.assertNotEqual(self.key("MFA is enforced.", ["CC6.1"], model="local-validator@2"), base)
+        self.assertNotEqual(self.key("MFA is enforced.", ["CC6.1"], prompt_template="classifier-default@2.0"), base)
+
+    def test_input_confidence_changes_the_key_at_three_decimals(self):
+        base = self.key("MFA is enforced.", ["CC6.1"])
+        self.assertNotEqual(self.key("MFA is enforced.", ["CC6.1"], confidence=0.9), base)
+        self.assertEqual(self.key("MFA is enforced.", ["CC6.1"], confidence=0.50004), base)
+
+
+class LLMValidationCacheBypassTests(SimpleTestCase):
+    @override_settings(LLM_VALIDATION_CACHE_ENABLED=True)
+    def test_stub_provider_is_not_cached(self):
+        cache = mock.Mock()
+        service = LLMValidationService(StubValidationProvider(), cache=cache)
+        self.assertIsNone(service.cache)
+        request = ValidationRequest(text="MFA is enforced.", control_references=["CC6.1"], confidence=0.7)
+        self.assertEqual(service.validate_many([request])[0].confidence, 0.7)
+        cache.get_many.assert_not_called()
+
+
+class ResolveValidationModelTests(SimpleTestCase):
+    def setUp(self):
+        llm_validation_cache_service._resolved_models.clear()
+        self.addCleanup(llm_validation_cache_service._resolved_models.clear)
+        patcher = mock.patch.object(llm_validation_cache_service, "ModelRegistry")
+        self.registry = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.latest = self.registry.objects.filter.return_value.order_by.return_value.values_list.return_value.first
+
+    @override_settings(LLM_VALIDATION_MODEL_TTL_SECONDS=60)
+    def test_version_is_memoised_within_the_ttl(self):
+        self.latest.return_value = "1"
+        self.assertEqual(resolve_validation_model("validator"), "validator@1")
+        self.latest.return_value = "2"
+        self.assertEqual(resolve_validation_model("validator"), "validator@1")
+        self.assertEqual(self.latest.call_count, 1)
+
+    @override_settings(LLM_VALIDATION_MODEL_TTL_SECONDS=0)
+    def test_new_version_is_picked_up_after_the_ttl(self):
+        self.latest.return_value = None
+        self.assertEqual(resolve_validation_model("validator"), "validator@unregistered")
+        self.latest.return_value = "2"
+        self.assertEqual(resolve_validation_model("validator"), "validator@2")
+
+
+class FakeStepLogger:
+    """PipelineLogger stand-in recording step logs and the thread that wrote them."""
+
+    def __init__(self):
+        self.completed = {}
+        self.threads = set()
+        self.events = []
+
+    def start_step(self, name, *, input_snapshot=None):
+        self.threads.add(threading.get_ident())
+        return SimpleNamespace(step_name=name)
+
+    @contextmanager
+    def measure_queries(self):
+        yield None
+
+    def complete_step(self, log, *, status="completed", output_snapshot=None, error=None, queries=None):
+        self.threads.add(threading.get_ident())
+        self.completed[log.step_name] = status
+
+    def emit_event(self, event_type, payload=None):
+        self.events.append(event_type)
+
+
+def workflow_context(evidence=None):
+    return WorkflowContext(evidence=evidence, logger=FakeStepLogger(), pipeline_run=SimpleNamespace(id="run-1"))
+
+
+class GraphExecutorTests(SimpleTestCase):
+    def recorder(self, ran, name, *, fail=False):
+        def run(ctx):
+            ran.append((name, threading.get_ident()))
+            if fail:
+                raise RuntimeError(f"{name} failed")
+            return {"step": name}
+
+        return run
+
+    def test_topological_order_follows_dependencies(self):
+        graph = WorkflowGraph(
+            [
+                WorkflowStep("persist", lambda ctx: None, depends_on=("rank", "validate")),
+                WorkflowStep("validate", lambda ctx: None, depends_on=("rank",)),
+                WorkflowStep("rank", lambda ctx: None, depends_on=("fetch",)),
+                WorkflowStep("fetch", lambda ctx: None),
+            ]
+        )
+        self.assertEqual(graph.order, ["fetch", "rank", "validate", "persist"])
+
+    def test_cycles_and_unknown_dependencies_are_rejected(self):
+        with self.assertRaises(WorkflowGraphError):
+            WorkflowGraph(
+                [
+                    WorkflowStep("a", lambda ctx: None, depends_on=("b",)),
+                    WorkflowStep("b", lambda ctx: None, depends_on=("a",)),
+                ]
+            )
+        with self.assertRaises(WorkflowGraphError):
+            WorkflowGraph([WorkflowStep("a", lambda ctx: None, depends_on=("missing",))])
+
+    def test_failure_stops_dependents_and_is_logged(self):
+        ran = []
+        graph = WorkflowGraph(
+            [
+                WorkflowStep("first", self.recorder(ran, "first")),
+                WorkflowStep("broken", self.recorder(ran, "broken", fail=True), depends_on=("first",)),
+                WorkflowStep("after", self.recorder(ran, "after"), depends_on=("broken",)),
+            ]
+        )
+        ctx = workflow_context()
+        with self.assertRaisesMessage(RuntimeError, "broken failed"):
+            GraphExecutor(parallel=False).run(graph, ctx)
+        self.assertEqual([name for name, _ in ran], ["first", "broken"])
+        self.assertEqual(ctx.logger.completed, {"first": "completed", "broken": "failed"})
+
+    def test_only_non_db_steps_leave_the_calling_thread(self):
+        ran = []
+        graph = WorkflowGraph(
+            [
+                WorkflowStep("root", self.recorder(ran, "root")),
+                WorkflowStep("db_a", self.recorder(ran, "db_a"), depends_on=("root",)),
+                WorkflowStep("db_b", self.recorder(ran, "db_b"), depends_on=("root",)),
+                WorkflowStep("pure", self.recorder(ran, "pure"), depends_on=("root",), uses_db=False),
+                WorkflowStep(
+                    "pure_failing", self.recorder(ran, "pure_failing", fail=True), depends_on=("root",), uses_db=False
+                ),
+            ]
+        )
+        executor = GraphExecutor(parallel=False)
+        executor.pool = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(executor.pool.shutdown)
+        ctx = workflow_context()
+        with self.assertRaisesMessage(RuntimeError, "pure_failing failed"):
+            executor.run(graph, ctx)
+
+        caller = threading.get_ident()
+        threads = dict(ran)
+        self.assertEqual({threads["root"], threads["db_a"], threads["db_b"]}, {caller})
+        self.assertNotEqual(threads["pure"], caller)
+        self.assertEqual(ctx.logger.threads, {caller})
+        self.assertEqual(ctx.logger.completed["pure_failing"], "failed")
+
+
+class ClassifierCacheHitTests(SimpleTestCase):
+    def test_cache_hit_skips_retrieval_and_validation(self):
+        agent = EvidenceClassifierAgent.__new__(EvidenceClassifierAgent)
+        agent.preprocessing = mock.Mock()
+        agent.preprocessing.build_classification_text.return_value = ("MFA is enforced.", [])
+        agent.preprocessing.content_hash.return_value = "hash-1"
+        agent.catalog = mock.Mock(current_version=mock.Mock(return_value="v1"))
+        agent.cache = mock.Mock()
+        agent.cache.find_cached.return_value = {"primary_controls": ["CC6.1"], "confidence": 0.9, "similarity": 1.0}
+        agent.search = mock.Mock()
+        agent.validator = mock.Mock()
+        agent.matches = mock.Mock()
+
+        evidence = SimpleNamespace(id="ev-1", organization_id="org-1", save=mock.Mock())
+        ctx = workflow_context(evidence)
+        ctx.logger.agent_run = SimpleNamespace(id="agent-run-1")
+        GraphExecutor(parallel=False).run(agent.build_graph(), ctx)
+
+        self.assertTrue(ctx.result["cache_hit"])
+        agent.search.top_candidates.assert_not_called()
+        agent.validator.validate_detailed.assert_not_called()
+        self.assertEqual(set(ctx.logger.completed), {"preprocessing", "cache_lookup"})
+
+
+class ClassifierConcurrencyTests(SimpleTestCase):
+    def test_embedding_compute_overlaps_fts_retrieval(self):
+        # Each side waits for the other at the barrier, so the run only completes if they overlap.
+        barrier = threading.Barrier(2, timeout=5)
+
+        def meet(result):
+            def call(*args, **kwargs):
+                barrier.wait()
+                return result
+
+            return call
+
+        agent = EvidenceClassifierAgent.__new__(EvidenceClassifierAgent)
+        agent.preprocessing = mock.Mock()
+        agent.preprocessing.build_classification_text.return_value = ("MFA is enforced.", [])
+        agent.preprocessing.content_hash.return_value = "hash-1"
+        agent.catalog = mock.Mock(current_version=mock.Mock(return_value="v1"))
+        agent.cache = mock.Mock()
+        agent.cache.find_cached.return_value = None
+        agent.search = mock.Mock(top_candidates=mock.Mock(side_effect=meet([])))
+        agent.embedding = mock.Mock(embed_vector=mock.Mock(side_effect=meet([0.6, 0.8])))
+        agent.validator = mock.Mock()
+        agent.validator.validate_detailed.return_value = SimpleNamespace(confidence=0.8, as_snapshot=dict)
+        agent.matches = mock.Mock(replace_matches=mock.Mock(return_value=[]))
+        agent.tasks = mock.Mock(create_tasks_for_controls=mock.Mock(return_value=[]))
+
+        executor = GraphExecutor(parallel=False)
+        executor.pool = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(executor.pool.shutdown)
+        evidence = SimpleNamespace(id="ev-1", organization_id="org-1", save=mock.Mock())
+        ctx = workflow_context(evidence)
+        ctx.logger.agent_run = SimpleNamespace(id="agent-run-1")
+        with mock.patch("audit_api.agents.evidence_classifier.ClassifierOutput"):
+            executor.run(agent.build_graph(), ctx)
+
+        self.assertEqual(ctx.result["primary_controls"], ["control:GENERIC"])
+        agent.embedding.embed_vector.assert_called_once_with("MFA is enforced.", durable=False)
+        self.assertEqual(agent.cache.store_embedding.call_args.kwargs["vector"], [0.6, 0.8])
+
+
+class CatalogVersionCacheTests(SimpleTestCase):
+    def setUp(self):
+        state = mock.patch.object(ControlCatalogService, "_state", {})
+        state.start()
+        self.addCleanup(state.stop)
+        self.catalog = ControlCatalogService()
+        self.catalog._fingerprint = mock.Mock(return_value=(3, "t1"))
+        self.catalog.snapshot = mock.Mock(return_value=SimpleNamespace(version="v1"))
+
+    @override_settings(CONTROL_CATALOG_VERSION_TTL_SECONDS=60)
+    def test_version_is_served_without_a_query_within_the_ttl(self):
+        self.assertEqual(self.catalog.current_version(), "v1")
+        self.assertEqual(self.catalog.current_version(), "v1")
+        self.assertEqual(self.catalog._fingerprint.call_count, 1)
+
+        self.catalog._fingerprint.return_value = (4, "t2")
+        self.catalog.snapshot.return_value = SimpleNamespace(version="v2")
+        self.assertEqual(self.catalog.current_version(), "v1")
+        self.assertEqual(self.catalog.current_version(fresh=True), "v2")
+
+    @override_settings(CONTROL_CATALOG_VERSION_TTL_SECONDS=0)
+    def test_unchanged_catalog_is_not_recomputed_after_the_ttl(self):
+        self.catalog.current_version()
+        self.catalog.current_version()
+        self.assertEqual(self.catalog._fingerprint.call_count, 2)
+        self.assertEqual(self.catalog.snapshot.call_count, 1)
+
+
+def fake_control(control_id, framework_id="soc2", reference=None):
+    return SimpleNamespace(
+        id=control_id,
+        framework_id=framework_id,
+        reference=reference or control_id,
+        title=f"{control_id} title",
+        description="",
+    )
+
+
+@override_settings(CONTROL_RRF_K=60)
+class ReciprocalRankFusionTests(SimpleTestCase):
+    def fts(self, *controls):
+        return [ControlCandidate(control=c, score=1.0 / position) for position, c in enumerate(controls, start=1)]
+
+    def test_without_semantic_matches_fts_order_is_kept(self):
+        a, b = fake_control("a"), fake_control("b")
+        fts = self.fts(a, b)
+        self.assertIs(ControlSearchService._fuse(fts, [], scoped=False, keep=5), fts)
+
+    def test_controls_found_by_both_rankings_rise(self):
+        a, b, c = fake_control("a"), fake_control("b"), fake_control("c")
+        out = ControlSearchService._fuse(self.fts(a, b), [(b, 0.9), (c, 0.8)], scoped=False, keep=5)
+        self.assertEqual([x.control.id for x in out], ["b", "a", "c"])
+        self.assertAlmostEqual(out[0].fused, 1 / 62 + 1 / 61)
+        self.assertEqual(out[0].similarity, 0.9)
+        self.assertEqual(out[2].score, 0.0)
+
+    def test_scoped_fusion_ranks_and_trims_within_each_framework(self):
+        s1, s2 = fake_control("s1", "soc2"), fake_control("s2", "soc2")
+        i1, i2 = fake_control("i1", "iso"), fake_control("i2", "iso")
+        fts = self.fts(s1, i1)
+        fts[1].framework_rank = 1
+        semantic = [(s2, 0.9), (i2, 0.8), (s1, 0.7)]
+        out = ControlSearchService._fuse(fts, semantic, scoped=True, keep=1)
+        self.assertEqual({x.control.id for x in out}, {"s1", "i1"})
+        self.assertEqual([x.framework_rank for x in out], [1, 1])
+
+
+class ControlVectorLoadTests(SimpleTestCase):
+    def setUp(self):
+        control_vector_service.clear_control_indexes()
+        self.addCleanup(control_vector_service.clear_control_indexes)
+        self.service = control_vector_service.ControlVectorService(
+            SimpleNamespace(model_name="local", model_dim=2), catalog=mock.Mock()
+        )
+        patches = {name: mock.patch.object(control_vector_service, name) for name in ("ControlEmbedding", "Control")}
+        self.mocks = {name: patcher.start() for name, patcher in patches.items()}
+        for patcher in patches.values():
+            self.addCleanup(patcher.stop)
+        enqueue = mock.patch("audit_api.tasks.enqueue_control_embedding_sync")
+        self.enqueue = enqueue.start()
+        self.addCleanup(enqueue.stop)
+
+    def rows(self, *rows):
+        query = self.mocks["ControlEmbedding"].objects.filter.return_value.select_related.return_value
+        query.order_by.return_value = list(rows)
+
+    def row(self, control, *, stale=False):
+        digest = control_hash(control.reference, control.title, control.description)
+        return SimpleNamespace(control=control, content_hash="old" if stale else digest, vector=[3.0, 4.0])
+
+    def test_complete_embeddings_are_loaded_without_syncing(self):
+        a = fake_control("a")
+        self.rows(self.row(a))
+        self.mocks["Control"].objects.count.return_value = 1
+        index = self.service.load("v1")
+        self.assertTrue(index.complete)
+        self.assertEqual(index.controls, [a])
+        self.assertAlmostEqual(float(index.matrix[0][1]), 0.8)
+        self.enqueue.assert_not_called()
+
+    def test_missing_or_stale_embeddings_fall_back_to_fts_and_enqueue_one_sync(self):
+        self.rows(self.row(fake_control("a")), self.row(fake_control("b"), stale=True))
+        self.mocks["Control"].objects.count.return_value = 3
+        index = self.service.load("v1")
+        self.assertFalse(index.complete)
+        self.assertEqual(index.search([1.0, 0.0], k=3, min_similarity=0.0), [])
+        self.service.load("v1")
+        self.enqueue.assert_called_once_with("local")
+
+
+class JSONFlattenerTests(SimpleTestCase):
+    DOC = {
+        "Records": [
+            {"eventName": "AssumeRole", "note": 'quote " slash \\ tab\t snow \u2603 face \U0001F600', "ok": True},
+            {"empty": {}, "list": [], "n": -12.5e3, "none": None},
+        ]
+    }
+
+    def flatten(self, text, *, chunk_size=64 * 1024, max_len=10_000):
+        events = iter_json_events(io.StringIO(text), chunk_size=chunk_size, max_string=max_len)
+        return flatten_events(events, max_len=max_len)
+
+    def test_every_chunk_boundary_gives_the_same_output(self):
+        for text in (json.dumps(self.DOC), json.dumps(self.DOC, ensure_ascii=False)):
+            expected = self.flatten(text)
+            self.assertIn("Records[0].eventName: AssumeRole", expected)
+            self.assertIn("Records[1].empty: {}", expected)
+            for chunk_size in range(1, 24):
+                self.assertEqual(self.flatten(text, chunk_size=chunk_size), expected, chunk_size)
+
+    def test_invalid_strings_are_rejected(self):
+        for text in ('"unterminated', '"bad \\x escape"', '"cut \\u12"', '"ctrl \x01"'):
+            with self.assertRaises(JSONStreamError):
+                list(iter_json_events(io.StringIO(text), chunk_size=3))
+
+    def test_multi_megabyte_string_is_scanned_once_and_capped(self):
+        value = "a" * (8 * 1024 * 1024)
+        text = json.dumps({"blob": value, "after": "tail"})
+        reader = _Reader(io.StringIO(text), 4096)
+        reader.peek()
+        reader.pos = text.index('"', 1 + text.index(":"))
+        peak = 0
+        more = reader.more
+
+        def tracked_more():
+            nonlocal peak
+            peak = max(peak, len(reader.buf))
+            return more()
+
+        reader.more = tracked_more
+        self.assertEqual(reader.string(100), "a" * 100)
+        self.assertLessEqual(peak, 2 * 4096)
+        self.assertEqual(self.flatten(text, max_len=50), "blob: " + "a" * 44)
+
+        started = time.perf_counter()
+        events = list(iter_json_events(io.StringIO(text), chunk_size=4096, max_string=100))
+        self.assertLess(time.perf_counter() - started, 5)
+        self.assertEqual(events[2], ("string", "a" * 100))
+        self.assertEqual(events[3:5], [("key", "after"), ("string", "tail")])
+
+
+class ExtractorRegistryTests(SimpleTestCase):
+    def setUp(self):
+        self.registry = ExtractorRegistry()
+
+    def extract(self, filename, data: bytes, max_len=10_000):
+        return self.registry.extract(io.BytesIO(data), filename=filename, max_len=max_len)
+
+    def test_longest_extension_then_mime_type_then_plain_text(self):
+        self.assertEqual(self.registry.resolve("export.csv.gz").name, "gzip")
+        self.assertEqual(self.registry.resolve("EVENTS.JSONL").name, "ndjson")
+        self.assertEqual(self.registry.resolve("trail.json").name, "json")
+        self.assertEqual(self.registry.resolve("unknown.bin").name, "plain")
+
+    def test_gzip_extracts_the_inner_format(self):
+        data = gzip.compress(b"user,action\nalice,login\nbob,logout\n")
+        text = self.extract("audit.csv.gz", data)
+        self.assertIn("columns: user, action", text)
+        self.assertIn("row 2: user=bob; action=logout", text)
+
+    def test_zip_members_are_extracted_by_their_own_names(self):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            archive.writestr("config.json", json.dumps({"mfa": {"enforced": True}}))
+            archive.writestr("notes.txt", "quarterly access review")
+        text = self.extract("bundle.zip", buffer.getvalue())
+        self.assertIn("archive members: 2", text)
+        self.assertIn("mfa.enforced: true", text)
+        self.assertIn("quarterly access review", text)
+
+    def test_rejected_payloads_fall_back_to_plain_text(self):
+        self.assertEqual(self.extract("broken.json", b'{"open": '), '{"open":')
+
+    def test_output_is_capped(self):
+        rows = "\n".join(f"line {i} ok" for i in range(1000)).encode()
+        self.assertLessEqual(len(self.extract("app.log", rows, max_len=200)), 200)
+
+
+class StringRawJsonReextractionTests(SimpleTestCase):
+    PAYLOAD = '{"PasswordPolicy": {"MinimumPasswordLength": 14, "RequireSymbols": true}}'
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        override = override_settings(EVIDENCE_UPLOAD_DIR=Path(directory.name))
+        override.enable()
+        self.addCleanup(override.disable)
+        self.storage = EvidenceStorageService()
+        self.preprocessing = EvidencePreprocessingService()
+
+    def reextracted(self, evidence_id, *, raw_text, raw_json):
+        uri, _ = self.storage.write_raw_payload("org", evidence_id, raw_text=raw_text, raw_json=raw_json)
+        [result] = reextract_chunk([(evidence_id, uri)])
+        return result["text"]
+
+    def test_string_raw_json_is_parsed_at_ingest(self):
+        self.assertEqual(EvidenceService._normalize_raw(None, self.PAYLOAD), (None, json.loads(self.PAYLOAD)))
+        self.assertEqual(EvidenceService._normalize_raw(None, "not json"), ("not json", None))
+        self.assertEqual(EvidenceService._normalize_raw(None, {"a": 1}), (None, {"a": 1}))
+
+    def test_reextraction_reproduces_the_ingested_text(self):
+        for evidence_id, value in (("parsed", self.PAYLOAD), ("invalid", "  not json  ")):
+            raw_text, raw_json = EvidenceService._normalize_raw(None, value)
+            extracted = self.preprocessing.extract_text(raw_text=raw_text, raw_json=raw_json)
+            self.assertEqual(self.reextracted(evidence_id, raw_text=raw_text, raw_json=raw_json), extracted)
+
+    def test_legacy_string_literal_files_match_their_original_extraction(self):
+        extracted = self.preprocessing.extract_text(raw_text=None, raw_json=self.PAYLOAD)
+        self.assertIn("PasswordPolicy.MinimumPasswordLength: 14", extracted)
+        self.assertEqual(self.reextracted("legacy", raw_text=None, raw_json=self.PAYLOAD), extracted)
+
+
+class ContentDefinedChunkingTests(SimpleTestCase):
+    def setUp(self):
+        self.chunker = TextChunkingService(target_chars=400, max_chars=800, overlap_chars=100)
+        self.lines = [
+            f"2026-10-19T10:{i // 60:02d}:{i % 60:02d}Z user-{i % 37} action=login session={i * 7919}\n"
+            for i in range(900)
+        ]
+
+    def hashes(self, lines):
+        return {chunk.chunk_hash for chunk in self.chunker.chunk("".join(lines))}
+
+    def test_chunks_cover_the_text_in_order(self):
+        text = "".join(self.lines)
+        chunks = self.chunker.chunk(text)
+        self.assertGreater(len(chunks), 20)
+        self.assertEqual(chunks[0].start, 0)
+        self.assertEqual(chunks[-1].end, len(text))
+        for chunk in chunks:
+            self.assertTrue(chunk.text.endswith(text[chunk.end - 20 : chunk.end]))
+            self.assertLessEqual(chunk.end - chunk.start, 800 + 100)
+
+    def test_an_edit_changes_only_nearby_chunks(self):
+        before = self.hashes(self.lines)
+        edited = list(self.lines)
+        edited[450] = "2026-10-19T10:07:30Z user-9 action=logout reason=idle\n"
+        self.assertLessEqual(len(self.hashes(edited) - before), 2)
+
+    def test_an_insert_changes_only_nearby_chunks(self):
+        before = self.hashes(self.lines)
+        inserted = self.lines[:300] + ["2026-10-19T10:05:00Z admin action=policy_update\n"] + self.lines[300:]
+        self.assertLessEqual(len(self.hashes(inserted) - before), 3)
+
+
+class ChunkCoverageTests(SimpleTestCase):
+    def service(self, *, neighbours=(), exact=(), sizes=None, min_coverage=0.9):
+        service = classification_cache_service.ClassificationCacheService.__new__(
+            classification_cache_service.ClassificationCacheService
+        )
+        service.embedding_service = SimpleNamespace(model_name="local")
+        service.threshold = 0.3
+        service.min_chunk_coverage = min_coverage
+        service.vectors = mock.Mock()
+        service.vectors.chunk_neighbours.return_value = list(neighbours)
+        service._build_response = lambda evidence, *, similarity, source, accepted=None: {
+            "source": source.pk,
+            "similarity": similarity,
+        }
+
+        def filter_chunks(**kwargs):
+            query = mock.Mock()
+            if "chunk_hash__in" in kwargs:
+                query.values_list.return_value = list(exact)
+            else:
+                query.values_list.return_value.annotate.return_value.values_list.return_value = list(
+                    (sizes or {}).items()
+                )
+            return query
+
+        models = mock.patch.multiple(
+            classification_cache_service,
+            EvidenceChunkEmbedding=mock.Mock(**{"objects.filter.side_effect": filter_chunks}),
+            Evidence=mock.Mock(
+                **{"objects.filter.side_effect": lambda pk: mock.Mock(first=lambda: SimpleNamespace(pk=pk))}
+            ),
+        )
+        models.start()
+        self.addCleanup(models.stop)
+        return service
+
+    @staticmethod
+    def pairs(n):
+        return [(TextChunk(index=i, start=i, end=i + 1, text=f"chunk {i}"), [float(i), 1.0]) for i in range(n)]
+
+    def test_probed_chunks_stand_in_for_skipped_ones(self):
+        # 8 unmatched chunks, 4 probed, all 4 found in a 8-chunk document: probe_scale 2 -> full coverage.
+        pairs = self.pairs(8)
+        probed = [0, 2, 4, 6]
+        neighbours = [(i, "ev-1", i, 0.1) for i in probed]
+        service = self.service(neighbours=neighbours, sizes={"ev-1": 8})
+        with mock.patch.object(service, "MAX_CHUNK_PROBES", 4):
+            result = service._find_by_chunks(pairs)
+        sent = service.vectors.chunk_neighbours.call_args.args[0]
+        self.assertEqual([index for index, _ in sent], probed)
+        self.assertEqual(result["source"], "ev-1")
+        self.assertAlmostEqual(result["similarity"], 0.9)
+
+    def test_coverage_must_hold_both_ways(self):
+        # The query is fully covered, but those chunks are only 4 of the candidate's 40.
+        neighbours = [(i, "ev-1", i, 0.0) for i in range(4)]
+        service = self.service(neighbours=neighbours, sizes={"ev-1": 40})
+        self.assertIsNone(service._find_by_chunks(self.pairs(4)))
+
+    def test_exact_hash_hits_count_against_the_threshold(self):
+        pairs = self.pairs(10)
+        exact = [("ev-1", chunk.index, chunk.chunk_hash) for chunk, _ in pairs[:9]]
+        self.assertEqual(self.service(exact=exact, sizes={"ev-1": 9})._find_by_chunks(pairs)["source"], "ev-1")
+
+        exact = exact[:8]
+        self.assertIsNone(self.service(exact=exact, sizes={"ev-1": 8})._find_by_chunks(pairs))
+
+
+class EmbeddingMemoTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch.object(embedding_memo_service, "EvidenceEmbedding")
+        self.table = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.db_first = self.table.objects.filter.return_value.values_list.return_value.first
+        self.db_first.return_value = None
+
+    def memo(self, max_size=2):
+        return embedding_memo_service.EmbeddingMemo(max_size=max_size, redis_url="")
+
+    def test_lru_evicts_the_least_recently_used_entry(self):
+        memo = self.memo()
+        memo.put("m", "a", [1.0])
+        memo.put("m", "b", [2.0])
+        self.assertEqual(memo.get("m", "a", durable=False), [1.0])  # moves "a" to the end
+        memo.put("m", "c", [3.0])
+        self.assertIsNone(memo.get("m", "b", durable=False))
+        self.assertEqual(memo.get("m", "a", durable=False), [1.0])
+        self.assertEqual(memo.get("m", "c", durable=False), [3.0])
+
+    def test_many_computes_only_the_misses_in_one_call(self):
+        memo = self.memo(max_size=10)
+        memo.put("m", embedding_memo_service.text_hash("known"), [0.5])
+        compute = mock.Mock(side_effect=lambda texts: [[float(len(t))] for t in texts])
+        vectors = memo.get_or_compute_many("m", ["known", "new", "newer"], compute, durable=False)
+        compute.assert_called_once_with(["new", "newer"])
+        self.assertEqual(vectors, [[0.5], [3.0], [5.0]])
+        self.assertEqual(memo.get_or_compute_many("m", ["new"], compute, durable=False), [[3.0]])
+        self.assertEqual(compute.call_count, 1)
+
+    def test_non_durable_lookups_never_touch_the_database(self):
+        memo = self.memo()
+        self.assertIsNone(memo.get("m", "missing", durable=False))
+        self.table.objects.filter.assert_not_called()
+
+        self.db_first.return_value = [0.25, 0.75]
+        self.assertEqual(memo.get("m", "stored"), [0.25, 0.75])
+        self.table.objects.filter.assert_called_once_with(model_name="m", content_hash="stored")
+
+    def test_redis_errors_are_misses(self):
+        memo = self.memo()
+        down = ConnectionError("down")
+        memo._redis = mock.Mock(**{"get.side_effect": down, "set.side_effect": down})
+        with self.assertLogs(embedding_memo_service.logger, "WARNING"):
+            self.assertEqual(memo.get_or_compute("m", "text", lambda text: [1.0], durable=False), [1.0])
+        self.assertEqual(memo.get("m", embedding_memo_service.text_hash("text"), durable=False), [1.0])
+
+
+class EmbeddingBackfillOptionTests(SimpleTestCase):
+    def service(self, cursor, *, created=False):
+        patcher = mock.patch.object(embedding_backfill_service, "EmbeddingBackfillCursor")
+        table = patcher.start()
+        self.addCleanup(patcher.stop)
+        table.objects.get_or_create.return_value = (cursor, created)
+        service = embedding_backfill_service.EmbeddingBackfillService.__new__(
+            embedding_backfill_service.EmbeddingBackfillService
+        )
+        service.embedding = SimpleNamespace(model_name="local")
+        return service
+
+    def test_resuming_with_options_the_backfill_lacks_is_an_error(self):
+        cursor = SimpleNamespace(only_missing=False, include_chunks=True, status="paused", save=mock.Mock())
+        with self.assertRaisesMessage(ValueError, "--only-missing"):
+            self.service(cursor).get_cursor(only_missing=True, include_chunks=True)
+        cursor.save.assert_not_called()
+
+    def test_resuming_without_flags_or_with_reset_is_allowed(self):
+        cursor = SimpleNamespace(only_missing=True, include_chunks=False, status="paused", save=mock.Mock())
+        self.assertEqual(self.service(cursor).get_cursor().status, "running")
+        reset = self.service(cursor).get_cursor(reset=True, include_chunks=True)
+        self.assertTrue(reset.include_chunks)
+        self.assertFalse(reset.only_missing)
+
+    def test_enqueued_jobs_carry_the_sub_batch_size(self):
+        with mock.patch.object(tasks.django_rq, "get_queue") as get_queue, mock.patch(
+            "audit_api.models.EmbeddingBackfillCursor"
+        ):
+            tasks.enqueue_embedding_backfill("local", sub_batch_size=64)
+        args = get_queue.return_value.enqueue.call_args.args
+        self.assertIs(args[0], tasks.embedding_backfill_task)
+        self.assertEqual(args[-1], 64)
+
+
+class WorkerPoolTests(SimpleTestCase):
+    def test_map_bounds_tasks_in_flight(self):
+        pool = WorkerPool(4, max_in_flight=2)
+        pool._executor = ThreadPoolExecutor(max_workers=4)  # threads stand in for spawned processes
+        self.addCleanup(pool._executor.shutdown)
+        pulled = 0
+
+        def items():
+            nonlocal pulled
+            for i in range(10):
+                pulled += 1
+                yield i
+
+        ahead = []
+        results = []
+        for result in pool.map(lambda x: x * 2, items()):
+            ahead.append(pulled - len(results))
+            results.append(result)
+        self.assertEqual(sorted(results), [i * 2 for i in range(10)])
+        # At most max_in_flight submitted tasks plus the item waiting for a slot.
+        self.assertLessEqual(max(ahead), 3)
+
+    def test_single_worker_runs_inline_in_order(self):
+        for workers in (0, 1):
+            with WorkerPool(workers) as pool:
+                self.assertIsNone(pool._executor)
+                out = list(pool.map(lambda x: (x, threading.get_ident()), range(5)))
+            self.assertEqual([x for x, _ in out], list(range(5)))
+            self.assertEqual({ident for _, ident in out}, {threading.get_ident()})
+
+
+class BulkPreprocessingTests(SimpleTestCase):
+    def setUp(self):
+        backends = mock.patch.dict(embedding_backends._backends, clear=True)
+        backends.start()
+        self.addCleanup(backends.stop)
+        self.backend = embedding_backends.HashEmbeddingBackend(
+            name="hash-test", version="1.0", provider="local", dims=8
+        )
+
+    @staticmethod
+    def evidence(i, text="MFA is enforced."):
+        return SimpleNamespace(
+            id=f"ev-{i}",
+            title=f"Item {i}",
+            description=None,
+            evidence_type_id=None,
+            source_type_id=None,
+            extracted_text=text,
+        )
+
+    def test_preprocess_rows_inline_matches_the_backend(self):
+        rows = [BulkPreprocessingService.row(self.evidence(1)), (None, "", None, None, None, "")]
+        first, blank = preprocess_rows((self.backend.spec(), rows, True))
+
+        text = EvidencePreprocessingService().build_classification_text(self.evidence(1))[0]
+        self.assertEqual(first.evidence_id, "ev-1")
+        self.assertEqual(first.text, text)
+        self.assertEqual(first.content_hash, EvidencePreprocessingService().content_hash(text))
+        for got, expected in zip(first.vector_list(), self.backend.embed(text)):
+            self.assertAlmostEqual(got, expected, places=6)
+        self.assertEqual(blank.vector_list(), [0.0] * 8)
+
+    def test_preprocess_returns_input_order(self):
+        # Tasks complete in reverse, like an unordered pool.
+        pool = SimpleNamespace(map=lambda fn, tasks: reversed([fn(task) for task in tasks]))
+        service = BulkPreprocessingService(self.backend, pool, sub_batch_size=2)
+        evidence = [self.evidence(i, text=f"control {i}") for i in range(5)]
+
+        results = service.preprocess(evidence)
+        self.assertEqual([r.evidence_id for r in results], [f"ev-{i}" for i in range(5)])
+        self.assertTrue(all(r.text is None for r in results))
 
-# Create your tests here.
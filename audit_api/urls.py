@@ -5,6 +5,7 @@ from .views import (
     HealthCheckView,
     EvidenceListCreateView,
     EvidenceClassifyView,
+    EvidenceClassifyAsyncView,
     EvidenceFileUploadView,
     EvidenceAgentRunsView,
     AgentRunStepLogsView,
@@ -13,10 +14,12 @@ from .views import (
     JobStatusView,
     PromptTemplateListCreateView,
     ModelRegistryListCreateView,
+    PipelineRunProfileView,
     OrganizationMembershipView,
     OrganizationMembershipDeactivateView,
     OrganizationListCreateView,
     TaskListView,
+    ClassificationAnalyticsView,
     RegisterView,
     LoginView,
     MeView,
@@ -35,6 +38,11 @@ urlpatterns = [
         EvidenceClassifyView.as_view(),
         name="evidence-classify",
     ),
+    path(
+        "evidence/<uuid:evidence_id>/aclassify/",
+        EvidenceClassifyAsyncView.as_view(),
+        name="evidence-aclassify",
+    ),
     path(
         "evidence/<uuid:evidence_id>/agent-runs/",
         EvidenceAgentRunsView.as_view(),
@@ -66,6 +74,11 @@ urlpatterns = [
         name="organization-membership-deactivate",
     ),
     path("tasks/", TaskListView.as_view(), name="task-list"),
+    path(
+        "analytics/classifications/",
+        ClassificationAnalyticsView.as_view(),
+        name="classification-analytics",
+    ),
     path(
         "jobs/<str:job_id>/",
         JobStatusView.as_view(),
@@ -73,4 +86,9 @@ urlpatterns = [
     ),
     path("prompts/", PromptTemplateListCreateView.as_view(), name="prompt-list-create"),
     path("models/", ModelRegistryListCreateView.as_view(), name="model-registry-list-create"),
+    path(
+        "admin/pipeline-runs/<uuid:pipeline_run_id>/profile/",
+        PipelineRunProfileView.as_view(),
+        name="pipeline-run-profile",
+    ),
 ]
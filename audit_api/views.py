@@ -1,15 +1,21 @@
 # audit_api/views.py
 
+from datetime import date, timedelta
 from uuid import UUID
 
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from django.shortcuts import get_object_or_404
 from django.contrib.auth import authenticate, get_user_model
 from django.db import IntegrityError
+from django.utils import timezone
 
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework.authtoken.models import Token
 from rest_framework.parsers import MultiPartParser, FormParser
 from django.db.models import Prefetch
@@ -28,6 +34,7 @@ from audit_api.serializers import (
     AgentRunSerializer,
     AgentRunDetailSerializer,
     AgentStepLogSerializer,
+    ArchivedAgentRunSerializer,
     EventSerializer,
     OrganizationInviteSerializer,
     PromptTemplateSerializer,
@@ -40,13 +47,20 @@ from audit_api.models import (
     Evidence,
     Organization,
     OrganizationMembership,
+    AiPipelineRun,
     AgentRun,
     AgentStepLog,
+    ArchivedAgentRun,
     Event,
     PromptTemplate,
     ModelRegistry,
     Task,
 )
+from audit_api.permissions import CanScrapeMetrics
+from audit_api.services.metrics_service import render_metrics
+from audit_api.services.pipeline_archive_service import PipelineArchiveService
+from audit_api.services.profiling_service import ClassificationProfiler, profile_requested
+from audit_api.services.rollup_service import RollupService
 from audit_api.tasks import enqueue_classification, classify_evidence_task
 from django_rq import get_queue
 
@@ -145,6 +159,20 @@ class HealthCheckView(APIView):
         return Response({"status": "ok"}, status=status.HTTP_200_OK)
 
 
+class MetricsView(APIView):
+    """
+    GET /metrics
+    Prometheus text exposition (step latency, cache hits, RQ depth, request latency).
+    Staff, METRICS_TOKEN bearer or METRICS_ALLOWED_NETWORKS only.
+    """
+
+    permission_classes = [CanScrapeMetrics]
+
+    def get(self, request, *args, **kwargs):
+        payload, content_type = render_metrics()
+        return HttpResponse(payload, content_type=content_type)
+
+
 class OrganizationListCreateView(APIView):
     """
     GET /api/organizations/
@@ -178,7 +206,7 @@ class OrganizationListCreateView(APIView):
 
 class EvidenceListCreateView(APIView):
     """
-    GET /api/evidence/?organization_id=<uuid>
+    GET /api/evidence/?organization_id=<uuid>[&control=CC6.1][&min_confidence=0.7]
     POST /api/evidence/
     """
 
@@ -212,8 +240,22 @@ class EvidenceListCreateView(APIView):
         ).exists():
             return Response({"detail": "Not a member of this organization."}, status=status.HTTP_403_FORBIDDEN)
 
+        min_confidence = request.query_params.get("min_confidence")
+        if min_confidence is not None:
+            try:
+                min_confidence = float(min_confidence)
+            except ValueError:
+                return Response(
+                    {"detail": "min_confidence must be a number"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
         service = EvidenceService()
-        items = service.list_by_org(organization_id=org_uuid)
+        items = service.list_by_org(
+            organization_id=org_uuid,
+            control=request.query_params.get("control") or None,
+            min_confidence=min_confidence,
+        )
         serializer = EvidenceSerializer(items, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -237,7 +279,9 @@ class EvidenceListCreateView(APIView):
         classification = None
         try:
             coordinator = OrchestrationCoordinator()
-            classification = coordinator.classify_evidence(evidence_id=str(evidence.id))
+            classification = coordinator.classify_evidence(
+                evidence_id=str(evidence.id), profile=profile_requested(request)
+            )
             # refresh to include ai_classification written by the agent
             evidence.refresh_from_db(fields=["ai_classification", "updated_at"])
         except Exception as exc:  # keep evidence creation successful even if classification fails
@@ -266,17 +310,62 @@ class EvidenceClassifyView(APIView):
             )
 
         if request.query_params.get("async") in {"1", "true", "yes"}:
-            job = enqueue_classification(str(evidence.id))
+            job = enqueue_classification(str(evidence.id), profile=profile_requested(request))
             return Response(
                 {"job_id": job.id, "status": "queued", "evidence_id": str(evidence.id)},
                 status=status.HTTP_202_ACCEPTED,
             )
 
         coordinator = OrchestrationCoordinator()
-        result = coordinator.classify_evidence(evidence_id=str(evidence.id))
+        result = coordinator.classify_evidence(evidence_id=str(evidence.id), profile=profile_requested(request))
         return Response(result, status=status.HTTP_200_OK)
 
 
+@method_decorator(csrf_exempt, name="dispatch")
+class EvidenceClassifyAsyncView(View):
+    """
+    POST /api/evidence/<evidence_id>/aclassify/
+
+    Native async counterpart of EvidenceClassifyView for ASGI deployments
+    (`uvicorn auditmind_server.asgi:application`): the request awaits the
+    classification instead of holding a worker thread while it waits on
+    Postgres or the LLM. DRF views are sync-only, so token auth and the
+    membership check are done here with the async ORM.
+    """
+
+    http_method_names = ["post"]
+
+    @staticmethod
+    async def _authenticate(request):
+        keyword, _, key = request.headers.get("Authorization", "").partition(" ")
+        if keyword != "Token" or not key.strip():
+            return None
+        token = await Token.objects.select_related("user").filter(key=key.strip()).afirst()
+        if token is None or not token.user.is_active:
+            return None
+        return token.user
+
+    async def post(self, request, evidence_id: UUID, *args, **kwargs):
+        user = await self._authenticate(request)
+        if user is None:
+            return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+
+        evidence = await Evidence.objects.filter(pk=evidence_id).afirst()
+        if evidence is None:
+            return JsonResponse({"detail": "Not found."}, status=404)
+
+        if not await OrganizationMembership.objects.filter(
+            user=user,
+            organization_id=evidence.organization_id,
+            is_active=True,
+            role__in={"admin", "member"},
+        ).aexists():
+            return JsonResponse({"detail": "Only members or admins can classify evidence."}, status=403)
+
+        result = await OrchestrationCoordinator().aclassify_evidence(evidence.id)
+        return JsonResponse(result)
+
+
 class EvidenceFileUploadView(APIView):
     """
     POST /api/evidence/upload/
@@ -313,7 +402,9 @@ class EvidenceFileUploadView(APIView):
         classification = None
         try:
             coordinator = OrchestrationCoordinator()
-            classification = coordinator.classify_evidence(evidence_id=str(evidence.id))
+            classification = coordinator.classify_evidence(
+                evidence_id=str(evidence.id), profile=profile_requested(request)
+            )
             evidence.refresh_from_db(fields=["ai_classification", "updated_at"])
         except Exception as exc:
             classification = {"error": str(exc)}
@@ -354,10 +445,19 @@ class AgentRunStepLogsView(APIView):
     """
 
     def get(self, request, agent_run_id: str, *args, **kwargs):
-        agent_run = get_object_or_404(
-            AgentRun.objects.select_related("evidence"),
-            pk=agent_run_id,
-        )
+        agent_run = AgentRun.objects.select_related("evidence").filter(pk=agent_run_id).first()
+        if agent_run is None:
+            # Older runs may have been moved to the archive; serve them from there.
+            archived = get_object_or_404(ArchivedAgentRun, pk=agent_run_id)
+            if not OrganizationMembership.objects.filter(
+                user=request.user, organization_id=archived.organization_id, is_active=True
+            ).exists():
+                return Response(
+                    {"detail": "Not a member of this organization."},
+                    status=status.HTTP_403_FORBIDDEN,
+                )
+            return Response(PipelineArchiveService().load_run(archived)["step_logs"], status=status.HTTP_200_OK)
+
         evidence = agent_run.evidence
         if evidence:
             if not OrganizationMembership.objects.filter(
@@ -393,7 +493,9 @@ class EvidenceEventsView(APIView):
 class EvidenceTimelineView(APIView):
     """
     GET /api/evidence/<evidence_id>/timeline/
-    Returns runs (with steps) and events in one payload.
+    Returns runs (with steps) and events in one payload, plus summaries of
+    archived runs. ?include_archived=1 also loads archived runs/events from
+    the archive files.
     """
 
     def get(self, request, evidence_id: str, *args, **kwargs):
@@ -411,9 +513,28 @@ class EvidenceTimelineView(APIView):
         )
         events = evidence.events.order_by("-created_at")
 
-        runs_data = AgentRunDetailSerializer(runs, many=True).data
-        events_data = EventSerializer(events, many=True).data
-        return Response({"runs": runs_data, "events": events_data}, status=status.HTTP_200_OK)
+        runs_data = list(AgentRunDetailSerializer(runs, many=True).data)
+        events_data = list(EventSerializer(events, many=True).data)
+
+        archived = evidence.archived_agent_runs.order_by("-started_at")
+        if request.query_params.get("include_archived") in {"1", "true", "yes"}:
+            archive = PipelineArchiveService()
+            for entry in archived:
+                loaded = archive.load_run(entry)
+                events_data.extend(loaded.pop("events"))
+                loaded.pop("classifier_outputs")
+                runs_data.append(loaded)
+            runs_data.sort(key=lambda r: r.get("created_at") or "", reverse=True)
+            events_data.sort(key=lambda e: e.get("created_at") or "", reverse=True)
+
+        return Response(
+            {
+                "runs": runs_data,
+                "events": events_data,
+                "archived_runs": ArchivedAgentRunSerializer(archived, many=True).data,
+            },
+            status=status.HTTP_200_OK,
+        )
 
 
 class TaskListView(APIView):
@@ -434,6 +555,40 @@ class TaskListView(APIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+class ClassificationAnalyticsView(APIView):
+    """
+    GET /api/analytics/classifications/?organization_id=<uuid>&start=YYYY-MM-DD&end=YYYY-MM-DD
+    Reads the daily rollup tables (refreshed by refresh_classification_rollups);
+    defaults to the last 30 days.
+    """
+
+    def get(self, request, *args, **kwargs):
+        org_id = request.query_params.get("organization_id")
+        if not org_id:
+            return Response({"detail": "organization_id is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not EvidenceListCreateView._has_role(request.user, org_id, {"admin", "member", "viewer"}):
+            return Response({"detail": "Not a member of this organization."}, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            end = (
+                date.fromisoformat(request.query_params["end"])
+                if request.query_params.get("end")
+                else timezone.now().date()
+            )
+            start = (
+                date.fromisoformat(request.query_params["start"])
+                if request.query_params.get("start")
+                else end - timedelta(days=30)
+            )
+        except ValueError:
+            return Response({"detail": "start and end must be YYYY-MM-DD dates"}, status=status.HTTP_400_BAD_REQUEST)
+        if start > end:
+            return Response({"detail": "start must not be after end"}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(RollupService().summary(org_id, start=start, end=end), status=status.HTTP_200_OK)
+
+
 class OrganizationMembershipView(APIView):
     """
     GET /api/organizations/<org_id>/memberships/
@@ -544,3 +699,22 @@ class ModelRegistryListCreateView(APIView):
         serializer.is_valid(raise_exception=True)
         model_entry = serializer.save()
         return Response(ModelRegistrySerializer(model_entry).data, status=status.HTTP_201_CREATED)
+
+
+class PipelineRunProfileView(APIView):
+    """
+    GET /api/admin/pipeline-runs/<pipeline_run_id>/profile/
+    Downloads the pstats dump captured for a profiled classification run (staff only).
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, pipeline_run_id: str, *args, **kwargs):
+        run = get_object_or_404(AiPipelineRun, pk=pipeline_run_id)
+        if not (run.details or {}).get("profile"):
+            raise Http404("No profile captured for this pipeline run.")
+
+        path = ClassificationProfiler().path_for(run.id)
+        if not path.exists():
+            raise Http404("Profile file has been pruned.")
+        return FileResponse(open(path, "rb"), as_attachment=True, filename=path.name)
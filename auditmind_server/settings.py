@@ -20,6 +20,18 @@ EVIDENCE_UPLOAD_DIR = AUDITMIND_VAR_DIR / "uploads"
 
 os.makedirs(EVIDENCE_UPLOAD_DIR, exist_ok=True)
 
+# Opt-in classification profiling (header / job flag always profile; this samples the rest)
+CLASSIFICATION_PROFILE_DIR = AUDITMIND_VAR_DIR / "profiles"
+CLASSIFICATION_PROFILE_SAMPLE_RATE = float(os.environ.get("CLASSIFICATION_PROFILE_SAMPLE_RATE", "0"))
+CLASSIFICATION_PROFILE_MAX_FILES = int(os.environ.get("CLASSIFICATION_PROFILE_MAX_FILES", "200"))
+
+# /metrics is readable by staff, by scrapers sending `Authorization: Bearer <METRICS_TOKEN>`,
+# and from these networks (comma-separated CIDRs)
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+METRICS_ALLOWED_NETWORKS = [
+    n.strip() for n in os.environ.get("METRICS_ALLOWED_NETWORKS", "127.0.0.1/32,::1/128").split(",") if n.strip()
+]
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
@@ -51,6 +63,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'audit_api.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -145,6 +158,92 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Monthly partitions for events / agent_step_logs (see `manage.py manage_partitions`)
+PARTITION_MONTHS_AHEAD = int(os.environ.get("PARTITION_MONTHS_AHEAD", "3"))
+PARTITION_RETENTION_MONTHS = {
+    "events": int(os.environ.get("EVENTS_RETENTION_MONTHS", "12")),
+    "agent_step_logs": int(os.environ.get("STEP_LOG_RETENTION_MONTHS", "6")),
+}
+PARTITION_ARCHIVE_DIR = AUDITMIND_VAR_DIR / "archive" / "partitions"
+
+# Cold pipeline history archive (see `manage.py archive_pipeline_history`)
+PIPELINE_ARCHIVE_DIR = AUDITMIND_VAR_DIR / "archive" / "pipeline"
+PIPELINE_ARCHIVE_AFTER_DAYS = int(os.environ.get("PIPELINE_ARCHIVE_AFTER_DAYS", "90"))
+
+# Serving embedding model (a ModelRegistry name) and backend class per provider
+EMBEDDING_MODEL = os.environ.get("EMBEDDING_MODEL", "hash-embed-128")
+EMBEDDING_BACKENDS = {
+    "local": "audit_api.services.embedding_backends.HashEmbeddingBackend",
+}
+
+# Chunked embeddings for long evidence (see TextChunkingService)
+EMBEDDING_CHUNK_TARGET_CHARS = int(os.environ.get("EMBEDDING_CHUNK_TARGET_CHARS", "2000"))
+EMBEDDING_CHUNK_MAX_CHARS = int(os.environ.get("EMBEDDING_CHUNK_MAX_CHARS", "4000"))
+EMBEDDING_CHUNK_OVERLAP_CHARS = int(os.environ.get("EMBEDDING_CHUNK_OVERLAP_CHARS", "200"))
+CLASSIFICATION_CACHE_MIN_CHUNK_COVERAGE = float(os.environ.get("CLASSIFICATION_CACHE_MIN_CHUNK_COVERAGE", "0.9"))
+
+# Embedding memo (see EmbeddingMemo): in-process LRU, optional Redis tier
+EMBEDDING_MEMO_SIZE = int(os.environ.get("EMBEDDING_MEMO_SIZE", "4096"))
+EMBEDDING_MEMO_REDIS_URL = os.environ.get("EMBEDDING_MEMO_REDIS_URL", "")
+EMBEDDING_MEMO_REDIS_TTL = int(os.environ.get("EMBEDDING_MEMO_REDIS_TTL", str(7 * 24 * 3600)))
+
+# ANN storage for evidence_embeddings: full | halfvec | binary (see VectorStorageService)
+EMBEDDING_VECTOR_STORAGE = os.environ.get("EMBEDDING_VECTOR_STORAGE", "full")
+EMBEDDING_RERANK_K = int(os.environ.get("EMBEDDING_RERANK_K", "20"))
+
+# LLM validation provider (see LLMValidationService / run_llm_stub_server)
+LLM_VALIDATION_PROVIDER = os.environ.get("LLM_VALIDATION_PROVIDER", "stub")
+LLM_VALIDATION_PROVIDERS = {
+    "stub": "audit_api.services.llm_providers.StubValidationProvider",
+    "http": "audit_api.services.llm_providers.HttpValidationProvider",
+}
+LLM_VALIDATION_URL = os.environ.get("LLM_VALIDATION_URL", "")
+LLM_VALIDATION_MODEL = os.environ.get("LLM_VALIDATION_MODEL", "local-validator")
+LLM_VALIDATION_TIMEOUT_SECONDS = float(os.environ.get("LLM_VALIDATION_TIMEOUT_SECONDS", "5"))
+LLM_VALIDATION_QUEUE_TIMEOUT_SECONDS = float(os.environ.get("LLM_VALIDATION_QUEUE_TIMEOUT_SECONDS", "30"))
+LLM_VALIDATION_BATCH_SIZE = int(os.environ.get("LLM_VALIDATION_BATCH_SIZE", "8"))
+LLM_VALIDATION_MAX_CONCURRENCY = int(os.environ.get("LLM_VALIDATION_MAX_CONCURRENCY", "4"))
+LLM_VALIDATION_BREAKER_FAILURES = int(os.environ.get("LLM_VALIDATION_BREAKER_FAILURES", "5"))
+LLM_VALIDATION_BREAKER_RESET_SECONDS = float(os.environ.get("LLM_VALIDATION_BREAKER_RESET_SECONDS", "30"))
+
+# Validation results cached by prompt fingerprint: in-process LRU, then the
+# llm_validation_cache table. TTL of 0 keeps entries until the model or prompt changes.
+LLM_VALIDATION_CACHE_ENABLED = os.environ.get("LLM_VALIDATION_CACHE_ENABLED", "1").lower() in {"1", "true", "yes"}
+LLM_VALIDATION_CACHE_SIZE = int(os.environ.get("LLM_VALIDATION_CACHE_SIZE", "2048"))
+LLM_VALIDATION_CACHE_TTL_SECONDS = int(os.environ.get("LLM_VALIDATION_CACHE_TTL_SECONDS", "0"))
+# How long a process reuses the resolved `name@version` of LLM_VALIDATION_MODEL
+LLM_VALIDATION_MODEL_TTL_SECONDS = float(os.environ.get("LLM_VALIDATION_MODEL_TTL_SECONDS", "60"))
+
+# How long a process reuses the control catalog version before re-checking the controls table
+CONTROL_CATALOG_VERSION_TTL_SECONDS = float(os.environ.get("CONTROL_CATALOG_VERSION_TTL_SECONDS", "30"))
+
+# FTS candidates kept per adopted framework when an organization has active frameworks
+CONTROL_CANDIDATES_PER_FRAMEWORK = int(os.environ.get("CONTROL_CANDIDATES_PER_FRAMEWORK", "3"))
+
+# Semantic control retrieval: cosine similarity against an in-memory control-embedding matrix,
+# fused with the FTS ranking by reciprocal rank fusion (RRF)
+CONTROL_SEMANTIC_RETRIEVAL = os.environ.get("CONTROL_SEMANTIC_RETRIEVAL", "1").lower() in {"1", "true", "yes"}
+CONTROL_SEMANTIC_TOP_K = int(os.environ.get("CONTROL_SEMANTIC_TOP_K", "10"))
+CONTROL_SEMANTIC_MIN_SIMILARITY = float(os.environ.get("CONTROL_SEMANTIC_MIN_SIMILARITY", "0.5"))
+CONTROL_RRF_K = int(os.environ.get("CONTROL_RRF_K", "60"))
+
+# File-format extractors for uploaded evidence, matched by extension then MIME type (see extractors.py)
+EVIDENCE_EXTRACTORS = [
+    "audit_api.services.extractors.JSONExtractor",
+    "audit_api.services.extractors.NDJSONExtractor",
+    "audit_api.services.extractors.CSVExtractor",
+    "audit_api.services.extractors.LogExtractor",
+    "audit_api.services.extractors.GzipExtractor",
+    "audit_api.services.extractors.ZipExtractor",
+    "audit_api.services.extractors.PlainTextExtractor",
+]
+
+# Threads shared by workflow graphs for running independent non-DB steps concurrently (1 = sequential)
+WORKFLOW_MAX_WORKERS = int(os.environ.get("WORKFLOW_MAX_WORKERS", "4"))
+
+# Adds X-DB-Query-Count / X-DB-Query-Time-Ms response headers (load testing only)
+QUERY_COUNT_HEADERS = os.environ.get("QUERY_COUNT_HEADERS", "0").lower() in {"1", "true", "yes"}
+
 # RQ (async tasks)
 RQ_QUEUES = {
     "default": {
@@ -0,0 +1,14 @@
+# gunicorn loads ./gunicorn.conf.py automatically:
+#   gunicorn auditmind_server.asgi:application -k uvicorn.workers.UvicornWorker
+import os
+
+
+def child_exit(server, worker):
+    # Drop the dead worker's live gauges from PROMETHEUS_MULTIPROC_DIR so
+    # /metrics stops reporting stale values for it. Same as
+    # metrics_service.mark_process_dead, which the master cannot import
+    # without loading Django apps.
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)